@@ -0,0 +1,277 @@
+#!/usr/bin/env python
+"""
+Local stand-in for the Zoom OAuth and REST APIs, with configurable latency, server errors and rate limiting.
+
+    python benchmarks/fake_zoom.py [--port 8765] [--latency 0.05] [--error-rate 0.01] [--rate-limit-rate 0.01]
+
+Point the package at it with:
+
+    WAGTAILZOOM_OAUTH_URL = "http://127.0.0.1:8765/oauth/token"
+    WAGTAILZOOM_API_BASE_URL = "http://127.0.0.1:8765/v2"
+    WAGTAILZOOM_EVENTS_API_BASE_URL = "http://127.0.0.1:8765/api/v1"
+"""
+import argparse
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+EVENT_RE = re.compile(r"^/v2/(meetings|webinars)/(\d+)(/registrants|/batch_registrants|/registrants/questions)?$")
+LIST_RE = re.compile(r"^/v2/users/me/(meetings|webinars)$")
+EVENTS_API_RE = re.compile(r"^/api/v1/e/v/events/(sessions|speakers|sponsors)$")
+
+
+def make_events(kind, count):
+    start = datetime.now(timezone.utc) + timedelta(days=1)
+    events = []
+
+    for i in range(count):
+        event_id = (80000000000 if kind == "meetings" else 90000000000) + i
+        events.append({
+            "id": event_id,
+            "uuid": uuid.uuid4().hex,
+            "topic": f"Benchmark {kind[:-1]} {i}",
+            "type": 2 if kind == "meetings" else 5,
+            "start_time": (start + timedelta(hours=i)).strftime("%Y-%m-%dT%H:%M:%SZ"),
+            "created_at": (start - timedelta(days=30, hours=i)).strftime("%Y-%m-%dT%H:%M:%SZ"),
+            "duration": 60,
+            "timezone": "UTC",
+        })
+
+    return events
+
+
+class FakeZoom:
+    def __init__(self, latency=0.0, latency_jitter=0.0, error_rate=0.0, rate_limit_rate=0.0, retry_after=1,
+                 events=20, seed=None):
+        self.latency = latency
+        self.latency_jitter = latency_jitter
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.retry_after = retry_after
+        self.random = random.Random(seed)
+        self.events = {"meetings": make_events("meetings", events), "webinars": make_events("webinars", events)}
+        self.registrants = {}
+        self.lock = threading.Lock()
+        self.stats = {"requests": 0, "errors": 0, "rate_limited": 0, "registrants": 0, "not_modified": 0}
+
+    def count(self, name, value=1):
+        with self.lock:
+            self.stats[name] += value
+
+    def get_event(self, kind, event_id):
+        for event in self.events[kind]:
+            if event["id"] == event_id:
+                return event
+        return None
+
+    def add_registrant(self, kind, event, registrant):
+        email = (registrant.get("email") or "").lower()
+
+        with self.lock:
+            # Zoom answers a repeated registration with the existing registrant
+            key = (kind, event["id"], email)
+            if key not in self.registrants:
+                self.registrants[key] = uuid.uuid4().hex[:22]
+                self.stats["registrants"] += 1
+            registrant_id = self.registrants[key]
+
+        return {
+            "id": event["id"],
+            "registrant_id": registrant_id,
+            "email": email,
+            "join_url": f"https://zoom.us/w/{event['id']}?tk={registrant_id}",
+            "topic": event["topic"],
+            "start_time": event["start_time"],
+        }
+
+    def get_events_api_data(self, resource, event_id):
+        return {resource: [{"id": f"{event_id}-{resource}-{i}", "name": f"Benchmark {resource[:-1]} {i}"}
+                           for i in range(5)]}
+
+    def handle(self, method, path, query, body, headers=None):
+        """
+        Returns the status code, headers and JSON body of the response.
+        """
+        self.count("requests")
+
+        delay = self.latency + self.random.uniform(0, self.latency_jitter)
+        if delay:
+            time.sleep(delay)
+
+        if self.rate_limit_rate and self.random.random() < self.rate_limit_rate:
+            self.count("rate_limited")
+            return 429, {"Retry-After": str(self.retry_after)}, {"code": 429, "message": "Too many requests"}
+
+        if self.error_rate and self.random.random() < self.error_rate:
+            self.count("errors")
+            return 503, {}, {"code": 503, "message": "Service unavailable"}
+
+        if method == "POST" and path == "/oauth/token":
+            return 200, {}, {"access_token": uuid.uuid4().hex, "token_type": "bearer", "expires_in": 3600}
+
+        match = EVENTS_API_RE.match(path)
+        if method == "GET" and match:
+            data = self.get_events_api_data(match.group(1), query.get("eventId", [""])[0])
+            etag = '"{}"'.format(hashlib.md5(json.dumps(data, sort_keys=True).encode()).hexdigest())
+
+            if (headers or {}).get("If-None-Match") == etag:
+                self.count("not_modified")
+                return 304, {"ETag": etag}, None
+
+            return 200, {"ETag": etag}, data
+
+        match = LIST_RE.match(path)
+        if method == "GET" and match:
+            kind = match.group(1)
+            page_size = int(query.get("page_size", ["30"])[0])
+            offset = int(query.get("next_page_token", ["0"])[0] or 0)
+            events = self.events[kind][offset:offset + page_size]
+            next_offset = offset + page_size
+
+            return 200, {}, {
+                "page_size": page_size,
+                "total_records": len(self.events[kind]),
+                "next_page_token": str(next_offset) if next_offset < len(self.events[kind]) else "",
+                kind: events,
+            }
+
+        match = EVENT_RE.match(path)
+        if match:
+            kind, event_id, action = match.group(1), int(match.group(2)), match.group(3)
+            event = self.get_event(kind, event_id)
+
+            if event is None:
+                return 404, {}, {"code": 3001, "message": "Meeting does not exist"}
+
+            if method == "GET" and not action:
+                return 200, {}, {**event, "settings": {"approval_type": 0}}
+
+            if method == "GET" and action == "/registrants/questions":
+                return 200, {}, {"questions": [{"field_name": "last_name", "required": False}],
+                                 "custom_questions": [{"title": "How did you hear about us?", "required": False,
+                                                       "type": "single_dropdown", "answers": ["Email", "Web"]}]}
+
+            if method == "POST" and action == "/registrants":
+                return 201, {}, self.add_registrant(kind, event, body)
+
+            if method == "POST" and action == "/batch_registrants":
+                registrants = [self.add_registrant(kind, event, registrant)
+                               for registrant in body.get("registrants", [])]
+                return 201, {}, {"registrants": [
+                    {key: registrant[key] for key in ("email", "registrant_id", "join_url")}
+                    for registrant in registrants
+                ]}
+
+        return 404, {}, {"code": 404, "message": "Not found"}
+
+
+def make_handler(fake_zoom):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_request(self):
+            url = urlsplit(self.path)
+            length = int(self.headers.get("Content-Length") or 0)
+            raw_body = self.rfile.read(length) if length else b""
+
+            try:
+                body = json.loads(raw_body) if raw_body else {}
+            except ValueError:
+                body = {}
+
+            status, headers, data = fake_zoom.handle(self.command, url.path, parse_qs(url.query), body,
+                                                     headers=self.headers)
+            content = json.dumps(data).encode() if data is not None else b""
+
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(content)))
+            for name, value in headers.items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(content)
+
+        do_GET = do_request
+        do_POST = do_request
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+
+class FakeZoomServer:
+    """
+    Runs a FakeZoom on a local port in a background thread. Use as a context manager.
+    """
+
+    def __init__(self, fake_zoom=None, host="127.0.0.1", port=0):
+        self.fake_zoom = fake_zoom or FakeZoom()
+        self.server = ThreadingHTTPServer((host, port), make_handler(self.fake_zoom))
+        self.server.daemon_threads = True
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    @property
+    def url(self):
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+
+def add_fake_zoom_arguments(parser):
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every response")
+    parser.add_argument("--latency-jitter", type=float, default=0.0, help="Random extra seconds, up to this value")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Share of requests failing with a 503")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="Share of requests failing with a 429")
+    parser.add_argument("--retry-after", type=int, default=1, help="Retry-After seconds of 429 responses")
+    parser.add_argument("--events", type=int, default=20, help="Number of meetings, and of webinars")
+    parser.add_argument("--seed", type=int, default=None, help="Seed of the injected errors")
+
+
+def make_fake_zoom(args):
+    return FakeZoom(latency=args.latency, latency_jitter=args.latency_jitter, error_rate=args.error_rate,
+                    rate_limit_rate=args.rate_limit_rate, retry_after=args.retry_after, events=args.events,
+                    seed=args.seed)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    add_fake_zoom_arguments(parser)
+    args = parser.parse_args()
+
+    server = FakeZoomServer(make_fake_zoom(args), host=args.host, port=args.port)
+    print(f"Fake Zoom listening on {server.url}")
+
+    try:
+        server.server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server.server_close()
+        print(json.dumps(server.fake_zoom.stats))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+#!/usr/bin/env python
+"""
+Compare the compiled registrant payload plan with the previous Django Template based rendering.
+
+    python benchmarks/merge_fields.py [--number 20000]
+"""
+import argparse
+import datetime
+import json
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import django  # noqa: E402
+from django.conf import settings  # noqa: E402
+
+settings.configure(TEMPLATES=[{"BACKEND": "django.template.backends.django.DjangoTemplates"}])
+django.setup()
+
+from django.template import Context, Template  # noqa: E402
+
+from wagtailzoom.merge_fields import compile_plan  # noqa: E402
+
+MAPPING = json.dumps({
+    "email": "email",
+    "first_name": "first_name",
+    "last_name": "last_name",
+    "org": "organization",
+    "job_title": "",
+})
+
+CLEANED_DATA = {
+    "email": "jane@example.com",
+    "first_name": "Jane",
+    "last_name": "O'Brien",
+    "organization": "Example \"Org\"",
+    "date_of_birth": datetime.date(1990, 1, 1),
+}
+
+
+def legacy_render(mapping_json, cleaned_data):
+    form_submission = {k.replace('-', '_'): v for k, v in cleaned_data.items()}
+
+    fields = json.loads(mapping_json)
+    for key, value in fields.items():
+        if value:
+            fields[key] = "{}{}{}".format("{{", value, "}}")
+
+    rendered = Template(json.dumps(fields)).render(Context(form_submission))
+    return json.loads(rendered)
+
+
+def compiled_render(mapping_json, cleaned_data):
+    return compile_plan(mapping_json).build(cleaned_data)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--number", type=int, default=20000)
+    args = parser.parse_args()
+
+    expected = {
+        "email": "jane@example.com",
+        "first_name": "Jane",
+        "last_name": "O'Brien",
+        "org": "Example \"Org\"",
+        "job_title": "",
+    }
+    results = {}
+
+    for name, fn in (("legacy_template", legacy_render), ("compiled_plan", compiled_render)):
+        seconds = min(timeit.repeat(lambda: fn(MAPPING, CLEANED_DATA), number=args.number, repeat=3))
+
+        results[name] = {
+            "us_per_call": round(seconds / args.number * 1e6, 3),
+            # the template output is HTML escaped, e.g. O&#x27;Brien
+            "correct": fn(MAPPING, CLEANED_DATA) == expected,
+        }
+
+    results["speedup"] = round(results["legacy_template"]["us_per_call"] / results["compiled_plan"]["us_per_call"], 1)
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,298 @@
+#!/usr/bin/env python
+"""
+Measure the throughput and latency of the main code paths against a local fake Zoom server, using the sandbox
+project's models and an SQLite database in a temporary directory. Results are printed as JSON, or written to
+--output, so that runs can be compared over time.
+
+    python benchmarks/run.py [--iterations 200] [--latency 0.05] [--error-rate 0.01] [--output results.json]
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import traceback
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "sandbox"))
+sys.path.insert(0, os.path.dirname(__file__))
+
+from fake_zoom import FakeZoomServer, add_fake_zoom_arguments, make_fake_zoom  # noqa: E402
+
+SCENARIOS = ["form_submission", "widget_render", "integration_view", "explorer_listing", "event_bundle_tags"]
+
+
+def configure(database_path, fake_zoom_url):
+    import django
+    from django.conf import settings
+
+    settings.configure(
+        DEBUG=False,
+        SECRET_KEY="benchmarks",
+        ALLOWED_HOSTS=["*"],
+        USE_TZ=True,
+        INSTALLED_APPS=[
+            "home",
+            "wagtailzoom",
+            "wagtail.contrib.forms",
+            "wagtail.contrib.settings",
+            "wagtail.sites",
+            "wagtail.users",
+            "wagtail.snippets",
+            "wagtail.documents",
+            "wagtail.images",
+            "wagtail.search",
+            "wagtail.admin",
+            "wagtail",
+            "modelcluster",
+            "taggit",
+            "django.contrib.admin",
+            "django.contrib.auth",
+            "django.contrib.contenttypes",
+            "django.contrib.sessions",
+            "django.contrib.messages",
+            "django.contrib.staticfiles",
+        ],
+        MIDDLEWARE=[
+            "django.contrib.sessions.middleware.SessionMiddleware",
+            "django.middleware.common.CommonMiddleware",
+            "django.contrib.auth.middleware.AuthenticationMiddleware",
+            "django.contrib.messages.middleware.MessageMiddleware",
+        ],
+        ROOT_URLCONF="sandbox.urls",
+        TEMPLATES=[{
+            "BACKEND": "django.template.backends.django.DjangoTemplates",
+            "DIRS": [os.path.join(ROOT, "sandbox", "sandbox", "templates")],
+            "APP_DIRS": True,
+            "OPTIONS": {
+                "context_processors": [
+                    "django.template.context_processors.request",
+                    "django.contrib.auth.context_processors.auth",
+                    "django.contrib.messages.context_processors.messages",
+                ],
+            },
+        }],
+        DATABASES={"default": {"ENGINE": "django.db.backends.sqlite3", "NAME": database_path}},
+        STATIC_URL="/static/",
+        WAGTAIL_SITE_NAME="benchmarks",
+        WAGTAILADMIN_BASE_URL="http://localhost",
+        WAGTAILZOOM_OAUTH_URL=f"{fake_zoom_url}/oauth/token",
+        WAGTAILZOOM_API_BASE_URL=f"{fake_zoom_url}/v2",
+        WAGTAILZOOM_EVENTS_API_BASE_URL=f"{fake_zoom_url}/api/v1",
+        LOGGING={"version": 1, "disable_existing_loggers": False, "root": {"level": "CRITICAL"}},
+    )
+    django.setup()
+
+
+def create_fixtures(fake_zoom, pages):
+    from django.contrib.auth import get_user_model
+    from django.core.management import call_command
+    from wagtail.models import Site
+
+    from home.models import EventRegistrationPage, FormField, HomePage
+    from wagtailzoom.models import ZoomSettings
+
+    call_command("migrate", verbosity=0)
+
+    site = Site.objects.get(is_default_site=True)
+    ZoomSettings.objects.update_or_create(site=site, defaults={
+        "oauth_account_id": "account",
+        "oauth_client_id": "client",
+        "oauth_client_secret": "secret",
+    })
+
+    home = HomePage.objects.first()
+    meetings = fake_zoom.events["meetings"]
+    form_pages = []
+
+    for i in range(pages):
+        meeting = meetings[i % len(meetings)]
+        page = EventRegistrationPage(
+            title=f"Event {i}",
+            slug=f"event-{i}",
+            zoom_event=json.dumps({"event_id": str(meeting["id"]), "event_type": "meeting",
+                                   "event_topic": meeting["topic"]}),
+            zoom_reg_fields_mapping=json.dumps({"email": "email", "first_name": "first_name",
+                                                "last_name": "last_name"}),
+        )
+        home.add_child(instance=page)
+
+        for sort_order, (label, field_type) in enumerate(
+                (("Email", "email"), ("First Name", "singleline"), ("Last Name", "singleline"))):
+            FormField.objects.create(page=page, sort_order=sort_order, label=label, field_type=field_type,
+                                     required=True)
+
+        page.save_revision().publish()
+        form_pages.append(page)
+
+    user = get_user_model().objects.create_superuser("admin", "admin@example.com", "password")
+
+    return home, form_pages, user
+
+
+def summarize(durations, errors, total_seconds):
+    durations_ms = sorted(d * 1000 for d in durations)
+
+    def percentile(p):
+        if not durations_ms:
+            return None
+        index = min(len(durations_ms) - 1, int(round(p / 100 * (len(durations_ms) - 1))))
+        return round(durations_ms[index], 3)
+
+    return {
+        "iterations": len(durations_ms),
+        "errors": errors,
+        "ops_per_sec": round(len(durations_ms) / total_seconds, 2) if total_seconds else None,
+        "mean_ms": round(statistics.mean(durations_ms), 3) if durations_ms else None,
+        "p50_ms": percentile(50),
+        "p90_ms": percentile(90),
+        "p99_ms": percentile(99),
+        "max_ms": round(durations_ms[-1], 3) if durations_ms else None,
+    }
+
+
+def measure(fn, iterations):
+    durations = []
+    errors = 0
+    started = time.perf_counter()
+
+    for i in range(iterations):
+        start = time.perf_counter()
+        try:
+            ok = fn(i)
+        except Exception:
+            traceback.print_exc(file=sys.stderr)
+            ok = False
+        durations.append(time.perf_counter() - start)
+        if ok is False:
+            errors += 1
+
+    return summarize(durations, errors, time.perf_counter() - started)
+
+
+def get_scenarios(home, form_pages, user):
+    from django.template import Context, Template
+    from django.test import Client
+    from django.urls import reverse
+
+    from wagtailzoom.event_bundles import get_event_bundle
+    from wagtailzoom.widgets import ZoomEventSelectWidget
+
+    client = Client()
+    admin_client = Client()
+    admin_client.force_login(user)
+
+    page = form_pages[0]
+    page_url = page.get_url()
+    run_id = int(time.time())
+
+    def form_submission(i):
+        response = client.post(page_url, {
+            "email": f"user-{run_id}-{i}@example.com",
+            "first_name": "Jane",
+            "last_name": "Doe",
+        })
+        return response.status_code == 200
+
+    widget = ZoomEventSelectWidget()
+
+    def widget_render(i):
+        widget.render("zoom_event", page.zoom_event)
+
+    integration_url = reverse("zoom_integration_view", args=[page.pk])
+
+    def integration_view(i):
+        return admin_client.get(integration_url).status_code == 200
+
+    explore_url = reverse("wagtailadmin_explore", args=[home.pk])
+
+    def explorer_listing(i):
+        return admin_client.get(explore_url).status_code == 200
+
+    bundle_template = Template(
+        "{% load wagtailzoom_tags %}{% zoom_event_bundle event_id as bundle %}"
+        "{% for session in bundle.sessions.sessions %}{{ session.name }}{% endfor %}"
+        "{% for speaker in bundle.speakers.speakers %}{{ speaker.name }}{% endfor %}"
+    )
+    # the tags only read the cache, which is filled beforehand
+    get_event_bundle("benchmark-event")
+
+    def event_bundle_tags(i):
+        return bool(bundle_template.render(Context({"event_id": "benchmark-event"})))
+
+    return {
+        "form_submission": form_submission,
+        "widget_render": widget_render,
+        "integration_view": integration_view,
+        "explorer_listing": explorer_listing,
+        "event_bundle_tags": event_bundle_tags,
+    }
+
+
+def get_git_revision():
+    try:
+        output = subprocess.check_output(["git", "rev-parse", "HEAD"], cwd=ROOT, stderr=subprocess.DEVNULL)
+        return output.decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--iterations", type=int, default=200, help="Measured iterations per scenario")
+    parser.add_argument("--warmup", type=int, default=5, help="Unmeasured iterations before each scenario")
+    parser.add_argument("--pages", type=int, default=50, help="Number of form pages listed in the explorer")
+    parser.add_argument("--scenario", action="append", choices=SCENARIOS, dest="scenarios",
+                        help="Scenario to run. Can be repeated. Defaults to all scenarios")
+    parser.add_argument("--output", help="File to write the results to, instead of printing them")
+    add_fake_zoom_arguments(parser)
+    args = parser.parse_args()
+
+    fake_zoom = make_fake_zoom(args)
+
+    with tempfile.TemporaryDirectory() as tmp_dir, FakeZoomServer(fake_zoom) as server:
+        configure(os.path.join(tmp_dir, "benchmarks.sqlite3"), server.url)
+
+        import django
+        import wagtail
+
+        home, form_pages, user = create_fixtures(fake_zoom, args.pages)
+        scenarios = get_scenarios(home, form_pages, user)
+
+        results = {}
+        for name in args.scenarios or SCENARIOS:
+            for i in range(args.warmup):
+                scenarios[name](-1 - i)
+
+            requests_before = fake_zoom.stats["requests"]
+            results[name] = measure(scenarios[name], args.iterations)
+            results[name]["zoom_requests"] = fake_zoom.stats["requests"] - requests_before
+
+        report = {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "git_revision": get_git_revision(),
+            "python": platform.python_version(),
+            "django": django.get_version(),
+            "wagtail": wagtail.__version__,
+            "options": vars(args),
+            "fake_zoom": dict(fake_zoom.stats),
+            "results": results,
+        }
+
+    output = json.dumps(report, indent=2, default=str)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
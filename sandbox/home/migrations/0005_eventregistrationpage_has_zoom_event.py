@@ -0,0 +1,18 @@
+# Generated by Django 5.0.14 on 2026-10-18 01:19
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('home', '0004_formfield'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='eventregistrationpage',
+            name='has_zoom_event',
+            field=models.BooleanField(db_index=True, editable=False, null=True),
+        ),
+    ]
@@ -1,161 +1,632 @@
 import base64
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
 
 import iso8601
-import requests
+from requests import ConnectionError, HTTPError, Timeout
 
-from wagtailzoom.errors import ZoomApiCredentialsError
+from wagtailzoom.circuit import call_with_circuit_breaker, get_endpoint_name
+from wagtailzoom.conf import get_setting
+from wagtailzoom.errors import ZoomApiCredentialsError, ZoomCircuitOpenError, ZoomRateLimitError
+from wagtailzoom.metrics import get_metrics
+from wagtailzoom.ratelimit import HEAVY, LIGHT, MEDIUM, get_backoff_delay, get_retry_after, rate_limiter
+from wagtailzoom.sessions import get_session, get_timeout
+from wagtailzoom.tokens import get_credentials_key, token_manager
+
+
+# maximum number of registrants Zoom accepts in a single batch registration call
+BATCH_REGISTRANTS_MAX_SIZE = 30
+
+# registrant fields accepted by batch registration calls
+BATCH_REGISTRANT_FIELDS = ("email", "first_name", "last_name")
+
+# maximum page size accepted by Zoom list endpoints
+MAX_PAGE_SIZE = 300
+
+# data of a Zoom Events event, fetched together by ZoomEventsApi.get_event_bundle
+EVENT_RESOURCES = ("sessions", "speakers", "sponsors")
+
+# requests that are retried after server errors or connection failures
+IDEMPOTENT_METHODS = ("GET", "HEAD", "OPTIONS")
+
+# listings of upcoming events: event type -> path, items key, params and label
+LISTINGS = {
+    "meeting": ("users/me/meetings", "meetings", {"type": "upcoming_meetings"}, "Meeting"),
+    "webinar": ("users/me/webinars", "webinars", {"type": "upcoming"}, "Webinar"),
+}
 
 
 def get_created_time(d):
     return iso8601.parse_date(d["created_at"])
 
 
-class ZoomApi:
-    def __init__(self, oauth_account_id, oauth_client_id, oauth_client_secret):
-        self.is_active = False
-        self.headers = {}
-        self.base_url = "https://api.zoom.us/v2"
+def get_start_time(d):
+    # recurring events with no fixed time have no start time, list them last
+    start_time = d.get("start_time")
+    if start_time:
+        return 0, iso8601.parse_date(start_time)
+    return 1, None
 
-        if not oauth_account_id and not oauth_client_id and not oauth_client_secret:
-            raise ZoomApiCredentialsError("Missing Zoom API OAUTH credentials")
 
-        self.init_api(oauth_account_id, oauth_client_id, oauth_client_secret)
+_listing_executor = None
+_listing_executor_lock = threading.Lock()
 
-    def init_api(self, oauth_account_id, oauth_client_id, oauth_client_secret):
-        auth_str = f"{oauth_client_id}:{oauth_client_secret}"
-        encoded_auth_str = base64.b64encode(auth_str.encode()).decode('utf-8')
 
-        r = requests.post(f'https://zoom.us/oauth/token?grant_type=account_credentials&account_id={oauth_account_id}',
-                          headers={'Authorization': f'Basic {encoded_auth_str}'})
+def get_listing_executor():
+    global _listing_executor
 
-        r.raise_for_status()
+    if _listing_executor is None:
+        with _listing_executor_lock:
+            if _listing_executor is None:
+                _listing_executor = ThreadPoolExecutor(max_workers=get_setting("EVENTS_FETCH_WORKERS"),
+                                                       thread_name_prefix="wagtailzoom-listing")
 
-        res = r.json()
-        access_token = res.get("access_token")
+    return _listing_executor
 
-        self.headers["Authorization"] = f"Bearer {access_token}"
 
-        self.is_active = True
+def normalize_email(email):
+    return (email or "").strip().lower()
 
-    def _get(self, url):
-        headers = {**self.headers}
 
-        response = requests.get(url, headers=headers)
-        response.raise_for_status()
-        return response
+class ZoomEventList(list):
+    def __init__(self, events=(), errors=None):
+        super().__init__(events)
+        # event type -> exception raised while listing events of that type
+        self.errors = errors or {}
 
-    def _post(self, url, data):
-        headers = {'Content-type': 'application/json', 'Accept': 'application/json', **self.headers}
-        response = requests.post(url, json=data, headers=headers)
-        response.raise_for_status()
+    @property
+    def is_partial(self):
+        return bool(self.errors)
+
+
+class RegistrantResult:
+    def __init__(self, registrant, response=None, error=None):
+        self.registrant = registrant
+        self.response = response
+        self.error = error
+
+    @property
+    def ok(self):
+        return self.error is None
+
+
+def get_page_params(params=None, page_size=None):
+    page_size = min(page_size or get_setting("EVENTS_PAGE_SIZE"), MAX_PAGE_SIZE)
+    return {**(params or {}), "page_size": page_size}
+
+
+def label_event(event, event_type):
+    event["event_type"] = event_type
+    event["event_type_label"] = LISTINGS[event_type][3]
+    return event
+
+
+def sort_by_created_time(events):
+    return sorted(events, key=get_created_time, reverse=True)
+
+
+def build_event_list(results, limit):
+    """
+    Combine the listings of each event type, given as a dict of event type -> list of events, or the exception
+    raised while listing them. A listing that fails is reported in the `errors` of the returned ZoomEventList,
+    unless all of them fail.
+    """
+    events = ZoomEventList()
+
+    for event_type, result in results.items():
+        if isinstance(result, Exception):
+            events.errors[event_type] = result
+        else:
+            events.extend(result)
+
+    if len(events.errors) == len(results):
+        raise events.errors["meeting"]
+
+    events.sort(key=get_start_time)
+    del events[limit:]
+
+    return events
+
+
+def get_retry(method, attempt, response=None):
+    """
+    Returns the reason and the delay in seconds when a request should be sent again, after its response or after a
+    connection error when `response` is None, and None otherwise.
+    """
+    # only safe requests are retried after server errors or connection failures. Rate limited requests were
+    # not processed by Zoom, so they are always retried
+    idempotent = method in IDEMPOTENT_METHODS
+    is_last_attempt = attempt >= get_setting("RETRY_MAX_ATTEMPTS") - 1
+
+    if response is None:
+        if not idempotent or is_last_attempt:
+            return None
+        return "connection", get_backoff_delay(attempt)
+
+    if response.status_code == 429:
+        delay = get_retry_after(response)
+        if delay is None:
+            delay = get_backoff_delay(attempt)
+
+        # e.g. a daily limit, that does not reset any time soon
+        if is_last_attempt or delay > get_setting("RETRY_MAX_DELAY"):
+            return None
+        return "rate_limited", delay
+
+    if response.status_code >= 500 and idempotent and not is_last_attempt:
+        return "server_error", get_backoff_delay(attempt)
+
+    return None
+
+
+class RequestMetrics:
+    """
+    Records the outcome and the duration of a Zoom API request, around the call sending it.
+    """
+
+    def __init__(self, method, url):
+        self.metrics = get_metrics()
+        self.method = method
+        self.url = url
+        self.status = "error"
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if not self.metrics.enabled:
+            return False
+
+        if isinstance(exc, HTTPError):
+            if exc.response is not None:
+                self.status = exc.response.status_code
+        elif isinstance(exc, ZoomCircuitOpenError):
+            self.status = "circuit_open"
+        elif isinstance(exc, ZoomRateLimitError):
+            self.status = "rate_limited"
+
+        endpoint = get_endpoint_name(self.method, self.url)
+        self.metrics.increment("wagtailzoom_zoom_requests_total", endpoint=endpoint, status=self.status)
+        self.metrics.observe("wagtailzoom_zoom_request_duration_seconds", time.perf_counter() - self.start,
+                             endpoint=endpoint)
+        return False
+
+    def record_response(self, response):
+        self.status = response.status_code
         return response
 
-    def get_meetings(self, limit=10):
-        url = "{}/users/me/meetings?type=upcoming_meetings".format(self.base_url)
-        response = self._get(url)
-        response.raise_for_status()
 
-        json_res = response.json()
+def record_retry(method, url, reason):
+    metrics = get_metrics()
+    if metrics.enabled:
+        metrics.increment("wagtailzoom_zoom_retries_total", endpoint=get_endpoint_name(method, url), reason=reason)
 
-        meetings = json_res.get("meetings", [])
 
-        if meetings and limit > 1:
-            meetings = meetings[:limit]
-            meetings = sorted(meetings, key=get_created_time, reverse=True)
+def iter_batches(registrants):
+    for start in range(0, len(registrants), BATCH_REGISTRANTS_MAX_SIZE):
+        yield registrants[start:start + BATCH_REGISTRANTS_MAX_SIZE]
 
-            for index, meeting in enumerate(meetings):
-                meetings[index]["event_type"] = "meeting"
-                meetings[index]["event_type_label"] = "Meeting"
 
-        # sort by start time, with meeting closest to start  first
-        if meetings:
-            sorted(meetings, key=lambda x: x["start_time"]).reverse()
+def get_batch_registrants(registrants):
+    # registrants answering other registration questions are added on their own, so that their answers are not lost
+    return [registrant for registrant in registrants
+            if all(key in BATCH_REGISTRANT_FIELDS for key, value in registrant.items() if value)]
 
-        return meetings
 
-    def get_webinars(self, limit=10):
-        url = "{}/users/me/webinars?type=upcoming".format(self.base_url)
-        response = self._get(url)
+def is_batch_unsupported(error):
+    # the batch endpoint is not available for every event, e.g. events with custom registration questions.
+    # Registrants are then added one by one, unless it is a rate limit or server error
+    status_code = error.response.status_code if error.response is not None else None
+    return bool(status_code) and 400 <= status_code < 500 and status_code != 429
 
-        response.raise_for_status()
 
-        json_res = response.json()
-        webinars = json_res.get("webinars", [])
+def get_batch_response_registrants(registrants, response):
+    """
+    Returns the registrants added by a batch registration call by email, and the registrants missing from its
+    response, which are added on their own.
+    """
+    added = {}
+    for registrant in response.get("registrants", []):
+        added[normalize_email(registrant.get("email"))] = registrant
 
-        if webinars and limit > 1:
-            webinars = webinars[:limit]
-            webinars = sorted(webinars, key=get_created_time, reverse=True)
+    missing = [registrant for registrant in registrants if normalize_email(registrant.get("email")) not in added]
 
-            for index, webinar in enumerate(webinars):
-                webinars[index]["event_type"] = "webinar"
-                webinars[index]["event_type_label"] = "Webinar"
+    return added, missing
 
-        # sort by start time, with webinar closest to start first
-        if webinars:
-            sorted(webinars, key=lambda x: x["start_time"]).reverse()
 
-        return webinars
+def merge_batch_results(registrants, added, missing_results):
+    missing_results = iter(missing_results)
+    results = []
 
-    def get_events(self):
-        meetings = self.get_meetings(limit=20)
+    for registrant in registrants:
+        added_registrant = added.get(normalize_email(registrant.get("email")))
 
-        try:
-            webinars = self.get_webinars(limit=20)
-            meetings.extend(webinars)
-        except Exception as e:
-            pass
+        if added_registrant:
+            results.append(RegistrantResult(registrant, response=added_registrant))
+        else:
+            results.append(next(missing_results))
 
-        return meetings
+    return results
+
+
+class BaseZoomApi:
+    """
+    Zoom API endpoints, shared by ZoomApi and the asyncio client of wagtailzoom.async_api. With the asyncio client,
+    the methods return awaitables of the same data.
+    """
+
+    def check_credentials(self, oauth_account_id, oauth_client_id, oauth_client_secret):
+        if not oauth_account_id and not oauth_client_id and not oauth_client_secret:
+            raise ZoomApiCredentialsError("Missing Zoom API OAUTH credentials")
+
+    def get_token_request(self):
+        # url, params and headers of the request of a Server-to-Server OAuth access token
+        auth_str = f"{self.oauth_client_id}:{self.oauth_client_secret}"
+        encoded_auth_str = base64.b64encode(auth_str.encode()).decode('utf-8')
+
+        params = {"grant_type": "account_credentials", "account_id": self.oauth_account_id}
+        headers = {'Authorization': f'Basic {encoded_auth_str}'}
+
+        return get_setting("OAUTH_URL"), params, headers
+
+    def parse_token_response(self, response):
+        res = response.json()
+        return res.get("access_token"), res.get("expires_in", 3600)
+
+    def iter_meetings(self, page_size=None):
+        return self.iter_events("meeting", page_size=page_size)
+
+    def iter_webinars(self, page_size=None):
+        return self.iter_events("webinar", page_size=page_size)
 
     def get_meeting(self, meeting_id):
         url = "{}/meetings/{}".format(self.base_url, meeting_id)
-        response = self._get(url)
-        return response.json()
+        return self._get_json(url, category=LIGHT)
 
     def get_webinar(self, webinar_id):
         url = "{}/webinars/{}".format(self.base_url, webinar_id)
-        response = self._get(url)
-        return response.json()
+        return self._get_json(url, category=LIGHT)
 
     def get_meeting_questions(self, meeting_id):
         url = "{}/meetings/{}/registrants/questions".format(self.base_url, meeting_id)
-        response = self._get(url)
-        return response.json()
+        return self._get_json(url, category=LIGHT)
+
+    def get_webinar_questions(self, webinar_id):
+        url = "{}/webinars/{}/registrants/questions".format(self.base_url, webinar_id)
+        return self._get_json(url, category=LIGHT)
+
+    def get_registration_questions(self, event_type, event_id):
+        if event_type == "meeting":
+            return self.get_meeting_questions(event_id)
+        return self.get_webinar_questions(event_id)
 
     def add_meeting_registrant(self, meeting_id, data):
         url = "{}/meetings/{}/registrants".format(self.base_url, meeting_id)
-        response = self._post(url, data)
-        return response.json()
+        return self._post_json(url, data)
 
     def add_webinar_registrant(self, webinar_id, data):
         url = "{}/webinars/{}/registrants".format(self.base_url, webinar_id)
-        response = self._post(url, data)
-        return response.json()
+        return self._post_json(url, data)
 
+    def add_meeting_registrants_batch(self, meeting_id, registrants, auto_approve=False):
+        url = "{}/meetings/{}/batch_registrants".format(self.base_url, meeting_id)
+        data = {"auto_approve": auto_approve, "registrants_confirmation_email": True, "registrants": registrants}
+        return self._post_json(url, data, category=HEAVY)
 
-class ZoomEventsApi:
-    def __init__(self):
-        self.base_url = "https://events.zoom.us/api/v1"
+    def add_webinar_registrants_batch(self, webinar_id, registrants, auto_approve=False):
+        url = "{}/webinars/{}/batch_registrants".format(self.base_url, webinar_id)
+        data = {"auto_approve": auto_approve, "registrants_confirmation_email": True, "registrants": registrants}
+        return self._post_json(url, data, category=HEAVY)
+
+    def add_registrant(self, event_type, event_id, data):
+        if event_type == "meeting":
+            return self.add_meeting_registrant(event_id, data)
+        return self.add_webinar_registrant(event_id, data)
+
+    def add_registrants_batch(self, event_type, event_id, registrants):
+        if event_type == "meeting":
+            return self.add_meeting_registrants_batch(event_id, registrants)
+        return self.add_webinar_registrants_batch(event_id, registrants)
+
+
+class ZoomApi(BaseZoomApi):
+    def __init__(self, oauth_account_id, oauth_client_id, oauth_client_secret, fetch_token=True):
+        self.is_active = False
+        self.headers = {}
+        self.base_url = get_setting("API_BASE_URL")
+
+        self.check_credentials(oauth_account_id, oauth_client_id, oauth_client_secret)
+        self.init_api(oauth_account_id, oauth_client_id, oauth_client_secret, fetch_token)
+
+    def init_api(self, oauth_account_id, oauth_client_id, oauth_client_secret, fetch_token=True):
+        self.oauth_account_id = oauth_account_id
+        self.oauth_client_id = oauth_client_id
+        self.oauth_client_secret = oauth_client_secret
+        self.credentials_key = get_credentials_key(oauth_account_id, oauth_client_id, oauth_client_secret)
+        self.session = get_session(self.credentials_key)
+
+        # without fetch_token, the access token is only fetched before the first request
+        if fetch_token:
+            self.refresh_auth_headers()
+
+        self.is_active = True
+
+    def fetch_access_token(self):
+        oauth_url, params, headers = self.get_token_request()
+
+        def post():
+            response = self.session.post(oauth_url, params=params, headers=headers, timeout=get_timeout())
+            response.raise_for_status()
+            return response
+
+        return self.parse_token_response(call_with_circuit_breaker("POST", oauth_url, post))
+
+    def refresh_auth_headers(self):
+        access_token = token_manager.get_token(self.credentials_key, self.fetch_access_token)
+        self.headers["Authorization"] = f"Bearer {access_token}"
+
+    def _send(self, method, url, category, headers, **kwargs):
+        if not rate_limiter.acquire(self.credentials_key, category):
+            raise ZoomRateLimitError(f"Zoom {category} rate limit reached")
+
+        return self._send_acquired(method, url, category, headers, **kwargs)
+
+    def _send_acquired(self, method, url, category, headers, **kwargs):
+        self.refresh_auth_headers()
+        response = self.session.request(method, url, headers={**headers, **self.headers}, **kwargs)
+
+        # the cached token may have been revoked, get a new one and try once more
+        if response.status_code == 401:
+            token_manager.invalidate(self.credentials_key)
+            self.refresh_auth_headers()
+            response = self.session.request(method, url, headers={**headers, **self.headers}, **kwargs)
+
+        # the per second limit is used up, hold back other requests of this category for a moment
+        if response.headers.get("X-RateLimit-Remaining") == "0":
+            rate_limiter.pause(self.credentials_key, category, 1)
+
+        return response
+
+    def pause(self, category, seconds):
+        rate_limiter.pause(self.credentials_key, category, seconds)
+
+    def _request(self, method, url, category=MEDIUM, **kwargs):
+        with RequestMetrics(method, url) as request_metrics:
+            return request_metrics.record_response(
+                call_with_circuit_breaker(method, url, self._request_with_retries, method, url, category, **kwargs)
+            )
+
+    def _request_with_retries(self, method, url, category=MEDIUM, **kwargs):
+        headers = kwargs.pop("headers", {})
+        kwargs.setdefault("timeout", get_timeout())
+        attempt = 0
+
+        while True:
+            try:
+                response = self._send(method, url, category, headers, **kwargs)
+            except (ConnectionError, Timeout):
+                retry = get_retry(method, attempt)
+                if retry is None:
+                    raise
+            else:
+                retry = get_retry(method, attempt, response)
+                if retry is None:
+                    break
+
+            reason, delay = retry
+            record_retry(method, url, reason)
+
+            if reason == "rate_limited":
+                self.pause(category, delay)
+
+            time.sleep(delay)
+            attempt += 1
 
-    def _get(self, url, params=None):
-        response = requests.get(url, params=params)
         response.raise_for_status()
         return response
 
+    def _get(self, url, params=None, category=MEDIUM):
+        return self._request("GET", url, category=category, params=params)
+
+    def _post(self, url, data, category=LIGHT):
+        headers = {'Content-type': 'application/json', 'Accept': 'application/json'}
+        return self._request("POST", url, category=category, json=data, headers=headers)
+
+    def _get_json(self, url, params=None, category=MEDIUM):
+        return self._get(url, params=params, category=category).json()
+
+    def _post_json(self, url, data, category=LIGHT):
+        return self._post(url, data, category=category).json()
+
+    def iter_pages(self, url, items_key, params=None, page_size=None):
+        params = get_page_params(params, page_size)
+
+        while True:
+            json_res = self._get(url, params=params).json()
+
+            yield json_res.get(items_key, [])
+
+            next_page_token = json_res.get("next_page_token")
+            if not next_page_token:
+                break
+
+            params["next_page_token"] = next_page_token
+
+    def iter_events(self, event_type, page_size=None):
+        # pages are only requested as the caller iterates, so stopping early avoids fetching the remaining pages
+        path, items_key, params = LISTINGS[event_type][:3]
+        url = "{}/{}".format(self.base_url, path)
+
+        for events in self.iter_pages(url, items_key, params=params, page_size=page_size):
+            for event in events:
+                yield label_event(event, event_type)
+
+    def get_meetings(self, limit=10):
+        return sort_by_created_time(islice(self.iter_meetings(page_size=min(limit, MAX_PAGE_SIZE)), limit))
+
+    def get_webinars(self, limit=10):
+        return sort_by_created_time(islice(self.iter_webinars(page_size=min(limit, MAX_PAGE_SIZE)), limit))
+
+    def get_events(self, limit=None):
+        """
+        List upcoming meetings and webinars, fetched concurrently and ordered by start time.
+        A listing that fails is reported in the `errors` of the returned ZoomEventList, unless both fail.
+        """
+        limit = limit or get_setting("EVENTS_LIMIT")
+
+        executor = get_listing_executor()
+        futures = {event_type: executor.submit(lambda event_type=event_type: list(
+            islice(self.iter_events(event_type), limit))) for event_type in LISTINGS}
+        results = {}
+
+        for event_type, future in futures.items():
+            try:
+                results[event_type] = future.result()
+            except Exception as e:
+                results[event_type] = e
+
+        return build_event_list(results, limit)
+
+    def add_registrants(self, event_type, event_id, registrants):
+        """
+        Add several registrants to an event, using as few batch registration calls as possible.
+        Returns a list of RegistrantResult, in the same order as `registrants`.
+        """
+        results = []
+
+        for batch in iter_batches(registrants):
+            results.extend(self._add_registrants_batch(event_type, event_id, batch))
+
+        return results
+
+    def _add_registrants_batch(self, event_type, event_id, registrants):
+        batch = get_batch_registrants(registrants)
+
+        if len(batch) <= 1:
+            return self._add_registrants_one_by_one(event_type, event_id, registrants)
+
+        try:
+            response = self.add_registrants_batch(event_type, event_id, batch)
+        except HTTPError as e:
+            if is_batch_unsupported(e):
+                return self._add_registrants_one_by_one(event_type, event_id, registrants)
+            return [RegistrantResult(registrant, error=e) for registrant in registrants]
+        except Exception as e:
+            return [RegistrantResult(registrant, error=e) for registrant in registrants]
+
+        added, missing = get_batch_response_registrants(registrants, response)
+
+        return merge_batch_results(registrants, added,
+                                   self._add_registrants_one_by_one(event_type, event_id, missing))
+
+    def _add_registrants_one_by_one(self, event_type, event_id, registrants):
+        results = []
+
+        for registrant in registrants:
+            try:
+                response = self.add_registrant(event_type, event_id, registrant)
+                results.append(RegistrantResult(registrant, response=response))
+            except Exception as e:
+                results.append(RegistrantResult(registrant, error=e))
+
+        return results
+
+
+class RegistrantBatcher:
+    """
+    Collects registrants for one or more events, and adds them to Zoom with batch registration calls on flush.
+    """
+
+    def __init__(self, zoom):
+        self.zoom = zoom
+        self.pending = {}
+
+    def add(self, event_type, event_id, registrant, key=None):
+        self.pending.setdefault((event_type, str(event_id)), []).append((key, registrant))
+
+    def flush(self):
+        # returns a dict of key -> RegistrantResult
+        results = {}
+        pending, self.pending = self.pending, {}
+
+        for (event_type, event_id), items in pending.items():
+            event_results = self.zoom.add_registrants(event_type, event_id, [registrant for key, registrant in items])
+
+            for (key, registrant), result in zip(items, event_results):
+                results[key] = result
+
+        return results
+
+
+class BaseZoomEventsApi:
+    """
+    Zoom Events API endpoints, shared by ZoomEventsApi and the asyncio client of wagtailzoom.async_api.
+    """
+
+    def get_event_resource_request(self, event_id, resource, etag=None):
+        # url, params and headers of the request of an event resource, revalidated with its ETag
+        url = f"{self.base_url}/e/v/events/{resource}"
+        return url, {"eventId": event_id}, {"If-None-Match": etag} if etag else None
+
+    def parse_event_resource(self, response, etag=None):
+        # not modified since the ETag sent in If-None-Match
+        if response.status_code == 304:
+            return None, etag
+
+        return response.json(), response.headers.get("ETag")
+
+    def build_event_bundle(self, results, previous=None):
+        # results are the (data, etag) of each of EVENT_RESOURCES
+        previous = previous or {}
+        bundle = {"etags": {}}
+
+        for resource, (data, etag) in zip(EVENT_RESOURCES, results):
+            bundle[resource] = previous.get(resource) if data is None else data
+            bundle["etags"][resource] = etag
+
+        return bundle
+
+
+class ZoomEventsApi(BaseZoomEventsApi):
+    def __init__(self):
+        self.base_url = get_setting("EVENTS_API_BASE_URL")
+        self.session = get_session("zoom-events")
+
+    def _get(self, url, params=None, headers=None):
+        response = self.session.get(url, params=params, headers=headers, timeout=get_timeout())
+        if response.status_code != 304:
+            response.raise_for_status()
+        return response
+
+    def get_event_resource(self, event_id, resource, etag=None):
+        """
+        Returns the data of an event resource (sessions, speakers or sponsors) and its ETag. The data is None when the
+        resource has not changed since `etag`.
+        """
+        url, params, headers = self.get_event_resource_request(event_id, resource, etag)
+        return self.parse_event_resource(self._get(url, params, headers=headers), etag)
+
     def get_event_sessions(self, event_id):
-        url = f"{self.base_url}/e/v/events/sessions"
-        params = {"eventId": event_id}
-        response = self._get(url, params)
-        return response.json()
+        return self.get_event_resource(event_id, "sessions")[0]
 
     def get_event_speakers(self, event_id):
-        url = f"{self.base_url}/e/v/events/speakers"
-        params = {"eventId": event_id}
-        response = self._get(url, params)
-        return response.json()
+        return self.get_event_resource(event_id, "speakers")[0]
 
     def get_event_sponsors(self, event_id):
-        url = f"{self.base_url}/e/v/events/sponsors"
-        params = {"eventId": event_id}
-        response = self._get(url, params)
-        return response.json()
+        return self.get_event_resource(event_id, "sponsors")[0]
+
+    def get_event_bundle(self, event_id, previous=None):
+        """
+        Fetch the sessions, speakers and sponsors of an event concurrently. With the `previous` bundle, resources
+        are revalidated with their ETags, and their previous data is reused when they have not changed.
+        """
+        etags = (previous or {}).get("etags", {})
+
+        executor = get_listing_executor()
+        futures = [executor.submit(self.get_event_resource, event_id, resource, etags.get(resource))
+                   for resource in EVENT_RESOURCES]
+
+        return self.build_event_bundle([future.result() for future in futures], previous)
@@ -4,3 +4,9 @@ from django.apps import AppConfig
 class WagtailzoomConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'wagtailzoom'
+
+    def ready(self):
+        from . import clients  # noqa: F401
+        from .form_fields import register_form_fields_relations
+
+        register_form_fields_relations()
@@ -0,0 +1,390 @@
+"""
+asyncio clients for the Zoom APIs, with the same methods as the clients of wagtailzoom.api as coroutines, for ASGI
+deployments. Requires httpx, installed with the `async` extra.
+"""
+import asyncio
+import threading
+import weakref
+
+try:
+    import httpx
+except ImportError:
+    raise ImportError("The asyncio Zoom client requires httpx. Install it with "
+                      "`pip install wagtail-zoom-integration[async]`")
+from requests import ConnectionError, HTTPError, Timeout
+
+from .api import (
+    EVENT_RESOURCES,
+    LISTINGS,
+    MAX_PAGE_SIZE,
+    BaseZoomApi,
+    BaseZoomEventsApi,
+    RegistrantResult,
+    RequestMetrics,
+    build_event_list,
+    get_batch_registrants,
+    get_batch_response_registrants,
+    get_page_params,
+    get_retry,
+    is_batch_unsupported,
+    iter_batches,
+    label_event,
+    merge_batch_results,
+    record_retry,
+    sort_by_created_time,
+)
+from .circuit import acall_with_circuit_breaker
+from .conf import get_setting
+from .credentials import CredentialPoolMixin
+from .errors import ZoomRateLimitError
+from .ratelimit import LIGHT, MEDIUM, rate_limiter
+from .tokens import get_credentials_key, token_manager
+
+# event loop -> credentials key -> httpx.AsyncClient, as connections belong to the loop that opened them
+_sessions = weakref.WeakKeyDictionary()
+_lock = threading.Lock()
+
+
+def create_async_session():
+    keep_alive = get_setting("HTTP_KEEP_ALIVE")
+
+    limits = httpx.Limits(
+        # like requests without HTTP_POOL_BLOCK, extra connections are opened but not kept
+        max_connections=get_setting("HTTP_POOL_SIZE") if get_setting("HTTP_POOL_BLOCK") else None,
+        max_keepalive_connections=get_setting("HTTP_POOL_SIZE") if keep_alive else 0,
+    )
+    timeout = httpx.Timeout(get_setting("HTTP_READ_TIMEOUT"), connect=get_setting("HTTP_CONNECT_TIMEOUT"))
+
+    return httpx.AsyncClient(limits=limits, timeout=timeout, headers=None if keep_alive else {"Connection": "close"})
+
+
+def get_async_session(key):
+    # one pooled client per credential set and event loop, shared by all clients using the same credentials
+    loop = asyncio.get_running_loop()
+
+    with _lock:
+        sessions = _sessions.setdefault(loop, {})
+        session = sessions.get(key)
+        if session is None or session.is_closed:
+            session = sessions[key] = create_async_session()
+
+    return session
+
+
+async def aclose_sessions():
+    with _lock:
+        sessions = _sessions.pop(asyncio.get_running_loop(), {})
+
+    for session in sessions.values():
+        await session.aclose()
+
+
+async def send_request(session, method, url, **kwargs):
+    # httpx errors are raised as their requests equivalents, so that they are handled like those of the sync client
+    try:
+        return await session.request(method, url, **kwargs)
+    except httpx.TimeoutException as e:
+        raise Timeout(str(e)) from e
+    except httpx.TransportError as e:
+        raise ConnectionError(str(e)) from e
+
+
+def raise_for_status(response):
+    if response.status_code >= 400:
+        raise HTTPError(f"{response.status_code} Error for url: {response.url}", response=response)
+
+
+async def take(events, limit):
+    items = []
+
+    try:
+        if limit > 0:
+            async for item in events:
+                items.append(item)
+                if len(items) >= limit:
+                    break
+    finally:
+        # stops fetching the remaining pages
+        await events.aclose()
+
+    return items
+
+
+class AsyncZoomApi(BaseZoomApi):
+    def __init__(self, oauth_account_id, oauth_client_id, oauth_client_secret):
+        self.headers = {}
+        self.base_url = get_setting("API_BASE_URL")
+
+        self.check_credentials(oauth_account_id, oauth_client_id, oauth_client_secret)
+
+        self.oauth_account_id = oauth_account_id
+        self.oauth_client_id = oauth_client_id
+        self.oauth_client_secret = oauth_client_secret
+        # tokens are shared with the sync client of the same credentials
+        self.credentials_key = get_credentials_key(oauth_account_id, oauth_client_id, oauth_client_secret)
+
+    @property
+    def session(self):
+        return get_async_session(self.credentials_key)
+
+    async def fetch_access_token(self):
+        oauth_url, params, headers = self.get_token_request()
+
+        async def post():
+            response = await send_request(self.session, "POST", oauth_url, params=params, headers=headers)
+            raise_for_status(response)
+            return response
+
+        return self.parse_token_response(await acall_with_circuit_breaker("POST", oauth_url, post))
+
+    async def refresh_auth_headers(self):
+        access_token = await token_manager.aget_token(self.credentials_key, self.fetch_access_token)
+        self.headers["Authorization"] = f"Bearer {access_token}"
+
+    async def _send(self, method, url, category, headers, **kwargs):
+        if not await rate_limiter.aacquire(self.credentials_key, category):
+            raise ZoomRateLimitError(f"Zoom {category} rate limit reached")
+
+        return await self._send_acquired(method, url, category, headers, **kwargs)
+
+    async def _send_acquired(self, method, url, category, headers, **kwargs):
+        await self.refresh_auth_headers()
+        response = await send_request(self.session, method, url, headers={**headers, **self.headers}, **kwargs)
+
+        # the cached token may have been revoked, get a new one and try once more
+        if response.status_code == 401:
+            await token_manager.ainvalidate(self.credentials_key)
+            await self.refresh_auth_headers()
+            response = await send_request(self.session, method, url, headers={**headers, **self.headers}, **kwargs)
+
+        # the per second limit is used up, hold back other requests of this category for a moment
+        if response.headers.get("X-RateLimit-Remaining") == "0":
+            await rate_limiter.apause(self.credentials_key, category, 1)
+
+        return response
+
+    async def pause(self, category, seconds):
+        await rate_limiter.apause(self.credentials_key, category, seconds)
+
+    async def _request(self, method, url, category=MEDIUM, **kwargs):
+        with RequestMetrics(method, url) as request_metrics:
+            return request_metrics.record_response(
+                await acall_with_circuit_breaker(method, url, self._request_with_retries, method, url, category,
+                                                 **kwargs)
+            )
+
+    async def _request_with_retries(self, method, url, category=MEDIUM, **kwargs):
+        headers = kwargs.pop("headers", {})
+        attempt = 0
+
+        while True:
+            try:
+                response = await self._send(method, url, category, headers, **kwargs)
+            except (ConnectionError, Timeout):
+                retry = get_retry(method, attempt)
+                if retry is None:
+                    raise
+            else:
+                retry = get_retry(method, attempt, response)
+                if retry is None:
+                    break
+
+            reason, delay = retry
+            record_retry(method, url, reason)
+
+            if reason == "rate_limited":
+                await self.pause(category, delay)
+
+            await asyncio.sleep(delay)
+            attempt += 1
+
+        raise_for_status(response)
+        return response
+
+    async def _get(self, url, params=None, category=MEDIUM):
+        return await self._request("GET", url, category=category, params=params)
+
+    async def _post(self, url, data, category=LIGHT):
+        headers = {'Content-type': 'application/json', 'Accept': 'application/json'}
+        return await self._request("POST", url, category=category, json=data, headers=headers)
+
+    async def _get_json(self, url, params=None, category=MEDIUM):
+        return (await self._get(url, params=params, category=category)).json()
+
+    async def _post_json(self, url, data, category=LIGHT):
+        return (await self._post(url, data, category=category)).json()
+
+    async def iter_pages(self, url, items_key, params=None, page_size=None):
+        params = get_page_params(params, page_size)
+
+        while True:
+            json_res = (await self._get(url, params=params)).json()
+
+            yield json_res.get(items_key, [])
+
+            next_page_token = json_res.get("next_page_token")
+            if not next_page_token:
+                break
+
+            params["next_page_token"] = next_page_token
+
+    async def iter_events(self, event_type, page_size=None):
+        path, items_key, params = LISTINGS[event_type][:3]
+        url = "{}/{}".format(self.base_url, path)
+
+        async for events in self.iter_pages(url, items_key, params=params, page_size=page_size):
+            for event in events:
+                yield label_event(event, event_type)
+
+    async def get_meetings(self, limit=10):
+        return sort_by_created_time(await take(self.iter_meetings(page_size=min(limit, MAX_PAGE_SIZE)), limit))
+
+    async def get_webinars(self, limit=10):
+        return sort_by_created_time(await take(self.iter_webinars(page_size=min(limit, MAX_PAGE_SIZE)), limit))
+
+    async def get_events(self, limit=None):
+        """
+        List upcoming meetings and webinars, fetched concurrently and ordered by start time.
+        A listing that fails is reported in the `errors` of the returned ZoomEventList, unless both fail.
+        """
+        limit = limit or get_setting("EVENTS_LIMIT")
+
+        results = await asyncio.gather(*(take(self.iter_events(event_type), limit) for event_type in LISTINGS),
+                                       return_exceptions=True)
+
+        return build_event_list(dict(zip(LISTINGS, results)), limit)
+
+    async def add_registrants(self, event_type, event_id, registrants):
+        """
+        Add several registrants to an event, using as few batch registration calls as possible.
+        Returns a list of RegistrantResult, in the same order as `registrants`.
+        """
+        results = []
+
+        for batch in iter_batches(registrants):
+            results.extend(await self._add_registrants_batch(event_type, event_id, batch))
+
+        return results
+
+    async def _add_registrants_batch(self, event_type, event_id, registrants):
+        batch = get_batch_registrants(registrants)
+
+        if len(batch) <= 1:
+            return await self._add_registrants_one_by_one(event_type, event_id, registrants)
+
+        try:
+            response = await self.add_registrants_batch(event_type, event_id, batch)
+        except HTTPError as e:
+            if is_batch_unsupported(e):
+                return await self._add_registrants_one_by_one(event_type, event_id, registrants)
+            return [RegistrantResult(registrant, error=e) for registrant in registrants]
+        except Exception as e:
+            return [RegistrantResult(registrant, error=e) for registrant in registrants]
+
+        added, missing = get_batch_response_registrants(registrants, response)
+
+        return merge_batch_results(registrants, added,
+                                   await self._add_registrants_one_by_one(event_type, event_id, missing))
+
+    async def _add_registrants_one_by_one(self, event_type, event_id, registrants):
+        # sent concurrently, within the rate limits
+        async def add(registrant):
+            try:
+                response = await self.add_registrant(event_type, event_id, registrant)
+                return RegistrantResult(registrant, response=response)
+            except Exception as e:
+                return RegistrantResult(registrant, error=e)
+
+        return list(await asyncio.gather(*(add(registrant) for registrant in registrants)))
+
+
+class AsyncZoomApiPool(CredentialPoolMixin, AsyncZoomApi):
+    """
+    asyncio version of wagtailzoom.credentials.ZoomApiPool.
+    """
+
+    def __init__(self, members, names=None, strategy=None):
+        self.init_pool(members, names=names, strategy=strategy)
+
+    async def pause(self, category, seconds):
+        # throttled credential sets are paused as they are throttled, the others can still be used
+        pass
+
+    async def _send(self, method, url, category, headers, **kwargs):
+        available, unavailable = self.get_candidates(category)
+        response = None
+        error = None
+
+        for member in available:
+            # rather than waiting for the rate limit of a credential set, the next one is tried
+            if not await rate_limiter.aacquire(member.credentials_key, category, max_wait=0):
+                continue
+
+            try:
+                response = await member._send_acquired(method, url, category, headers, **kwargs)
+            except HTTPError as e:
+                # requests do not raise HTTPError here, so the access token of the credential set was refused
+                self.record_failure(member, e)
+                error = e
+                continue
+
+            accepted, pause = self.check_response(member, category, response)
+
+            if pause:
+                await member.pause(category, pause)
+
+            if accepted:
+                return response
+
+        # every credential set tried was throttled or refused. The retry loop handles the last response
+        if response is not None:
+            return response
+
+        if error is not None:
+            raise error
+
+        # every credential set is busy, wait for the one available first
+        member = (available + unavailable)[0]
+        response = await member._send(method, url, category, headers, **kwargs)
+        _, pause = self.check_response(member, category, response)
+
+        if pause:
+            await member.pause(category, pause)
+
+        return response
+
+
+class AsyncZoomEventsApi(BaseZoomEventsApi):
+    def __init__(self):
+        self.base_url = get_setting("EVENTS_API_BASE_URL")
+
+    @property
+    def session(self):
+        return get_async_session("zoom-events")
+
+    async def _get(self, url, params=None, headers=None):
+        response = await send_request(self.session, "GET", url, params=params, headers=headers)
+        if response.status_code != 304:
+            raise_for_status(response)
+        return response
+
+    async def get_event_resource(self, event_id, resource, etag=None):
+        url, params, headers = self.get_event_resource_request(event_id, resource, etag)
+        return self.parse_event_resource(await self._get(url, params, headers=headers), etag)
+
+    async def get_event_sessions(self, event_id):
+        return (await self.get_event_resource(event_id, "sessions"))[0]
+
+    async def get_event_speakers(self, event_id):
+        return (await self.get_event_resource(event_id, "speakers"))[0]
+
+    async def get_event_sponsors(self, event_id):
+        return (await self.get_event_resource(event_id, "sponsors"))[0]
+
+    async def get_event_bundle(self, event_id, previous=None):
+        etags = (previous or {}).get("etags", {})
+
+        results = await asyncio.gather(*(self.get_event_resource(event_id, resource, etags.get(resource))
+                                         for resource in EVENT_RESOURCES))
+
+        return self.build_event_bundle(results, previous)
@@ -0,0 +1,131 @@
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+from .api import BATCH_REGISTRANTS_MAX_SIZE, normalize_email
+from .errors import ZoomRegistrantValidationError
+from .models import ZoomRegistrant
+from .notifications import describe_error
+from .questions import validate_registrant
+from .registrants import claim_registrant, release_registrant, save_registration_response
+from .sync import get_zoom_api
+
+logger = logging.getLogger(__name__)
+
+
+def get_submissions(page, start_after=None):
+    submissions = page.get_submission_class().objects.filter(page=page)
+
+    if start_after:
+        submissions = submissions.filter(pk__gt=start_after)
+
+    return submissions
+
+
+def iter_submission_chunks(page, chunk_size, start_after=None):
+    # keyset pagination, so that only one chunk of submissions is loaded at a time
+    last_pk = start_after
+
+    while True:
+        chunk = list(get_submissions(page, last_pk).order_by("pk").only("pk", "form_data")[:chunk_size])
+
+        if not chunk:
+            break
+
+        yield chunk
+
+        last_pk = chunk[-1].pk
+
+
+def get_registered_emails(event_type, event_id, emails):
+    return set(
+        ZoomRegistrant.objects.filter(
+            event_type=event_type,
+            event_id=str(event_id),
+            email__in=emails,
+            status__in=ZoomRegistrant.ACTIVE_STATUSES,
+        ).values_list("email", flat=True)
+    )
+
+
+def backfill_registrations(page, chunk_size=500, workers=4, start_after=None, dry_run=False, progress=None):
+    """
+    Register the existing form submissions of a Zoom integration form page to its Zoom event.
+    Submissions are read in chunks ordered by primary key, and the registrants of each chunk are sent with batch
+    registration calls, `workers` batches at a time. Emails already registered to the event are skipped.
+    `progress` is called after each chunk with the primary key of its last submission and the stats so far, which
+    can be passed as `start_after` to resume an interrupted backfill.
+    """
+    event_type = page.zoom_event_type
+    event_id = page.zoom_event_id
+    plan = page.get_zoom_registrant_plan()
+    site = page.get_site()
+    zoom = None if dry_run else get_zoom_api(site)
+
+    stats = {"registered": 0, "skipped": 0, "invalid": 0, "failed": 0}
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="wagtailzoom-backfill") as executor:
+        for chunk in iter_submission_chunks(page, chunk_size, start_after=start_after):
+            registrants = {}
+
+            for submission in chunk:
+                payload = plan.build(submission.form_data)
+                email = normalize_email(payload.get("email"))
+
+                if not email:
+                    stats["invalid"] += 1
+                elif email in registrants:
+                    stats["skipped"] += 1
+                else:
+                    try:
+                        # payloads Zoom would refuse are not sent, like those of form submissions
+                        validate_registrant(site, event_type, event_id, payload)
+                    except ZoomRegistrantValidationError as e:
+                        stats["invalid"] += 1
+                        logger.warning("Not registering %s to Zoom %s %s: %s", email, event_type, event_id, e.message)
+                        continue
+
+                    registrants[email] = payload
+
+            registered_emails = get_registered_emails(event_type, event_id, list(registrants))
+            stats["skipped"] += len(registered_emails)
+
+            to_register = []
+
+            for email, payload in registrants.items():
+                if email in registered_emails:
+                    continue
+
+                if dry_run:
+                    stats["registered"] += 1
+                    continue
+
+                # claimed like form submissions, so that a concurrent submission is not registered twice
+                registrant, claimed = claim_registrant(site, event_type, event_id, email)
+
+                if claimed:
+                    to_register.append(payload)
+                else:
+                    stats["skipped"] += 1
+
+            batches = [to_register[i:i + BATCH_REGISTRANTS_MAX_SIZE]
+                       for i in range(0, len(to_register), BATCH_REGISTRANTS_MAX_SIZE)]
+
+            # only Zoom calls run in the workers, results are saved from this thread
+            for batch_results in executor.map(lambda batch: zoom.add_registrants(event_type, event_id, batch),
+                                              batches):
+                for result in batch_results:
+                    email = result.registrant.get("email")
+
+                    if result.ok:
+                        save_registration_response(site, event_type, event_id, email, result.response)
+                        stats["registered"] += 1
+                    else:
+                        release_registrant(event_type, event_id, email)
+                        stats["failed"] += 1
+                        logger.warning("Error registering %s to Zoom %s %s: %s", email, event_type, event_id,
+                                       describe_error(result.error))
+
+            if progress:
+                progress(chunk[-1].pk, stats)
+
+    return stats
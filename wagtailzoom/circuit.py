@@ -0,0 +1,217 @@
+import logging
+import re
+import time
+from urllib.parse import urlsplit
+
+from asgiref.sync import sync_to_async
+from django.core.cache import caches
+from requests import ConnectionError, HTTPError, Timeout
+
+from .conf import get_setting
+from .errors import ZoomCircuitOpenError
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half-open"
+
+# path segments that identify a resource, e.g. a meeting ID, but not the API version
+ID_SEGMENT_RE = re.compile(r"^(?!v\d+$).*\d")
+# characters that are not safe in cache keys, e.g. with memcached
+UNSAFE_KEY_CHARS_RE = re.compile(r"[^\w/.-]")
+
+
+def get_endpoint_name(method, url):
+    # e.g. "POST /v2/meetings/{id}/registrants", so that all calls to the same endpoint share a circuit
+    segments = ["{id}" if ID_SEGMENT_RE.search(segment) else segment for segment in urlsplit(url).path.split("/")]
+    return f"{method} {'/'.join(segments)}"
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker for one Zoom endpoint, with its state kept in the Django cache so that it is shared by all
+    workers. The circuit opens after a number of failures within WAGTAILZOOM_CIRCUIT_FAILURE_WINDOW seconds. Calls
+    then fail fast for WAGTAILZOOM_CIRCUIT_RESET_TIMEOUT seconds, after which a single trial call is let through
+    (half-open), closing the circuit if it succeeds and opening it again if it fails.
+    """
+
+    def __init__(self, endpoint):
+        self.endpoint = endpoint
+        self.key = "wagtailzoom:circuit:" + UNSAFE_KEY_CHARS_RE.sub("_", endpoint)
+
+    @property
+    def cache(self):
+        return caches[get_setting("CIRCUIT_CACHE_ALIAS")]
+
+    @property
+    def threshold(self):
+        return get_setting("CIRCUIT_THRESHOLDS").get(self.endpoint, get_setting("CIRCUIT_FAILURE_THRESHOLD"))
+
+    @property
+    def state_keys(self):
+        return [f"{self.key}:opened_at", f"{self.key}:trial", f"{self.key}:failures"]
+
+    def get_state_at(self, opened_at):
+        if opened_at is None:
+            return CLOSED
+
+        if time.time() - opened_at < get_setting("CIRCUIT_RESET_TIMEOUT"):
+            return OPEN
+
+        return HALF_OPEN
+
+    def get_state(self):
+        return self.get_state_at(self.cache.get(f"{self.key}:opened_at"))
+
+    async def aget_state(self):
+        return self.get_state_at(await self.cache.aget(f"{self.key}:opened_at"))
+
+    def get_open_error(self):
+        return ZoomCircuitOpenError(f"Zoom endpoint {self.endpoint} is unavailable, calls are suspended")
+
+    def before_call(self):
+        state = self.get_state()
+
+        if state == CLOSED:
+            return state
+
+        # only one worker sends the trial call, the others keep failing fast until it completes
+        if state == HALF_OPEN and self.cache.add(f"{self.key}:trial", True,
+                                                 timeout=get_setting("CIRCUIT_RESET_TIMEOUT")):
+            return state
+
+        raise self.get_open_error()
+
+    async def abefore_call(self):
+        state = await self.aget_state()
+
+        if state == CLOSED:
+            return state
+
+        if state == HALF_OPEN and await self.cache.aadd(f"{self.key}:trial", True,
+                                                        timeout=get_setting("CIRCUIT_RESET_TIMEOUT")):
+            return state
+
+        raise self.get_open_error()
+
+    def record_success(self, state):
+        if state != CLOSED:
+            self.cache.delete_many(self.state_keys)
+            logger.info("Zoom circuit closed for %s", self.endpoint)
+
+    async def arecord_success(self, state):
+        if state != CLOSED:
+            await self.cache.adelete_many(self.state_keys)
+            logger.info("Zoom circuit closed for %s", self.endpoint)
+
+    def record_failure(self, state):
+        if state == HALF_OPEN:
+            # the trial call failed, suspend calls for another reset timeout
+            self.cache.set(f"{self.key}:opened_at", time.time(), timeout=None)
+            self.cache.delete(f"{self.key}:trial")
+            return
+
+        failures_key = f"{self.key}:failures"
+        self.cache.add(failures_key, 0, timeout=get_setting("CIRCUIT_FAILURE_WINDOW"))
+
+        try:
+            failures = self.cache.incr(failures_key)
+        except ValueError:
+            # the window expired in between
+            return
+
+        # only the worker that opens the circuit reports it, instead of every failed submission
+        if failures >= self.threshold and self.cache.add(f"{self.key}:opened_at", time.time(), timeout=None):
+            logger.warning("Zoom circuit opened for %s", self.endpoint)
+            self.notify_opened()
+
+    async def arecord_failure(self, state):
+        if state == HALF_OPEN:
+            await self.cache.aset(f"{self.key}:opened_at", time.time(), timeout=None)
+            await self.cache.adelete(f"{self.key}:trial")
+            return
+
+        failures_key = f"{self.key}:failures"
+        await self.cache.aadd(failures_key, 0, timeout=get_setting("CIRCUIT_FAILURE_WINDOW"))
+
+        try:
+            failures = await self.cache.aincr(failures_key)
+        except ValueError:
+            return
+
+        if failures >= self.threshold and await self.cache.aadd(f"{self.key}:opened_at", time.time(), timeout=None):
+            logger.warning("Zoom circuit opened for %s", self.endpoint)
+            await sync_to_async(self.notify_opened)()
+
+    def is_failure(self, error):
+        if isinstance(error, HTTPError):
+            # Zoom answered, only server errors show that it is degraded
+            return error.response is not None and error.response.status_code >= 500
+
+        return True
+
+    def record_error(self, state, error):
+        if self.is_failure(error):
+            self.record_failure(state)
+        else:
+            self.record_success(state)
+
+    async def arecord_error(self, state, error):
+        if self.is_failure(error):
+            await self.arecord_failure(state)
+        else:
+            await self.arecord_success(state)
+
+    def notify_opened(self):
+        from .models import ZoomIntegrationError
+        from .notifications import record_error
+
+        record_error(
+            f"Calls to the Zoom endpoint {self.endpoint} kept failing, and are suspended until it recovers",
+            source=ZoomIntegrationError.SOURCE_CIRCUIT,
+            error_class="ZoomCircuitOpened",
+        )
+
+
+def get_circuit_breaker(method, url):
+    if not get_setting("CIRCUIT_BREAKER_ENABLED"):
+        return None
+    return CircuitBreaker(get_endpoint_name(method, url))
+
+
+def call_with_circuit_breaker(method, url, fn, *args, **kwargs):
+    circuit_breaker = get_circuit_breaker(method, url)
+
+    if circuit_breaker is None:
+        return fn(*args, **kwargs)
+
+    state = circuit_breaker.before_call()
+
+    try:
+        result = fn(*args, **kwargs)
+    except (ConnectionError, Timeout, HTTPError) as e:
+        circuit_breaker.record_error(state, e)
+        raise
+
+    circuit_breaker.record_success(state)
+    return result
+
+
+async def acall_with_circuit_breaker(method, url, fn, *args, **kwargs):
+    # same as call_with_circuit_breaker, for a coroutine function
+    circuit_breaker = get_circuit_breaker(method, url)
+
+    if circuit_breaker is None:
+        return await fn(*args, **kwargs)
+
+    state = await circuit_breaker.abefore_call()
+
+    try:
+        result = await fn(*args, **kwargs)
+    except (ConnectionError, Timeout, HTTPError) as e:
+        await circuit_breaker.arecord_error(state, e)
+        raise
+
+    await circuit_breaker.arecord_success(state)
+    return result
@@ -0,0 +1,172 @@
+import threading
+
+from asgiref.sync import sync_to_async
+from django.core.cache import caches
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .api import ZoomApi
+from .conf import get_setting
+from .credentials import ZoomApiPool, get_pool_key
+from .errors import ZoomApiCredentialsError
+from .models import ZoomCredential, ZoomSettings
+from .tokens import get_credentials_key
+
+
+class ZoomClientRegistry:
+    """
+    Keeps one long-lived ZoomApi client per set of OAuth credentials, or pool of credential sets, and the credentials
+    of each site, so that requests do not load Zoom Settings and build a new client every time.
+    Saving Zoom Settings invalidates the site's entry in every process sharing the clients cache.
+    """
+
+    def __init__(self):
+        # site id -> (version, credentials key)
+        self._sites = {}
+        # credentials key -> ZoomApi
+        self._clients = {}
+        self._lock = threading.Lock()
+
+    @property
+    def cache(self):
+        return caches[get_setting("CLIENTS_CACHE_ALIAS")]
+
+    def get_version_key(self, site_id):
+        return f"wagtailzoom:clients:{site_id}"
+
+    def get_version(self, site_id):
+        return self.cache.get(self.get_version_key(site_id), 0)
+
+    async def aget_version(self, site_id):
+        return await self.cache.aget(self.get_version_key(site_id), 0)
+
+    def get_client_at(self, site, version):
+        # returns None when the site's Zoom Settings have to be loaded
+        entry = self._sites.get(site.pk)
+
+        if entry is not None and entry[0] == version:
+            return self._clients.get(entry[1])
+
+        return None
+
+    def get_cached_client(self, site):
+        return self.get_client_at(site, self.get_version(site.pk))
+
+    def get_client(self, site):
+        client = self.get_cached_client(site)
+        if client is not None:
+            return client
+
+        version = self.get_version(site.pk)
+        credentials = ZoomSettings.for_site(site).get_credentials()
+
+        if not credentials:
+            raise ZoomApiCredentialsError("Missing Zoom API OAUTH credentials")
+
+        if len(credentials) == 1:
+            credentials_key = get_credentials_key(*credentials[0][1:])
+        else:
+            credentials_key = get_pool_key([get_credentials_key(*c[1:]) for c in credentials],
+                                           get_setting("CREDENTIALS_STRATEGY"))
+
+        client = self._clients.get(credentials_key)
+
+        if client is None:
+            # created outside of the lock, as it fetches an access token
+            client = self.create_client(credentials)
+
+        with self._lock:
+            client = self._clients.setdefault(credentials_key, client)
+            self._sites[site.pk] = (version, credentials_key)
+
+        return client
+
+    def create_client(self, credentials):
+        if len(credentials) == 1:
+            return ZoomApi(*credentials[0][1:])
+
+        # tokens of the credential sets are fetched as each one is first used
+        members = [ZoomApi(*c[1:], fetch_token=False) for c in credentials]
+        names = {member.credentials_key: c[0] for member, c in zip(members, credentials)}
+
+        return ZoomApiPool(members, names=names)
+
+    def invalidate(self, site_id):
+        version_key = self.get_version_key(site_id)
+
+        # bumping the version makes other processes, and registries, load the site's settings again
+        if not self.cache.add(version_key, 1, timeout=None):
+            try:
+                self.cache.incr(version_key)
+            except ValueError:
+                self.cache.set(version_key, 1, timeout=None)
+
+        self.forget(site_id)
+
+    def forget(self, site_id):
+        with self._lock:
+            entry = self._sites.pop(site_id, None)
+
+            # clients of credentials that no site uses anymore are dropped
+            if entry and entry[1] not in {key for version, key in self._sites.values()}:
+                self._clients.pop(entry[1], None)
+
+    def clear(self):
+        with self._lock:
+            self._sites.clear()
+            self._clients.clear()
+
+
+class AsyncZoomClientRegistry(ZoomClientRegistry):
+    """
+    Registry of the asyncio clients of wagtailzoom.async_api, sharing the settings versions of the sync registry.
+    """
+
+    def create_client(self, credentials):
+        from .async_api import AsyncZoomApi, AsyncZoomApiPool
+
+        if len(credentials) == 1:
+            return AsyncZoomApi(*credentials[0][1:])
+
+        members = [AsyncZoomApi(*c[1:]) for c in credentials]
+        names = {member.credentials_key: c[0] for member, c in zip(members, credentials)}
+
+        return AsyncZoomApiPool(members, names=names)
+
+
+client_registry = ZoomClientRegistry()
+async_client_registry = AsyncZoomClientRegistry()
+
+
+def get_zoom_client(site):
+    return client_registry.get_client(site)
+
+
+async def aget_zoom_client(site):
+    client = async_client_registry.get_client_at(site, await async_client_registry.aget_version(site.pk))
+
+    if client is None:
+        # Zoom Settings are loaded from the database in a thread
+        client = await sync_to_async(async_client_registry.get_client)(site)
+
+    return client
+
+
+def invalidate_site_clients(site_id):
+    client_registry.invalidate(site_id)
+    async_client_registry.forget(site_id)
+
+
+@receiver(post_save, sender=ZoomSettings)
+@receiver(post_delete, sender=ZoomSettings)
+def invalidate_zoom_client(sender, instance, **kwargs):
+    invalidate_site_clients(instance.site_id)
+
+
+@receiver(post_save, sender=ZoomCredential)
+@receiver(post_delete, sender=ZoomCredential)
+def invalidate_zoom_credential_client(sender, instance, **kwargs):
+    # credentials are saved after their Zoom Settings, which were already invalidated
+    site_id = ZoomSettings.objects.filter(pk=instance.setting_id).values_list("site_id", flat=True).first()
+    if site_id:
+        invalidate_site_clients(site_id)
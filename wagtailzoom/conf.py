@@ -0,0 +1,116 @@
+from django.conf import settings
+
+DEFAULTS = {
+    # Zoom API, OAuth token and Zoom Events API endpoints, e.g. to use a local fake server in benchmarks
+    "API_BASE_URL": "https://api.zoom.us/v2",
+    "OAUTH_URL": "https://zoom.us/oauth/token",
+    "EVENTS_API_BASE_URL": "https://events.zoom.us/api/v1",
+    # where OAuth access tokens are cached. "local" keeps them in process memory,
+    # "django" stores them in the Django cache so that all workers share one token
+    "TOKEN_CACHE": "local",
+    "TOKEN_CACHE_ALIAS": "default",
+    # seconds before expiry at which a cached token is refreshed
+    "TOKEN_REFRESH_MARGIN": 300,
+    # pooled HTTP sessions used to talk to Zoom
+    "HTTP_POOL_CONNECTIONS": 4,
+    "HTTP_POOL_SIZE": 10,
+    "HTTP_POOL_BLOCK": False,
+    "HTTP_KEEP_ALIVE": True,
+    # seconds to wait for a connection to Zoom, and for Zoom to send a response
+    "HTTP_CONNECT_TIMEOUT": 3.05,
+    "HTTP_READ_TIMEOUT": 10,
+    # page size used when listing meetings and webinars, and maximum number of events listed for selection
+    "EVENTS_PAGE_SIZE": 100,
+    "EVENTS_LIMIT": 100,
+    # threads shared by all requests to fetch meeting and webinar listings concurrently
+    "EVENTS_FETCH_WORKERS": 4,
+    # cache for the event list shown in the page editor. Entries older than EVENTS_CACHE_TTL seconds are refreshed
+    # in the background, and still served while they are not older than EVENTS_CACHE_TTL + EVENTS_CACHE_STALE_TTL
+    "EVENTS_CACHE_ALIAS": "default",
+    "EVENTS_CACHE_TTL": 300,
+    "EVENTS_CACHE_STALE_TTL": 3600,
+    # seconds for which the details of a mirrored event are reused before being fetched from Zoom again
+    "EVENTS_DETAIL_TTL": 300,
+    # cache for the sessions, speakers and sponsors of Zoom Events events. Entries older than EVENT_BUNDLE_TTL seconds
+    # are revalidated in the background, and still served while they are not older than
+    # EVENT_BUNDLE_TTL + EVENT_BUNDLE_STALE_TTL
+    "EVENT_BUNDLE_CACHE_ALIAS": "default",
+    "EVENT_BUNDLE_TTL": 300,
+    "EVENT_BUNDLE_STALE_TTL": 86400,
+    # cache of the registration questions of events
+    "QUESTIONS_CACHE_ALIAS": "default",
+    "QUESTIONS_CACHE_TTL": 3600,
+    # validate registrants against the registration questions of the event before sending them to Zoom
+    "VALIDATE_REGISTRANTS": True,
+    # maximum age in seconds of a webhook request
+    "WEBHOOK_TIMESTAMP_TOLERANCE": 300,
+    # client side rate limiting, per credential set and Zoom rate limit category. "local" limits each process,
+    # "django" shares the limits between processes through the Django cache
+    "RATE_LIMIT_ENABLED": True,
+    "RATE_LIMIT_BACKEND": "local",
+    "RATE_LIMIT_CACHE_ALIAS": "default",
+    # requests per second for each category
+    "RATE_LIMITS": {"light": 30, "medium": 20, "heavy": 10},
+    # maximum seconds to wait for the rate limit before giving up
+    "RATE_LIMIT_MAX_WAIT": 10,
+    # attempts for rate limited requests, and for safe requests failing with a server or connection error
+    "RETRY_MAX_ATTEMPTS": 3,
+    # base seconds of the exponential backoff between attempts
+    "RETRY_BACKOFF": 0.5,
+    # give up instead of retrying when Zoom asks to wait longer than this number of seconds
+    "RETRY_MAX_DELAY": 10,
+    # "inline" adds registrants to Zoom during the form submission request,
+    # "outbox" queues them for delivery by a background worker
+    "REGISTRATION_DELIVERY": "inline",
+    # drain the outbox in a background thread after each submission is committed
+    "OUTBOX_DRAIN_IN_THREAD": False,
+    "OUTBOX_BATCH_SIZE": 100,
+    # send registrations queued for the same event together, using Zoom batch registration calls
+    "OUTBOX_COALESCE": True,
+    "OUTBOX_MAX_ATTEMPTS": 8,
+    # base and maximum seconds to wait between delivery attempts
+    "OUTBOX_RETRY_DELAY": 30,
+    "OUTBOX_MAX_RETRY_DELAY": 3600,
+    # seconds after which a registration stuck in processing is handed to another worker
+    "OUTBOX_PROCESSING_TIMEOUT": 300,
+    # answer repeated submissions for an event and email from the stored registrant, instead of calling Zoom again
+    "REGISTRANT_DEDUPE": True,
+    # seconds after which a registration that was being sent to Zoom, e.g. by a crashed request, may be sent again
+    "REGISTRANT_CLAIM_TIMEOUT": 60,
+    # suspend calls to a Zoom endpoint after repeated connection failures, timeouts or server errors
+    "CIRCUIT_BREAKER_ENABLED": True,
+    # Django cache alias holding the circuit states, shared by all workers
+    "CIRCUIT_CACHE_ALIAS": "default",
+    # failures within CIRCUIT_FAILURE_WINDOW seconds that open the circuit of an endpoint
+    "CIRCUIT_FAILURE_THRESHOLD": 5,
+    # thresholds of specific endpoints, e.g. {"POST /v2/meetings/{id}/registrants": 3}
+    "CIRCUIT_THRESHOLDS": {},
+    "CIRCUIT_FAILURE_WINDOW": 60,
+    # seconds during which calls fail fast, before a trial call is let through
+    "CIRCUIT_RESET_TIMEOUT": 30,
+    # "fail" drops registrations while the circuit is open, "outbox" queues them for later delivery
+    "CIRCUIT_OPEN_ACTION": "fail",
+    # at most this number of error digests are emailed to the admins per ERROR_DIGEST_WINDOW seconds
+    "ERROR_DIGEST_MAX_PER_WINDOW": 1,
+    "ERROR_DIGEST_WINDOW": 3600,
+    # groups of errors listed in a digest
+    "ERROR_DIGEST_MAX_GROUPS": 20,
+    # None disables metrics. "logging" logs them, "prometheus" keeps them in memory for the metrics view.
+    # Can also be the dotted path of a custom backend class
+    "METRICS_BACKEND": None,
+    # token required in the Authorization header of metrics view requests. Without it, only staff users have access
+    "METRICS_TOKEN": None,
+    # Django cache alias used to tell other processes that Zoom Settings changed
+    "CLIENTS_CACHE_ALIAS": "default",
+    # how requests are spread over the credential sets of a site. "round_robin" takes turns,
+    # "least_recently_throttled" prefers the credential sets that Zoom has not rate limited for the longest time
+    "CREDENTIALS_STRATEGY": "round_robin",
+    # seconds a credential set rate limited by Zoom without a Retry-After header is left out of rotation
+    "CREDENTIALS_THROTTLE_COOLDOWN": 5,
+    # seconds a credential set whose access token is refused is left out of rotation
+    "CREDENTIALS_FAILURE_COOLDOWN": 300,
+}
+
+
+def get_setting(name):
+    return getattr(settings, f"WAGTAILZOOM_{name}", DEFAULTS[name])
@@ -0,0 +1,253 @@
+import hashlib
+import itertools
+import logging
+import threading
+import time
+
+from requests import HTTPError
+
+from .api import ZoomApi
+from .conf import get_setting
+from .errors import ZoomApiCredentialsError
+from .metrics import get_metrics
+from .ratelimit import get_retry_after, rate_limiter
+
+logger = logging.getLogger(__name__)
+
+# strategies used to pick the credential set of each request
+ROUND_ROBIN = "round_robin"
+LEAST_RECENTLY_THROTTLED = "least_recently_throttled"
+
+
+class CredentialHealth:
+    """
+    Health of a credential set in this process. Credential sets that are rate limited by Zoom, or whose access token
+    cannot be obtained, are taken out of rotation for a while.
+    """
+
+    def __init__(self):
+        # rate limit category -> monotonic time until which the credential set is throttled
+        self.throttled_until = {}
+        self.failed_until = 0
+        self.last_throttled_at = 0
+        self.last_used_at = 0
+        self.requests = 0
+        self.throttled = 0
+        self.failures = 0
+        self._lock = threading.Lock()
+
+    def is_available(self, category, now):
+        return self.failed_until <= now and self.throttled_until.get(category, 0) <= now
+
+    def get_available_at(self, category):
+        return max(self.failed_until, self.throttled_until.get(category, 0))
+
+    def record_success(self):
+        with self._lock:
+            self.requests += 1
+            self.last_used_at = time.monotonic()
+
+    def record_throttled(self, category, seconds):
+        now = time.monotonic()
+
+        with self._lock:
+            self.requests += 1
+            self.throttled += 1
+            self.last_used_at = self.last_throttled_at = now
+            self.throttled_until[category] = max(self.throttled_until.get(category, 0), now + seconds)
+
+    def record_failure(self, seconds):
+        now = time.monotonic()
+
+        with self._lock:
+            self.failures += 1
+            self.last_used_at = now
+            self.failed_until = now + seconds
+
+    def as_dict(self):
+        now = time.monotonic()
+
+        return {
+            "requests": self.requests,
+            "throttled": self.throttled,
+            "failures": self.failures,
+            "failed_for": max(0, self.failed_until - now),
+            "throttled_for": {category: until - now for category, until in self.throttled_until.items()
+                              if until > now},
+        }
+
+
+_health = {}
+_health_lock = threading.Lock()
+
+
+def get_credential_health(credentials_key):
+    # health is kept per credential set, so that pools sharing a credential set see the same state
+    health = _health.get(credentials_key)
+
+    if health is None:
+        with _health_lock:
+            health = _health.setdefault(credentials_key, CredentialHealth())
+
+    return health
+
+
+def get_pool_key(credentials_keys, strategy):
+    raw = ":".join([strategy, *credentials_keys])
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+class CredentialPoolMixin:
+    """
+    Selection of the credential set of each request, shared by the sync and async client pools.
+    """
+
+    def init_pool(self, members, names=None, strategy=None):
+        if not members:
+            raise ZoomApiCredentialsError("Missing Zoom API OAUTH credentials")
+
+        self.is_active = True
+        self.headers = {}
+        self.base_url = get_setting("API_BASE_URL")
+        self.members = list(members)
+        self.strategy = strategy or get_setting("CREDENTIALS_STRATEGY")
+        # credentials key -> name shown in logs and metrics, as secrets must not end up there
+        self.names = names or {member.credentials_key: member.credentials_key[:8] for member in self.members}
+        self.credentials_key = get_pool_key([member.credentials_key for member in self.members], self.strategy)
+        self._counter = itertools.count()
+
+        if self.strategy not in (ROUND_ROBIN, LEAST_RECENTLY_THROTTLED):
+            raise ValueError(f"Unknown WAGTAILZOOM_CREDENTIALS_STRATEGY '{self.strategy}'")
+
+    def get_candidates(self, category):
+        """
+        Returns the credential sets available for a request of the category, in the order they should be tried,
+        and the others, ordered by when they become available again.
+        """
+        now = time.monotonic()
+        available = []
+        unavailable = []
+
+        for member in self.members:
+            health = get_credential_health(member.credentials_key)
+            if health.is_available(category, now):
+                available.append(member)
+            else:
+                unavailable.append(member)
+
+        if self.strategy == LEAST_RECENTLY_THROTTLED:
+            def sort_key(member):
+                health = get_credential_health(member.credentials_key)
+                return health.last_throttled_at, health.last_used_at
+
+            available.sort(key=sort_key)
+        elif available:
+            start = next(self._counter) % len(available)
+            available = available[start:] + available[:start]
+
+        unavailable.sort(key=lambda member: get_credential_health(member.credentials_key).get_available_at(category))
+
+        return available, unavailable
+
+    def pause(self, category, seconds):
+        # throttled credential sets are paused as they are throttled, the others can still be used
+        pass
+
+    def record_throttled(self, member, category, seconds):
+        # returns the seconds for which the rate limit of the credential set is paused
+        if seconds is None:
+            seconds = get_setting("CREDENTIALS_THROTTLE_COOLDOWN")
+
+        get_credential_health(member.credentials_key).record_throttled(category, seconds)
+
+        metrics = get_metrics()
+        if metrics.enabled:
+            metrics.increment("wagtailzoom_credential_throttled_total", credential=self.names[member.credentials_key],
+                              category=category)
+
+        return seconds
+
+    def check_response(self, member, category, response):
+        """
+        Record the outcome of a request sent with a credential set. Returns whether the response is returned to the
+        caller, rather than trying the next credential set, and the seconds for which the credential set's rate limit
+        must be paused, when Zoom throttled it.
+        """
+        if response.status_code == 429:
+            return False, self.record_throttled(member, category, get_retry_after(response))
+
+        if response.status_code == 401:
+            self.record_failure(member, f"{response.status_code} response")
+            return False, None
+
+        get_credential_health(member.credentials_key).record_success()
+        return True, None
+
+    def record_failure(self, member, error):
+        name = self.names[member.credentials_key]
+        cooldown = get_setting("CREDENTIALS_FAILURE_COOLDOWN")
+
+        get_credential_health(member.credentials_key).record_failure(cooldown)
+        logger.warning("Zoom credentials '%s' taken out of rotation for %s seconds: %s", name, cooldown, error)
+
+        metrics = get_metrics()
+        if metrics.enabled:
+            metrics.increment("wagtailzoom_credential_failures_total", credential=name)
+
+    def get_health(self):
+        return {self.names[member.credentials_key]: get_credential_health(member.credentials_key).as_dict()
+                for member in self.members}
+
+
+class ZoomApiPool(CredentialPoolMixin, ZoomApi):
+    """
+    Zoom API client spreading requests over several credential sets, e.g. several Server-to-Server OAuth apps of the
+    same Zoom account, so that their rate limits add up. Each credential set keeps its own access token and rate
+    limits, and is skipped while Zoom throttles it.
+    """
+
+    def __init__(self, members, names=None, strategy=None):
+        self.init_pool(members, names=names, strategy=strategy)
+
+    def _send(self, method, url, category, headers, **kwargs):
+        available, unavailable = self.get_candidates(category)
+        response = None
+        error = None
+
+        for member in available:
+            # rather than waiting for the rate limit of a credential set, the next one is tried
+            if not rate_limiter.acquire(member.credentials_key, category, max_wait=0):
+                continue
+
+            try:
+                response = member._send_acquired(method, url, category, headers, **kwargs)
+            except HTTPError as e:
+                # requests do not raise HTTPError here, so the access token of the credential set was refused
+                self.record_failure(member, e)
+                error = e
+                continue
+
+            accepted, pause = self.check_response(member, category, response)
+
+            if pause:
+                member.pause(category, pause)
+
+            if accepted:
+                return response
+
+        # every credential set tried was throttled or refused. The retry loop handles the last response
+        if response is not None:
+            return response
+
+        if error is not None:
+            raise error
+
+        # every credential set is busy, wait for the one available first
+        member = (available + unavailable)[0]
+        response = member._send(method, url, category, headers, **kwargs)
+        _, pause = self.check_response(member, category, response)
+
+        if pause:
+            member.pause(category, pause)
+
+        return response
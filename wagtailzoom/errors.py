@@ -12,3 +12,17 @@ class Error(Exception):
 
 class ZoomApiCredentialsError(Error):
     pass
+
+
+class ZoomRateLimitError(Error):
+    pass
+
+
+class ZoomCircuitOpenError(Error):
+    pass
+
+
+class ZoomRegistrantValidationError(Error):
+    def __init__(self, errors):
+        self.errors = errors
+        super().__init__("; ".join(errors))
@@ -0,0 +1,80 @@
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.cache import caches
+
+from .api import ZoomEventsApi
+from .conf import get_setting
+from .metrics import get_metrics
+
+logger = logging.getLogger(__name__)
+
+_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="wagtailzoom-event-bundles")
+
+
+def get_cache():
+    return caches[get_setting("EVENT_BUNDLE_CACHE_ALIAS")]
+
+
+def get_cache_key(event_id):
+    return f"wagtailzoom:event-bundle:{event_id}"
+
+
+def refresh_event_bundle(event_id):
+    cache_key = get_cache_key(event_id)
+    entry = get_cache().get(cache_key)
+
+    # unchanged resources are revalidated with their ETags instead of being downloaded again
+    bundle = ZoomEventsApi().get_event_bundle(event_id, previous=entry["bundle"] if entry else None)
+
+    entry = {"bundle": bundle, "fetched_at": time.time()}
+    get_cache().set(cache_key, entry, timeout=get_setting("EVENT_BUNDLE_TTL") + get_setting("EVENT_BUNDLE_STALE_TTL"))
+
+    return entry
+
+
+def _refresh_in_background(event_id):
+    try:
+        refresh_event_bundle(event_id)
+    except Exception:
+        logger.exception("Error refreshing Zoom Events data for event %s", event_id)
+    finally:
+        get_cache().delete(get_cache_key(event_id) + ":refreshing")
+
+
+def schedule_refresh(event_id):
+    # only one refresh at a time per event
+    if get_cache().add(get_cache_key(event_id) + ":refreshing", True, timeout=60):
+        _executor.submit(_refresh_in_background, event_id)
+
+
+def get_event_bundle(event_id, fetch=True):
+    """
+    Return the sessions, speakers and sponsors of a Zoom Events event, from the cache. Entries older than
+    WAGTAILZOOM_EVENT_BUNDLE_TTL are served while they are revalidated in the background. Without `fetch`, a missing
+    entry is fetched in the background and None is returned, so that the caller never waits for Zoom.
+    """
+    metrics = get_metrics()
+    entry = get_cache().get(get_cache_key(event_id))
+
+    if entry is None:
+        metrics.increment("wagtailzoom_event_bundle_cache_total", result="miss")
+
+        if not fetch:
+            schedule_refresh(event_id)
+            return None
+
+        return refresh_event_bundle(event_id)["bundle"]
+
+    if time.time() - entry["fetched_at"] > get_setting("EVENT_BUNDLE_TTL"):
+        metrics.increment("wagtailzoom_event_bundle_cache_total", result="stale")
+        schedule_refresh(event_id)
+    else:
+        metrics.increment("wagtailzoom_event_bundle_cache_total", result="hit")
+
+    return entry["bundle"]
+
+
+def invalidate_event_bundle(event_id):
+    get_cache().delete(get_cache_key(event_id))
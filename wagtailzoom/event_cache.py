@@ -0,0 +1,150 @@
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.cache import caches
+from django.db import close_old_connections
+from django.utils.translation import gettext as _
+from requests import HTTPError
+
+from .conf import get_setting
+from .errors import ZoomApiCredentialsError
+from .metrics import get_metrics
+
+logger = logging.getLogger(__name__)
+
+_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="wagtailzoom-events")
+
+# event attributes needed to list and select events in the page editor
+EVENT_FIELDS = ["id", "topic", "start_time", "duration", "timezone", "event_type", "event_type_label"]
+
+
+def get_cache():
+    return caches[get_setting("EVENTS_CACHE_ALIAS")]
+
+
+def get_cache_key(site_id):
+    return f"wagtailzoom:events:{site_id}"
+
+
+def get_error_message(error):
+    if isinstance(error, HTTPError) and error.response is not None:
+        try:
+            response = error.response.json()
+        except ValueError:
+            response = None
+
+        if response and response.get("message"):
+            return response.get("message")
+
+    return str(error)
+
+
+def get_listing_warnings(errors):
+    warnings = []
+
+    # one of the listings failed, e.g. webinars for an account without a webinar plan
+    for event_type, error in errors.items():
+        if event_type == "meeting":
+            warning = _("Error obtaining Zoom meetings.")
+        else:
+            warning = _("Error obtaining Zoom webinars.")
+        warnings.append(f"{warning} {get_error_message(error)}")
+
+    return warnings
+
+
+def refresh_events(site):
+    from .sync import sync_events
+
+    stats, errors = sync_events(site)
+
+    sync_state = {"synced_at": time.time(), "warnings": get_listing_warnings(errors), "stats": stats}
+    get_cache().set(get_cache_key(site.pk), sync_state, timeout=None)
+
+    return sync_state
+
+
+def _refresh_in_background(site):
+    close_old_connections()
+    try:
+        refresh_events(site)
+    except Exception:
+        logger.exception("Error refreshing Zoom events for site %s", site.pk)
+    finally:
+        get_cache().delete(get_cache_key(site.pk) + ":refreshing")
+        close_old_connections()
+
+
+def schedule_refresh(site):
+    # only one refresh at a time per site
+    if get_cache().add(get_cache_key(site.pk) + ":refreshing", True, timeout=60):
+        _executor.submit(_refresh_in_background, site)
+
+
+def get_sync_state(site, force_refresh=False):
+    metrics = get_metrics()
+    sync_state = None if force_refresh else get_cache().get(get_cache_key(site.pk))
+
+    if sync_state is None:
+        from .models import ZoomEvent
+
+        if force_refresh or not ZoomEvent.objects.filter(site=site).exists():
+            metrics.increment("wagtailzoom_events_cache_total", result="refresh" if force_refresh else "miss")
+            return refresh_events(site)
+
+        # the mirror was filled before, e.g. by the zoom_sync_events command. Serve it and refresh in the background
+        sync_state = {"synced_at": 0, "warnings": []}
+
+    age = time.time() - sync_state["synced_at"]
+
+    if sync_state["synced_at"] and age > get_setting("EVENTS_CACHE_TTL") + get_setting("EVENTS_CACHE_STALE_TTL"):
+        metrics.increment("wagtailzoom_events_cache_total", result="expired")
+        return refresh_events(site)
+
+    if age > get_setting("EVENTS_CACHE_TTL"):
+        metrics.increment("wagtailzoom_events_cache_total", result="stale")
+        schedule_refresh(site)
+        sync_state = {**sync_state, "stale": True}
+    else:
+        metrics.increment("wagtailzoom_events_cache_total", result="hit")
+
+    return sync_state
+
+
+def get_events(site, force_refresh=False):
+    """
+    Return the upcoming events of the site's Zoom account from the ZoomEvent mirror.
+    The mirror is synced with Zoom once it is older than WAGTAILZOOM_EVENTS_CACHE_TTL, in the background while it is
+    not older than WAGTAILZOOM_EVENTS_CACHE_TTL + WAGTAILZOOM_EVENTS_CACHE_STALE_TTL.
+    """
+    from .models import ZoomEvent
+
+    sync_state = get_sync_state(site, force_refresh=force_refresh)
+
+    zoom_events = ZoomEvent.objects.filter(site=site).only("data")[:get_setting("EVENTS_LIMIT")]
+
+    return {
+        "events": [{key: zoom_event.data.get(key) for key in EVENT_FIELDS} for zoom_event in zoom_events],
+        "warnings": sync_state["warnings"],
+        "fetched_at": sync_state["synced_at"],
+        "stale": sync_state.get("stale", False),
+    }
+
+
+def get_events_error_message(error):
+    if isinstance(error, ZoomApiCredentialsError):
+        return error.message
+
+    message = _("Error obtaining Zoom events. "
+                "Please make sure the Zoom credentials in Zoom Settings are correct, "
+                "and have required Zoom Account access scope.")
+
+    if isinstance(error, HTTPError):
+        message += _("- Specific Error: ") + get_error_message(error)
+
+    return message
+
+
+def invalidate_events(site_id):
+    get_cache().delete(get_cache_key(site_id))
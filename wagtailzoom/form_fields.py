@@ -0,0 +1,60 @@
+import threading
+
+from django.apps import apps
+from modelcluster.models import get_all_child_relations
+from wagtail.contrib.forms.models import AbstractFormField
+
+# form fields relation name by Zoom integration form page model
+_form_fields_relations = {}
+_lock = threading.Lock()
+
+
+def find_form_fields_relation_name(model):
+    for relation in get_all_child_relations(model):
+        if issubclass(relation.related_model, AbstractFormField):
+            return relation.related_name
+
+    return None
+
+
+def register_form_fields_relations():
+    """
+    Resolve the form fields relation of every Zoom integration form page model. Called once the app registry is ready.
+    """
+    from .models import AbstractZoomIntegrationForm
+
+    relations = {}
+
+    for model in apps.get_models():
+        if issubclass(model, AbstractZoomIntegrationForm):
+            relations[model] = find_form_fields_relation_name(model)
+
+    with _lock:
+        _form_fields_relations.update(relations)
+
+
+def get_form_fields_relation_name(model):
+    if not isinstance(model, type):
+        model = type(model)
+
+    try:
+        return _form_fields_relations[model]
+    except KeyError:
+        pass
+
+    # e.g. a model that was not registered with the app registry when it became ready
+    relation_name = find_form_fields_relation_name(model)
+
+    with _lock:
+        _form_fields_relations[model] = relation_name
+
+    return relation_name
+
+
+def get_form_fields(page):
+    relation_name = get_form_fields_relation_name(page)
+
+    if relation_name:
+        return getattr(page, relation_name).all()
+
+    return None
@@ -1,5 +1,7 @@
 from django import forms
 
+from .merge_fields import CUSTOM_QUESTION_PREFIX
+from .questions import STANDARD_QUESTIONS
 from .widgets import CustomSelect
 
 ZOOM_EVENT_REGISTRATION_REQUIRED_FIELDS = [
@@ -8,50 +10,72 @@ ZOOM_EVENT_REGISTRATION_REQUIRED_FIELDS = [
     {"tag": "last_name", "name": "Last Name", "type": "text", "required": True},
 ]
 
+# form field types that can be mapped to each type of Zoom field
+FORM_FIELD_TYPES = {
+    "email": ["email"],
+    "number": ["number"],
+    "url": ["url"],
+    "radio": ["radio", "dropdown"],
+    "dropdown": ["dropdown", "radio"],
+    "checkboxes": ["checkboxes", "multiselect"],
+    "date": ["date"],
+    "birthday": ["date"],
+    "text": ["singleline", "multiline"],
+}
+
+# types of Zoom custom registration questions
+CUSTOM_QUESTION_TYPES = {
+    "short": "text",
+    "single_radio": "radio",
+    "single_dropdown": "dropdown",
+    "multiple": "checkboxes",
+}
+
+
+def get_question_merge_fields(questions):
+    """
+    Returns the registration questions of an event, other than ZOOM_EVENT_REGISTRATION_REQUIRED_FIELDS, as merge fields
+    """
+    mapped = {field["tag"] for field in ZOOM_EVENT_REGISTRATION_REQUIRED_FIELDS}
+    merge_fields = []
+
+    for question in questions.get("questions", []):
+        field_name = question.get("field_name")
+
+        if field_name in STANDARD_QUESTIONS and field_name not in mapped:
+            merge_fields.append({"tag": field_name, "name": STANDARD_QUESTIONS[field_name], "type": "text",
+                                 "required": bool(question.get("required"))})
+
+    for question in questions.get("custom_questions", []):
+        title = question.get("title")
+
+        if title:
+            merge_fields.append({"tag": f"{CUSTOM_QUESTION_PREFIX}{title}", "name": title,
+                                 "type": CUSTOM_QUESTION_TYPES.get(question.get("type"), "text"),
+                                 "required": bool(question.get("required"))})
+
+    return merge_fields
+
 
 class ZoomIntegrationForm(forms.Form):
-    def __init__(self, form_fields=None, *args, **kwargs):
+    def __init__(self, form_fields=None, questions=None, *args, **kwargs):
         # Initialize the form instance.
         super(ZoomIntegrationForm, self).__init__(*args, **kwargs)
 
         merge_fields = ZOOM_EVENT_REGISTRATION_REQUIRED_FIELDS
 
+        # the registration questions of the event, when they could be obtained from Zoom
+        if questions:
+            merge_fields = merge_fields + get_question_merge_fields(questions)
+
         if form_fields:
-            for field in merge_fields:
+            for i, field in enumerate(merge_fields):
                 choices = [("", "-- Select field to merge--")]
 
-                if field.get("type") == "email":
-                    for form_field in form_fields:
-                        if form_field.field_type == 'email':
-                            choices.append((form_field.clean_name, form_field.label))
-                elif field.get("type") == "number":
-                    for form_field in form_fields:
-                        if form_field.field_type == 'number':
-                            choices.append((form_field.clean_name, form_field.label))
-                elif field.get("type") == "url":
-                    for form_field in form_fields:
-                        if form_field.field_type == 'url':
-                            choices.append((form_field.clean_name, form_field.label))
-                elif field.get("type") == "radio":
-                    for form_field in form_fields:
-                        if form_field.field_type == 'radio':
-                            choices.append((form_field.clean_name, form_field.label))
-                elif field.get("type") == "dropdown":
-                    for form_field in form_fields:
-                        if form_field.field_type == 'dropdown':
-                            choices.append((form_field.clean_name, form_field.label))
-                elif field.get("type") == "checkboxes":
-                    for form_field in form_fields:
-                        if form_field.field_type == 'checkboxes':
-                            choices.append((form_field.clean_name, form_field.label))
-                elif field.get("type") == "date" or field.get("type") == "birthday":
-                    for form_field in form_fields:
-                        if form_field.field_type == 'date':
-                            choices.append((form_field.clean_name, form_field.label))
-                else:
-                    for form_field in form_fields:
-                        if form_field.field_type == 'singleline' or form_field.field_type == "multiline":
-                            choices.append((form_field.clean_name, form_field.label))
+                field_types = FORM_FIELD_TYPES.get(field.get("type"), FORM_FIELD_TYPES["text"])
+                for form_field in form_fields:
+                    if form_field.field_type in field_types:
+                        choices.append((form_field.clean_name, form_field.label))
 
                 kwargs = {
                     'label': field.get('name', None),
@@ -60,5 +84,10 @@ class ZoomIntegrationForm(forms.Form):
 
                 name = field.get("tag")
 
-                self.fields.update({name: forms.ChoiceField(choices=choices, widget=CustomSelect, **kwargs)})
+                widget = CustomSelect
+                # custom question titles are not valid HTML ids
+                if name.startswith(CUSTOM_QUESTION_PREFIX):
+                    widget = CustomSelect(attrs={"id": f"id_zoom_field_{i}"})
+
+                self.fields.update({name: forms.ChoiceField(choices=choices, widget=widget, **kwargs)})
                 self.fields[name].label = field.get("name")
@@ -0,0 +1,51 @@
+import json
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class ZoomIntegrationConfig:
+    """
+    Parsed Zoom integration settings of a form page, from its zoom_event and zoom_reg_fields_mapping fields.
+    """
+    __slots__ = ("has_event", "event_id", "event_type", "event_topic", "merge_fields")
+
+    has_event: bool
+    event_id: str
+    event_type: str
+    event_topic: str
+    merge_fields: dict
+
+    @classmethod
+    def parse(cls, zoom_event, zoom_reg_fields_mapping, strict=False):
+        """
+        Invalid JSON is ignored, unless `strict` is set, in which case a ValueError is raised.
+        """
+        event = parse_json_object(zoom_event, strict)
+        merge_fields = parse_json_object(zoom_reg_fields_mapping, strict)
+
+        return cls(
+            has_event=bool(event),
+            event_id=event.get("event_id"),
+            event_type=event.get("event_type"),
+            event_topic=event.get("event_topic"),
+            merge_fields=merge_fields,
+        )
+
+
+def parse_json_object(value, strict=False):
+    if not value:
+        return {}
+
+    try:
+        parsed = json.loads(value)
+    except ValueError:
+        if strict:
+            raise
+        return {}
+
+    if not isinstance(parsed, dict):
+        if strict:
+            raise ValueError("Expected a JSON object")
+        return {}
+
+    return parsed
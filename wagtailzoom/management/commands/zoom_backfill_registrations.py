@@ -0,0 +1,51 @@
+from django.core.management.base import BaseCommand, CommandError
+from wagtail.models import Page
+
+from wagtailzoom.backfill import backfill_registrations, get_submissions
+
+
+class Command(BaseCommand):
+    help = "Register the existing form submissions of a Zoom integration form page to its Zoom event"
+
+    def add_arguments(self, parser):
+        parser.add_argument("page_id", type=int, help="ID of the form page")
+        parser.add_argument("--chunk-size", type=int, default=500,
+                            help="Number of submissions loaded at a time")
+        parser.add_argument("--workers", type=int, default=4,
+                            help="Number of batch registration calls sent concurrently")
+        parser.add_argument("--start-after", type=int, default=None,
+                            help="Only process submissions with a greater ID, to resume an interrupted backfill")
+        parser.add_argument("--dry-run", action="store_true",
+                            help="Report the submissions that would be registered, without calling Zoom")
+
+    def handle(self, *args, **options):
+        page = Page.objects.filter(pk=options["page_id"]).specific().first()
+
+        if page is None:
+            raise CommandError(f"Page {options['page_id']} does not exist")
+
+        if not getattr(page, "is_zoom_integration", False):
+            raise CommandError(f"{page} is not a Zoom integration form page")
+
+        if not page.zoom_event_id or not page.zoom_merge_fields:
+            raise CommandError(f"{page} has no Zoom event, or its Zoom integration fields are not set up")
+
+        total = get_submissions(page, options["start_after"]).count()
+        self.stdout.write(f"{total} submissions to process for {page.zoom_event_type} {page.zoom_event_id}")
+
+        def progress(last_pk, stats):
+            self.stdout.write(
+                "{}/{} - registered: {registered}, skipped: {skipped}, invalid: {invalid}, failed: {failed} "
+                "- last submission: {}".format(sum(stats.values()), total, last_pk, **stats))
+
+        stats = backfill_registrations(
+            page,
+            chunk_size=options["chunk_size"],
+            workers=options["workers"],
+            start_after=options["start_after"],
+            dry_run=options["dry_run"],
+            progress=progress,
+        )
+
+        self.stdout.write("Registered: {registered}, Skipped: {skipped}, Invalid: {invalid}, "
+                          "Failed: {failed}".format(**stats))
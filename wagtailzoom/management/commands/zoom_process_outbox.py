@@ -0,0 +1,30 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from wagtailzoom.outbox import process_outbox
+
+
+class Command(BaseCommand):
+    help = "Deliver queued Zoom event registrations"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--limit", type=int, default=None,
+                            help="Maximum number of registrations to process per run")
+        parser.add_argument("--loop", action="store_true",
+                            help="Keep running, processing the outbox every --interval seconds")
+        parser.add_argument("--interval", type=float, default=5,
+                            help="Seconds to wait between runs when --loop is set")
+
+    def handle(self, *args, **options):
+        while True:
+            stats = process_outbox(limit=options["limit"])
+
+            if any(stats.values()) or not options["loop"]:
+                self.stdout.write(
+                    "Delivered: {delivered}, Retrying: {retrying}, Failed: {failed}".format(**stats))
+
+            if not options["loop"]:
+                break
+
+            time.sleep(options["interval"])
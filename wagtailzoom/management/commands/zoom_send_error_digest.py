@@ -0,0 +1,32 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from wagtailzoom.notifications import purge_errors, send_error_digest
+
+
+class Command(BaseCommand):
+    help = "Email the admins a digest of the Zoom integration errors recorded since the last digest"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--loop", action="store_true",
+                            help="Keep running, sending a digest every --interval seconds when there are new errors")
+        parser.add_argument("--interval", type=float, default=300,
+                            help="Seconds to wait between runs when --loop is set")
+        parser.add_argument("--purge-days", type=int, default=None,
+                            help="Also delete reported errors older than this number of days")
+
+    def handle(self, *args, **options):
+        while True:
+            reported = send_error_digest()
+
+            if reported or not options["loop"]:
+                self.stdout.write(f"Reported errors: {reported}")
+
+            if options["purge_days"] is not None:
+                purge_errors(options["purge_days"])
+
+            if not options["loop"]:
+                break
+
+            time.sleep(options["interval"])
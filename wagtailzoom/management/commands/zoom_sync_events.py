@@ -0,0 +1,37 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+from wagtail.models import Site
+
+from wagtailzoom.event_cache import get_events_error_message, refresh_events
+from wagtailzoom.models import ZoomSettings
+
+
+class Command(BaseCommand):
+    help = "Sync the upcoming Zoom meetings and webinars of each site into the local ZoomEvent mirror"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--site", type=int, action="append", dest="site_ids",
+                            help="ID of a site to sync. Can be repeated. Defaults to all sites with Zoom Settings")
+
+    def handle(self, *args, **options):
+        sites = Site.objects.all()
+
+        if options["site_ids"]:
+            sites = sites.filter(pk__in=options["site_ids"])
+        else:
+            configured = ZoomSettings.objects.filter(
+                (Q(oauth_client_id__isnull=False) & ~Q(oauth_client_id="")) | Q(credentials__enabled=True)
+            )
+            sites = sites.filter(pk__in=configured.values("site_id"))
+
+        for site in sites:
+            try:
+                sync_state = refresh_events(site)
+            except Exception as e:
+                self.stderr.write(f"{site}: {get_events_error_message(e)}")
+                continue
+
+            self.stdout.write("{}: created {created}, updated {updated}, deleted {deleted}".format(
+                site, **sync_state["stats"]))
+            for warning in sync_state["warnings"]:
+                self.stdout.write(f"{site}: {warning}")
@@ -0,0 +1,30 @@
+from django.apps import apps
+from django.core.management.base import BaseCommand
+
+from wagtailzoom.models import AbstractZoomIntegrationForm
+
+
+class Command(BaseCommand):
+    help = "Set the has_zoom_event flag of Zoom integration form pages saved before it was added"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--all", action="store_true", dest="all_pages",
+                            help="Update the flag of every page, not only of the pages where it is not set")
+
+    def handle(self, *args, **options):
+        for model in apps.get_models():
+            if not issubclass(model, AbstractZoomIntegrationForm):
+                continue
+
+            pages = model.objects.all()
+
+            if not options["all_pages"]:
+                pages = pages.filter(has_zoom_event__isnull=True)
+
+            updated = 0
+
+            for page in pages.iterator():
+                page.update_has_zoom_event()
+                updated += 1
+
+            self.stdout.write(f"{model._meta.label}: updated {updated} pages")
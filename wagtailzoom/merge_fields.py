@@ -0,0 +1,68 @@
+import datetime
+import json
+from functools import lru_cache
+
+# prefix of the mapping keys of custom registration questions, followed by the question title
+CUSTOM_QUESTION_PREFIX = "custom_questions:"
+
+
+def format_value(value):
+    if value is None:
+        return ""
+    if isinstance(value, (list, tuple)):
+        return ", ".join(format_value(item) for item in value)
+    if isinstance(value, (datetime.date, datetime.time)):
+        return value.isoformat()
+    return str(value)
+
+
+class RegistrantPayloadPlan:
+    """
+    Maps submitted form data to a Zoom registrant payload, following a page's Zoom registration fields mapping.
+    """
+    __slots__ = ("fields",)
+
+    def __init__(self, mapping):
+        # (zoom field, form field) pairs. Unmapped zoom fields are sent empty
+        self.fields = tuple((zoom_field, form_field or None) for zoom_field, form_field in mapping.items())
+
+    def build(self, form_data):
+        payload = {}
+        custom_questions = []
+
+        for zoom_field, form_field in self.fields:
+            is_custom_question = zoom_field.startswith(CUSTOM_QUESTION_PREFIX)
+
+            if form_field is None:
+                if not is_custom_question:
+                    payload[zoom_field] = ""
+                continue
+
+            value = form_data.get(form_field)
+            if value is None:
+                value = form_data.get(form_field.replace("-", "_"))
+
+            value = format_value(value)
+
+            # Zoom expects custom question answers as a list of title and value
+            if is_custom_question:
+                if value:
+                    custom_questions.append({"title": zoom_field[len(CUSTOM_QUESTION_PREFIX):], "value": value})
+            else:
+                payload[zoom_field] = value
+
+        if custom_questions:
+            payload["custom_questions"] = custom_questions
+
+        return payload
+
+
+@lru_cache(maxsize=512)
+def compile_plan(mapping_json):
+    # plans are cached by the mapping itself, so a new revision with the same mapping reuses the same plan
+    try:
+        mapping = json.loads(mapping_json) if mapping_json else {}
+    except ValueError:
+        mapping = {}
+
+    return RegistrantPayloadPlan(mapping if isinstance(mapping, dict) else {})
@@ -0,0 +1,145 @@
+import logging
+import threading
+
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.utils.module_loading import import_string
+
+from .conf import get_setting
+
+logger = logging.getLogger(__name__)
+
+# upper bounds, in seconds, of the request duration histogram buckets
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+
+class NoopMetrics:
+    """
+    Base metrics backend, which discards everything. Instrumented code checks `enabled` before computing labels,
+    so that metrics add no overhead when they are not collected.
+    """
+    enabled = False
+
+    def increment(self, name, value=1, **labels):
+        pass
+
+    def observe(self, name, value, **labels):
+        pass
+
+
+class LoggingMetrics(NoopMetrics):
+    enabled = True
+
+    def increment(self, name, value=1, **labels):
+        logger.info("%s %s %s", name, value, labels)
+
+    def observe(self, name, value, **labels):
+        logger.info("%s %.6f %s", name, value, labels)
+
+
+class PrometheusMetrics(NoopMetrics):
+    """
+    Keeps counters and histograms in process memory, rendered in the Prometheus text exposition format by the
+    metrics view.
+    """
+    enabled = True
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counters = {}
+        self.histograms = {}
+        self._lock = threading.Lock()
+
+    def get_key(self, name, labels):
+        # label values are strings in Prometheus, e.g. a status is either a status code or "error"
+        return name, tuple(sorted((label, str(value)) for label, value in labels.items()))
+
+    def increment(self, name, value=1, **labels):
+        key = self.get_key(name, labels)
+
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def observe(self, name, value, **labels):
+        key = self.get_key(name, labels)
+
+        with self._lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = {"buckets": [0] * len(self.buckets), "sum": 0.0, "count": 0}
+
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    histogram["buckets"][i] += 1
+            histogram["sum"] += value
+            histogram["count"] += 1
+
+    def render(self):
+        lines = []
+
+        with self._lock:
+            counters = sorted(self.counters.items())
+            histograms = sorted((key, dict(value, buckets=list(value["buckets"])))
+                                for key, value in self.histograms.items())
+
+        typed = set()
+
+        for (name, labels), value in counters:
+            if name not in typed:
+                lines.append(f"# TYPE {name} counter")
+                typed.add(name)
+            lines.append(f"{name}{format_labels(labels)} {value}")
+
+        for (name, labels), histogram in histograms:
+            if name not in typed:
+                lines.append(f"# TYPE {name} histogram")
+                typed.add(name)
+
+            for bound, count in zip(self.buckets, histogram["buckets"]):
+                lines.append(f"{name}_bucket{format_labels(labels + (('le', bound),))} {count}")
+            lines.append(f"{name}_bucket{format_labels(labels + (('le', '+Inf'),))} {histogram['count']}")
+            lines.append(f"{name}_sum{format_labels(labels)} {histogram['sum']}")
+            lines.append(f"{name}_count{format_labels(labels)} {histogram['count']}")
+
+        return "\n".join(lines) + "\n"
+
+
+def format_labels(labels):
+    if not labels:
+        return ""
+
+    def escape(value):
+        return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+    return "{" + ",".join(f'{name}="{escape(value)}"' for name, value in labels) + "}"
+
+
+BACKENDS = {
+    None: NoopMetrics,
+    "logging": LoggingMetrics,
+    "prometheus": PrometheusMetrics,
+}
+
+_metrics = None
+_metrics_lock = threading.Lock()
+
+
+def get_metrics():
+    global _metrics
+
+    if _metrics is None:
+        with _metrics_lock:
+            if _metrics is None:
+                backend = get_setting("METRICS_BACKEND")
+                backend_class = BACKENDS.get(backend) or import_string(backend)
+                _metrics = backend_class()
+
+    return _metrics
+
+
+@receiver(setting_changed)
+def reset_metrics(setting, **kwargs):
+    global _metrics
+
+    if setting == "WAGTAILZOOM_METRICS_BACKEND":
+        _metrics = None
@@ -0,0 +1,41 @@
+# Generated by Django 5.0.14 on 2026-10-18 01:14
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('wagtailcore', '0083_workflowcontenttype'),
+        ('wagtailzoom', '0003_queuedzoomregistration'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ZoomEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('event_id', models.CharField(max_length=64)),
+                ('event_type', models.CharField(max_length=20)),
+                ('topic', models.CharField(blank=True, max_length=300)),
+                ('start_time', models.DateTimeField(blank=True, null=True)),
+                ('data', models.JSONField(default=dict)),
+                ('synced_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('detail', models.JSONField(blank=True, null=True)),
+                ('detail_synced_at', models.DateTimeField(blank=True, null=True)),
+                ('site', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='wagtailcore.site')),
+            ],
+            options={
+                'verbose_name': 'Zoom Event',
+                'verbose_name_plural': 'Zoom Events',
+                'ordering': [models.OrderBy(models.F('start_time'), nulls_last=True), 'pk'],
+                'indexes': [models.Index(fields=['site', 'start_time'], name='wagtailzoom_site_id_d30c10_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='zoomevent',
+            constraint=models.UniqueConstraint(fields=('site', 'event_type', 'event_id'), name='unique_zoom_event_per_site'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.0.14 on 2026-10-18 01:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('wagtailzoom', '0004_zoomevent'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='zoomsettings',
+            name='webhook_secret_token',
+            field=models.CharField(blank=True, help_text='Secret Token of the Zoom app event subscription, used to verify webhook requests', max_length=256, null=True, verbose_name='Zoom Webhook Secret Token'),
+        ),
+    ]
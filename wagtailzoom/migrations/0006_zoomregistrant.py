@@ -0,0 +1,40 @@
+# Generated by Django 5.0.14 on 2026-10-18 01:22
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('wagtailcore', '0083_workflowcontenttype'),
+        ('wagtailzoom', '0005_zoomsettings_webhook_secret_token'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ZoomRegistrant',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('event_id', models.CharField(max_length=64)),
+                ('event_type', models.CharField(max_length=20)),
+                ('email', models.CharField(max_length=255)),
+                ('registrant_id', models.CharField(blank=True, max_length=255)),
+                ('join_url', models.URLField(blank=True, max_length=1024)),
+                ('status', models.CharField(choices=[('queued', 'Queued'), ('registering', 'Registering'), ('registered', 'Registered'), ('pending', 'Pending approval'), ('approved', 'Approved'), ('denied', 'Denied'), ('cancelled', 'Cancelled')], default='registering', max_length=20)),
+                ('data', models.JSONField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('site', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='wagtailcore.site')),
+            ],
+            options={
+                'verbose_name': 'Zoom Registrant',
+                'verbose_name_plural': 'Zoom Registrants',
+                'ordering': ['pk'],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='zoomregistrant',
+            constraint=models.UniqueConstraint(fields=('event_type', 'event_id', 'email'), name='unique_zoom_registrant'),
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 5.0.14 on 2026-10-18 01:27
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('wagtailcore', '0083_workflowcontenttype'),
+        ('wagtailzoom', '0006_zoomregistrant'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ZoomIntegrationError',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('event_id', models.CharField(blank=True, max_length=64)),
+                ('event_type', models.CharField(blank=True, max_length=20)),
+                ('source', models.CharField(choices=[('inline', 'Form submission'), ('outbox', 'Outbox delivery'), ('circuit', 'Circuit breaker')], default='inline', max_length=20)),
+                ('error_class', models.CharField(max_length=255)),
+                ('message', models.TextField(blank=True)),
+                ('payload', models.JSONField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(db_index=True, default=django.utils.timezone.now)),
+                ('notified_at', models.DateTimeField(blank=True, db_index=True, null=True)),
+                ('page', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='wagtailcore.page')),
+                ('site', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='wagtailcore.site')),
+            ],
+            options={
+                'verbose_name': 'Zoom Integration Error',
+                'verbose_name_plural': 'Zoom Integration Errors',
+                'ordering': ['-created_at', '-pk'],
+            },
+        ),
+    ]
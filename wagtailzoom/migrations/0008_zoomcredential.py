@@ -0,0 +1,34 @@
+# Generated by Django 5.0.14 on 2026-10-18 01:36
+
+import django.db.models.deletion
+import modelcluster.fields
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('wagtailzoom', '0007_zoomintegrationerror'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ZoomCredential',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('sort_order', models.IntegerField(blank=True, editable=False, null=True)),
+                ('name', models.CharField(blank=True, help_text='Name of the Server-to-Server OAuth app, shown in logs and metrics', max_length=100, verbose_name='Name')),
+                ('oauth_account_id', models.CharField(max_length=256, verbose_name='Zoom OAUTH Account ID')),
+                ('oauth_client_id', models.CharField(max_length=256, verbose_name='Zoom OAUTH Client ID')),
+                ('oauth_client_secret', models.CharField(max_length=256, verbose_name='Zoom OAUTH Client Secret')),
+                ('enabled', models.BooleanField(default=True, verbose_name='Enabled')),
+                ('setting', modelcluster.fields.ParentalKey(on_delete=django.db.models.deletion.CASCADE, related_name='credentials', to='wagtailzoom.zoomsettings')),
+            ],
+            options={
+                'verbose_name': 'Zoom Credentials',
+                'verbose_name_plural': 'Zoom Credentials',
+                'ordering': ['sort_order'],
+                'abstract': False,
+            },
+        ),
+    ]
@@ -1,20 +1,27 @@
 import json
 
-from django.core.mail import mail_admins
+from asgiref.sync import sync_to_async
+from django.core.exceptions import ValidationError
 from django.db import models
-from django.template import Context, Template
+from django.utils import timezone
 from django.utils.translation import gettext as _
-from wagtail.admin.panels import FieldPanel
+from modelcluster.fields import ParentalKey
+from modelcluster.models import ClusterableModel
+from wagtail.admin.panels import FieldPanel, InlinePanel, MultiFieldPanel
 from wagtail.contrib.forms.models import AbstractForm
 from wagtail.contrib.settings.models import BaseSiteSetting
 from wagtail.contrib.settings.registry import register_setting
+from wagtail.models import Orderable, Site
 
-from .api import ZoomApi
+from .conf import get_setting
+from .integration import ZoomIntegrationConfig
+from .merge_fields import compile_plan
+from .panels import ZoomEventPanel
 from .widgets import ZoomEventSelectWidget
 
 
 @register_setting
-class ZoomSettings(BaseSiteSetting):
+class ZoomSettings(ClusterableModel, BaseSiteSetting):
     oauth_account_id = models.CharField(
         max_length=256,
         null=True,
@@ -36,20 +43,223 @@ class ZoomSettings(BaseSiteSetting):
         verbose_name=_("Zoom OAUTH Client Secret"),
         help_text=_("Client Secret obtained from Zoom Server-to-Server OAuth"),
     )
+    webhook_secret_token = models.CharField(
+        max_length=256,
+        null=True,
+        blank=True,
+        verbose_name=_("Zoom Webhook Secret Token"),
+        help_text=_("Secret Token of the Zoom app event subscription, used to verify webhook requests"),
+    )
 
     panels = [
         FieldPanel("oauth_account_id"),
         FieldPanel("oauth_client_id"),
         FieldPanel("oauth_client_secret"),
+        FieldPanel("webhook_secret_token"),
+        InlinePanel("credentials", heading=_("Additional credentials"), label=_("Credentials")),
+    ]
+
+    def get_credentials(self):
+        """
+        Returns (name, oauth_account_id, oauth_client_id, oauth_client_secret) of each credential set in use
+        """
+        credentials = []
+
+        if self.oauth_account_id or self.oauth_client_id or self.oauth_client_secret:
+            credentials.append(("default", self.oauth_account_id, self.oauth_client_id, self.oauth_client_secret))
+
+        if self.pk:
+            for credential in self.credentials.filter(enabled=True):
+                credentials.append((credential.name or f"credentials-{credential.pk}", credential.oauth_account_id,
+                                    credential.oauth_client_id, credential.oauth_client_secret))
+
+        return credentials
+
+
+class ZoomCredential(Orderable):
+    setting = ParentalKey(ZoomSettings, on_delete=models.CASCADE, related_name="credentials")
+    name = models.CharField(
+        max_length=100,
+        blank=True,
+        verbose_name=_("Name"),
+        help_text=_("Name of the Server-to-Server OAuth app, shown in logs and metrics"),
+    )
+    oauth_account_id = models.CharField(max_length=256, verbose_name=_("Zoom OAUTH Account ID"))
+    oauth_client_id = models.CharField(max_length=256, verbose_name=_("Zoom OAUTH Client ID"))
+    oauth_client_secret = models.CharField(max_length=256, verbose_name=_("Zoom OAUTH Client Secret"))
+    enabled = models.BooleanField(default=True, verbose_name=_("Enabled"))
+
+    panels = [
+        MultiFieldPanel([
+            FieldPanel("name"),
+            FieldPanel("oauth_account_id"),
+            FieldPanel("oauth_client_id"),
+            FieldPanel("oauth_client_secret"),
+            FieldPanel("enabled"),
+        ]),
     ]
 
+    class Meta(Orderable.Meta):
+        verbose_name = _("Zoom Credentials")
+        verbose_name_plural = _("Zoom Credentials")
+
+
+class ZoomEvent(models.Model):
+    site = models.ForeignKey(Site, on_delete=models.CASCADE, related_name="+")
+    event_id = models.CharField(max_length=64)
+    event_type = models.CharField(max_length=20)
+    topic = models.CharField(max_length=300, blank=True)
+    start_time = models.DateTimeField(null=True, blank=True)
+    data = models.JSONField(default=dict)
+    synced_at = models.DateTimeField(default=timezone.now)
+    detail = models.JSONField(null=True, blank=True)
+    detail_synced_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = [models.F("start_time").asc(nulls_last=True), "pk"]
+        verbose_name = _("Zoom Event")
+        verbose_name_plural = _("Zoom Events")
+        constraints = [
+            models.UniqueConstraint(fields=["site", "event_type", "event_id"], name="unique_zoom_event_per_site"),
+        ]
+        indexes = [
+            models.Index(fields=["site", "start_time"]),
+        ]
+
+    def __str__(self):
+        return f"{self.event_type} {self.event_id} - {self.topic}"
+
+
+class QueuedZoomRegistration(models.Model):
+    STATUS_PENDING = "pending"
+    STATUS_PROCESSING = "processing"
+    STATUS_DELIVERED = "delivered"
+    STATUS_FAILED = "failed"
+
+    STATUS_CHOICES = (
+        (STATUS_PENDING, _("Pending")),
+        (STATUS_PROCESSING, _("Processing")),
+        (STATUS_DELIVERED, _("Delivered")),
+        (STATUS_FAILED, _("Failed")),
+    )
+
+    site = models.ForeignKey(Site, null=True, blank=True, on_delete=models.SET_NULL, related_name="+")
+    page = models.ForeignKey("wagtailcore.Page", null=True, blank=True, on_delete=models.SET_NULL, related_name="+")
+    event_id = models.CharField(max_length=64, db_index=True)
+    event_type = models.CharField(max_length=20)
+    payload = models.JSONField()
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=STATUS_PENDING)
+    attempts = models.PositiveIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True)
+    response = models.JSONField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ["pk"]
+        verbose_name = _("Queued Zoom Registration")
+        verbose_name_plural = _("Queued Zoom Registrations")
+        indexes = [
+            models.Index(fields=["status", "next_attempt_at"]),
+        ]
+
+    def __str__(self):
+        return f"{self.event_type} {self.event_id} - {self.status}"
+
+
+class ZoomRegistrant(models.Model):
+    # local states, while a registration is queued or being sent to Zoom
+    STATUS_QUEUED = "queued"
+    STATUS_REGISTERING = "registering"
+    # added to Zoom, before any approval webhook is received
+    STATUS_REGISTERED = "registered"
+    # Zoom registrant statuses
+    STATUS_PENDING = "pending"
+    STATUS_APPROVED = "approved"
+    STATUS_DENIED = "denied"
+    STATUS_CANCELLED = "cancelled"
+
+    STATUS_CHOICES = (
+        (STATUS_QUEUED, _("Queued")),
+        (STATUS_REGISTERING, _("Registering")),
+        (STATUS_REGISTERED, _("Registered")),
+        (STATUS_PENDING, _("Pending approval")),
+        (STATUS_APPROVED, _("Approved")),
+        (STATUS_DENIED, _("Denied")),
+        (STATUS_CANCELLED, _("Cancelled")),
+    )
+
+    # a submission for the same event and email while in one of these states is not sent to Zoom again
+    ACTIVE_STATUSES = (STATUS_QUEUED, STATUS_REGISTERING, STATUS_REGISTERED, STATUS_PENDING, STATUS_APPROVED)
+
+    site = models.ForeignKey(Site, null=True, blank=True, on_delete=models.SET_NULL, related_name="+")
+    event_id = models.CharField(max_length=64)
+    event_type = models.CharField(max_length=20)
+    email = models.CharField(max_length=255)
+    registrant_id = models.CharField(max_length=255, blank=True)
+    join_url = models.URLField(max_length=1024, blank=True)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=STATUS_REGISTERING)
+    data = models.JSONField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ["pk"]
+        verbose_name = _("Zoom Registrant")
+        verbose_name_plural = _("Zoom Registrants")
+        constraints = [
+            models.UniqueConstraint(fields=["event_type", "event_id", "email"], name="unique_zoom_registrant"),
+        ]
+
+    def __str__(self):
+        return f"{self.event_type} {self.event_id} - {self.email} - {self.status}"
+
+    @property
+    def is_registered(self):
+        return bool(self.registrant_id) and self.status in self.ACTIVE_STATUSES
+
+
+class ZoomIntegrationError(models.Model):
+    SOURCE_INLINE = "inline"
+    SOURCE_OUTBOX = "outbox"
+    SOURCE_CIRCUIT = "circuit"
+
+    SOURCE_CHOICES = (
+        (SOURCE_INLINE, _("Form submission")),
+        (SOURCE_OUTBOX, _("Outbox delivery")),
+        (SOURCE_CIRCUIT, _("Circuit breaker")),
+    )
+
+    site = models.ForeignKey(Site, null=True, blank=True, on_delete=models.SET_NULL, related_name="+")
+    page = models.ForeignKey("wagtailcore.Page", null=True, blank=True, on_delete=models.SET_NULL, related_name="+")
+    event_id = models.CharField(max_length=64, blank=True)
+    event_type = models.CharField(max_length=20, blank=True)
+    source = models.CharField(max_length=20, choices=SOURCE_CHOICES, default=SOURCE_INLINE)
+    error_class = models.CharField(max_length=255)
+    message = models.TextField(blank=True)
+    payload = models.JSONField(null=True, blank=True)
+    created_at = models.DateTimeField(default=timezone.now, db_index=True)
+    notified_at = models.DateTimeField(null=True, blank=True, db_index=True)
+
+    class Meta:
+        ordering = ["-created_at", "-pk"]
+        verbose_name = _("Zoom Integration Error")
+        verbose_name_plural = _("Zoom Integration Errors")
+
+    def __str__(self):
+        return f"{self.error_class} - {self.event_type} {self.event_id}"
+
 
 class AbstractZoomIntegrationForm(AbstractForm):
     zoom_event = models.TextField(blank=True, null=True, verbose_name=_('Zoom Event'), help_text=_('Select Zoom Event'))
     zoom_reg_fields_mapping = models.TextField(blank=True, null=True)
+    # whether the latest revision has a Zoom event, so that page listings do not need to load revisions.
+    # Null for pages saved before this field was added
+    has_zoom_event = models.BooleanField(null=True, editable=False, db_index=True)
 
     integration_panels = [
-        FieldPanel("zoom_event", widget=ZoomEventSelectWidget),
+        ZoomEventPanel("zoom_event", widget=ZoomEventSelectWidget),
     ]
 
     is_zoom_integration = True
@@ -57,40 +267,78 @@ class AbstractZoomIntegrationForm(AbstractForm):
     class Meta:
         abstract = True
 
+    @property
+    def zoom_config(self):
+        # parsed once per instance, and parsed again when zoom_event or zoom_reg_fields_mapping are assigned
+        raw = (self.zoom_event, self.zoom_reg_fields_mapping)
+        cached = self.__dict__.get("_zoom_config_cache")
+
+        if cached is None or cached[0] != raw:
+            cached = (raw, ZoomIntegrationConfig.parse(*raw))
+            self.__dict__["_zoom_config_cache"] = cached
+
+        return cached[1]
+
     @property
     def zoom_event_id(self):
-        return self.get_zoom_data().get("event_id")
+        return self.zoom_config.event_id
 
     @property
     def zoom_event_type(self):
-        return self.get_zoom_data().get("event_type")
+        return self.zoom_config.event_type
 
     @property
     def zoom_merge_fields(self):
-        if self.zoom_reg_fields_mapping:
-            try:
-                return json.loads(self.zoom_reg_fields_mapping)
-            except Exception:
-                pass
-        return {}
+        return dict(self.zoom_config.merge_fields)
 
     def get_zoom_data(self):
+        config = self.zoom_config
         data = {}
-        if self.zoom_event:
-            try:
-                event = json.loads(self.zoom_event)
-
-                if event:
-                    data.update({
-                        "event_id": event.get("event_id"),
-                        "event_type": event.get("event_type"),
-                        "event_topic": event.get("event_topic")
-                    })
-            except Exception:
-                pass
+
+        if config.has_event:
+            data.update({
+                "event_id": config.event_id,
+                "event_type": config.event_type,
+                "event_topic": config.event_topic
+            })
 
         return data
 
+    def clean(self):
+        super().clean()
+
+        try:
+            ZoomIntegrationConfig.parse(self.zoom_event, self.zoom_reg_fields_mapping, strict=True)
+        except ValueError:
+            raise ValidationError(_("The Zoom integration settings of this page are not valid. "
+                                    "Please select the Zoom event again."))
+
+    def save(self, *args, **kwargs):
+        self.__dict__.pop("_zoom_config_cache", None)
+
+        # with unpublished changes, the flag follows the latest revision, which is set in save_revision
+        if not self.has_unpublished_changes:
+            self.has_zoom_event = bool(self.zoom_event_id)
+
+        return super().save(*args, **kwargs)
+
+    def save_revision(self, *args, **kwargs):
+        self.has_zoom_event = bool(self.zoom_event_id)
+        revision = super().save_revision(*args, **kwargs)
+
+        # saving a revision only updates a few fields of the page
+        type(self).objects.filter(pk=self.pk).update(has_zoom_event=self.has_zoom_event)
+
+        return revision
+
+    def update_has_zoom_event(self):
+        latest = self.get_latest_revision_as_object() if self.has_unpublished_changes else self
+        self.has_zoom_event = bool(latest.zoom_event_id)
+
+        type(self).objects.filter(pk=self.pk).update(has_zoom_event=self.has_zoom_event)
+
+        return self.has_zoom_event
+
     def should_perform_zoom_integration_operation(self, request, form):
         # override this method to add custom logic to determine if the zoom integration operation should be performed
         return True
@@ -121,56 +369,120 @@ class AbstractZoomIntegrationForm(AbstractForm):
         return formatted_form_data
 
     def zoom_integration_operation(self, instance, **kwargs):
-        success = False
-        response = None
         request = kwargs.get('request', None)
 
-        if self.zoom_event_id and self.zoom_merge_fields:
-            try:
-                zoom_settings = ZoomSettings.for_request(request)
-                zoom = ZoomApi(zoom_settings.oauth_account_id, zoom_settings.oauth_client_id,
-                               zoom_settings.oauth_client_secret)
-
-                rendered_dictionary = self.render_zoom_dictionary(
-                    self.format_zoom_form_submission(kwargs['form']),
-                )
-                dict_data = json.loads(rendered_dictionary)
-
-                # check if meeting or webinar
-                if self.zoom_event_type == "meeting":
-                    response = zoom.add_meeting_registrant(self.zoom_event_id, dict_data)
-                else:
-                    response = zoom.add_webinar_registrant(self.zoom_event_id, dict_data)
-                # mark as success
-                success = True
-            except Exception as e:
-                # mark as failed
-                success = False
-
-                data = json.dumps(self.get_zoom_data())
-
-                message = "Error \n {}\n  Rendered \n {}\n Zoom Form Data\n {}".format(str(e),
-                                                                                       str(rendered_dictionary),
-                                                                                       str(data))
-                mail_admins(subject="Error adding user to zoom event", message=message)
-
-        return success, response
-
-    def get_zoom_fields_template(self):
-        fields = self.zoom_merge_fields
-
-        for key, value in fields.items():
-            if value:
-                fields[key] = "{}{}{}".format("{{", value, "}}")
-        return fields
+        if not self.zoom_event_id or not self.zoom_merge_fields:
+            return False, None
 
-    def render_zoom_dictionary(self, form_submission):
+        if get_setting("REGISTRATION_DELIVERY") == "outbox":
+            return self.queue_zoom_registration(kwargs['form'], request=request)
+
+        from .clients import get_zoom_client
+        from .registrants import ZoomRegistration
+
+        registration = ZoomRegistration(self, kwargs['form'], request=request)
+
+        try:
+            # already registered, or being registered by a concurrent submission
+            if not registration.prepare():
+                return True, registration.registrant.data
+
+            zoom = get_zoom_client(registration.site)
+            response = zoom.add_registrant(self.zoom_event_type, self.zoom_event_id, registration.payload)
+            registration.save(response)
+        except Exception as e:
+            return registration.fail(e)
+
+        return True, response
+
+    async def azoom_integration_operation(self, instance, **kwargs):
+        """
+        Same as zoom_integration_operation, sending the registration with the asyncio client. For async views under
+        ASGI, so that a worker can have many registrations in flight at once. Requires the `async` extra.
+        """
+        request = kwargs.get('request', None)
 
-        fields_templates = self.get_zoom_fields_template()
+        if not self.zoom_event_id or not self.zoom_merge_fields:
+            return False, None
 
-        rendered_dictionary_template = json.dumps({
-            **fields_templates,
-        })
+        if get_setting("REGISTRATION_DELIVERY") == "outbox":
+            return await sync_to_async(self.queue_zoom_registration)(kwargs['form'], request=request)
 
-        rendered_dictionary = Template(rendered_dictionary_template).render(Context(form_submission))
-        return rendered_dictionary
+        from .clients import aget_zoom_client
+        from .registrants import ZoomRegistration
+
+        registration = ZoomRegistration(self, kwargs['form'], request=request)
+
+        try:
+            if not await sync_to_async(registration.prepare)():
+                return True, registration.registrant.data
+
+            zoom = await aget_zoom_client(registration.site)
+            response = await zoom.add_registrant(self.zoom_event_type, self.zoom_event_id, registration.payload)
+            await sync_to_async(registration.save)(response)
+        except Exception as e:
+            return await sync_to_async(registration.fail)(e)
+
+        return True, response
+
+    def get_zoom_site(self, request=None):
+        site = Site.find_for_request(request) if request else None
+        if site is None:
+            site = self.get_site()
+        return site
+
+    def queue_zoom_registration(self, form, request=None):
+        from .outbox import enqueue_registration
+        from .registrants import ZoomRegistration
+
+        registration = ZoomRegistration(self, form, request=request)
+
+        try:
+            if not registration.prepare(status=ZoomRegistrant.STATUS_QUEUED):
+                return True, registration.registrant.data
+
+            enqueue_registration(
+                site=registration.site,
+                page=self,
+                event_id=self.zoom_event_id,
+                event_type=self.zoom_event_type,
+                payload=registration.payload,
+            )
+        except Exception as e:
+            return registration.fail(e)
+
+        return True, None
+
+    def get_zoom_registrant(self, email):
+        """
+        Return the stored Zoom registrant of an email for the page's event, e.g. to add the join URL to emails.
+        """
+        from .registrants import get_registrant
+
+        if not self.zoom_event_id or not email:
+            return None
+
+        return get_registrant(self.zoom_event_type, self.zoom_event_id, email)
+
+    def render_landing_page(self, request, form_submission=None, *args, **kwargs):
+        response = super().render_landing_page(request, form_submission, *args, **kwargs)
+
+        # set by the integration operation of this submission
+        registrant = getattr(self, "zoom_registrant", None)
+
+        if hasattr(response, "context_data"):
+            response.context_data.update({
+                "zoom_registrant": registrant,
+                "zoom_join_url": registrant.join_url if registrant else None,
+            })
+
+        return response
+
+    def get_zoom_registrant_plan(self):
+        return compile_plan(self.zoom_reg_fields_mapping)
+
+    def build_zoom_registrant_data(self, form):
+        return self.get_zoom_registrant_plan().build(form.cleaned_data)
+
+    def render_zoom_dictionary(self, form_submission):
+        return json.dumps(self.get_zoom_registrant_plan().build(form_submission))
@@ -0,0 +1,123 @@
+import logging
+from datetime import timedelta
+
+from django.core.mail import mail_admins
+from django.db import transaction
+from django.db.models import Count, Max, Min
+from django.utils import timezone
+
+from .conf import get_setting
+from .models import ZoomIntegrationError
+
+logger = logging.getLogger(__name__)
+
+
+def describe_error(error):
+    response = getattr(error, "response", None)
+    if response is not None:
+        return f"{response.status_code} {response.text}"
+    return getattr(error, "message", None) or str(error) or error.__class__.__name__
+
+
+def record_error(error, page=None, site=None, event_type="", event_id="", payload=None,
+                 source=ZoomIntegrationError.SOURCE_INLINE, error_class=None):
+    """
+    Record a Zoom integration failure, to be reported to the admins in the next error digest.
+    """
+    message = describe_error(error) if isinstance(error, Exception) else str(error)
+
+    logger.error("Zoom integration error for %s %s: %s", event_type, event_id, message)
+
+    try:
+        return ZoomIntegrationError.objects.create(
+            site=site,
+            page=page if page is not None and page.pk else None,
+            event_id=str(event_id or ""),
+            event_type=event_type or "",
+            source=source,
+            error_class=error_class or error.__class__.__name__,
+            message=message,
+            payload=payload,
+        )
+    except Exception:
+        # e.g. in a transaction that was already broken by the error
+        logger.exception("Error recording Zoom integration error")
+        return None
+
+
+def get_digest_groups(errors):
+    return list(
+        errors.values("page_id", "page__title", "event_type", "event_id", "source", "error_class")
+        .annotate(count=Count("pk"), first_at=Min("created_at"), last_at=Max("created_at"),
+                  last_pk=Max("pk"))
+        .order_by("-count", "-last_at")
+    )
+
+
+def format_digest(groups):
+    lines = []
+    max_groups = get_setting("ERROR_DIGEST_MAX_GROUPS")
+    sample_messages = dict(
+        ZoomIntegrationError.objects.filter(pk__in=[group["last_pk"] for group in groups[:max_groups]])
+        .values_list("pk", "message")
+    )
+
+    for group in groups[:max_groups]:
+        event = f"{group['event_type']} {group['event_id']}".strip() or "-"
+        page = f"{group['page__title']} (ID {group['page_id']})" if group["page_id"] else "-"
+
+        lines.append(
+            f"{group['count']} x {group['error_class']} ({group['source']})\n"
+            f"  Page: {page}\n"
+            f"  Zoom event: {event}\n"
+            f"  Between {group['first_at']:%Y-%m-%d %H:%M:%S} and {group['last_at']:%Y-%m-%d %H:%M:%S}\n"
+            f"  Last error: {sample_messages.get(group['last_pk'], '')[:1000]}"
+        )
+
+    if len(groups) > max_groups:
+        lines.append(f"... and {len(groups) - max_groups} more groups of errors")
+
+    return "\n\n".join(lines)
+
+
+def send_error_digest():
+    """
+    Email the admins a summary of the Zoom integration errors recorded since the last digest, grouped by page,
+    event and error class. At most WAGTAILZOOM_ERROR_DIGEST_MAX_PER_WINDOW digests are sent per
+    WAGTAILZOOM_ERROR_DIGEST_WINDOW seconds, errors left over are included in the next digest.
+    Returns the number of errors reported.
+    """
+    now = timezone.now()
+    window_start = now - timedelta(seconds=get_setting("ERROR_DIGEST_WINDOW"))
+
+    # each digest stamps the errors it reports with the time it was sent
+    sent_in_window = ZoomIntegrationError.objects.filter(notified_at__gte=window_start) \
+        .values("notified_at").distinct().count()
+
+    if sent_in_window >= get_setting("ERROR_DIGEST_MAX_PER_WINDOW"):
+        return 0
+
+    with transaction.atomic():
+        errors = ZoomIntegrationError.objects.select_for_update().filter(notified_at__isnull=True, created_at__lte=now)
+        error_pks = list(errors.values_list("pk", flat=True))
+
+        if not error_pks:
+            return 0
+
+        errors = ZoomIntegrationError.objects.filter(pk__in=error_pks)
+        groups = get_digest_groups(errors)
+
+        mail_admins(
+            subject=f"Zoom integration errors: {len(error_pks)} errors",
+            message=format_digest(groups),
+        )
+
+        errors.update(notified_at=now)
+
+    return len(error_pks)
+
+
+def purge_errors(days):
+    before = timezone.now() - timedelta(days=days)
+    deleted, _ = ZoomIntegrationError.objects.filter(created_at__lt=before, notified_at__isnull=False).delete()
+    return deleted
@@ -0,0 +1,270 @@
+import logging
+import random
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.db import close_old_connections, transaction
+from django.db.models import Exists, OuterRef, Q
+from django.utils import timezone
+from requests import ConnectionError, HTTPError, Timeout
+
+from .api import RegistrantBatcher
+from .clients import get_zoom_client
+from .conf import get_setting
+from .errors import ZoomCircuitOpenError, ZoomRateLimitError, ZoomRegistrantValidationError
+from .models import QueuedZoomRegistration, ZoomIntegrationError
+from .notifications import describe_error, record_error
+from .questions import validate_registrant
+from .registrants import release_registrant, save_registration_response
+
+logger = logging.getLogger(__name__)
+
+_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="wagtailzoom-outbox")
+_drain_scheduled = threading.Event()
+
+
+def enqueue_registration(site, page, event_id, event_type, payload):
+    item = QueuedZoomRegistration.objects.create(
+        site=site,
+        page=page,
+        event_id=str(event_id),
+        event_type=event_type or "",
+        payload=payload,
+    )
+
+    if get_setting("OUTBOX_DRAIN_IN_THREAD"):
+        transaction.on_commit(schedule_drain)
+
+    return item
+
+
+def schedule_drain():
+    # a single drain at a time is enough, it picks up everything queued so far
+    if not _drain_scheduled.is_set():
+        _drain_scheduled.set()
+        _executor.submit(_drain)
+
+
+def _drain():
+    _drain_scheduled.clear()
+    close_old_connections()
+    try:
+        process_outbox()
+    except Exception:
+        logger.exception("Error processing Zoom registrations outbox")
+    finally:
+        close_old_connections()
+
+
+def is_retryable(error):
+    if isinstance(error, (ConnectionError, Timeout, ZoomRateLimitError, ZoomCircuitOpenError)):
+        return True
+
+    if isinstance(error, HTTPError) and error.response is not None:
+        return error.response.status_code == 429 or error.response.status_code >= 500
+
+    return False
+
+
+def get_retry_delay(attempts):
+    delay = min(get_setting("OUTBOX_RETRY_DELAY") * (2 ** (attempts - 1)), get_setting("OUTBOX_MAX_RETRY_DELAY"))
+    # spread retries so that a burst of failures does not come back at the same time
+    return delay * random.uniform(0.5, 1)
+
+
+def get_zoom_api(site):
+    return get_zoom_client(site)
+
+
+def mark_delivered(item, response):
+    item.status = QueuedZoomRegistration.STATUS_DELIVERED
+    item.attempts += 1
+    item.response = response
+    item.last_error = ""
+    item.save(update_fields=["status", "attempts", "response", "last_error", "updated_at"])
+
+    save_registration_response(item.site, item.event_type, item.event_id, item.payload.get("email"), response)
+
+
+def mark_failed(item, error):
+    item.attempts += 1
+    item.last_error = describe_error(error)
+
+    if item.attempts < get_setting("OUTBOX_MAX_ATTEMPTS") and is_retryable(error):
+        item.status = QueuedZoomRegistration.STATUS_PENDING
+        item.next_attempt_at = timezone.now() + timedelta(seconds=get_retry_delay(item.attempts))
+    else:
+        item.status = QueuedZoomRegistration.STATUS_FAILED
+        release_registrant(item.event_type, item.event_id, item.payload.get("email"))
+        notify_failure(item, error)
+
+    item.save(update_fields=["status", "attempts", "next_attempt_at", "last_error", "updated_at"])
+
+
+def notify_failure(item, error):
+    record_error(
+        error,
+        page=item.page,
+        site=item.site,
+        event_type=item.event_type,
+        event_id=item.event_id,
+        payload=item.payload,
+        source=ZoomIntegrationError.SOURCE_OUTBOX,
+    )
+
+
+def claim(item):
+    # claiming is a conditional update, so that concurrent workers never deliver the same registration twice
+    claimed = QueuedZoomRegistration.objects.filter(
+        pk=item.pk, status=QueuedZoomRegistration.STATUS_PENDING
+    ).update(status=QueuedZoomRegistration.STATUS_PROCESSING, updated_at=timezone.now())
+
+    if claimed:
+        item.status = QueuedZoomRegistration.STATUS_PROCESSING
+
+    return bool(claimed)
+
+
+def release(item):
+    item.status = QueuedZoomRegistration.STATUS_PENDING
+    item.save(update_fields=["status", "updated_at"])
+
+
+def release_stale_claims():
+    stale_before = timezone.now() - timedelta(seconds=get_setting("OUTBOX_PROCESSING_TIMEOUT"))
+
+    QueuedZoomRegistration.objects.filter(
+        status=QueuedZoomRegistration.STATUS_PROCESSING, updated_at__lt=stale_before
+    ).update(status=QueuedZoomRegistration.STATUS_PENDING)
+
+
+def get_pending_items(limit):
+    """
+    Returns the oldest registrations due for delivery. Registrations queued behind one of the same event that is
+    waiting for a retry, or being delivered by another worker, are left out, so that they do not take the place of
+    registrations for other events.
+    """
+    now = timezone.now()
+    blocking = QueuedZoomRegistration.objects.filter(
+        event_type=OuterRef("event_type"), event_id=OuterRef("event_id")
+    ).filter(
+        Q(status=QueuedZoomRegistration.STATUS_PROCESSING)
+        | Q(status=QueuedZoomRegistration.STATUS_PENDING, pk__lt=OuterRef("pk"), next_attempt_at__gt=now)
+    )
+
+    return list(
+        QueuedZoomRegistration.objects.filter(status=QueuedZoomRegistration.STATUS_PENDING, next_attempt_at__lte=now)
+        .exclude(Exists(blocking))
+        .select_related("site")
+        .order_by("pk")[:limit]
+    )
+
+
+def deliver_one_by_one(zoom, items):
+    results = {}
+    failed_events = set()
+
+    for item in items:
+        event_key = (item.event_type, item.event_id)
+
+        # keep the remaining registrations of an event queued behind the one that failed
+        if event_key in failed_events:
+            results[item.pk] = None
+            continue
+
+        try:
+            results[item.pk] = (zoom.add_registrant(item.event_type, item.event_id, item.payload), None)
+        except Exception as e:
+            results[item.pk] = (None, e)
+            failed_events.add(event_key)
+
+    return results
+
+
+def deliver_batched(zoom, items):
+    batcher = RegistrantBatcher(zoom)
+
+    for item in items:
+        batcher.add(item.event_type, item.event_id, item.payload, key=item.pk)
+
+    return {key: (result.response, result.error) for key, result in batcher.flush().items()}
+
+
+def deliver_site_items(site, items):
+    try:
+        zoom = get_zoom_api(site)
+    except Exception as e:
+        return {item.pk: (None, e) for item in items}
+
+    results = {}
+    valid_items = []
+
+    # form requests only validate registrations against cached registration questions
+    for item in items:
+        try:
+            validate_registrant(site, item.event_type, item.event_id, item.payload)
+            valid_items.append(item)
+        except ZoomRegistrantValidationError as e:
+            results[item.pk] = (None, e)
+
+    if get_setting("OUTBOX_COALESCE"):
+        results.update(deliver_batched(zoom, valid_items))
+    else:
+        results.update(deliver_one_by_one(zoom, valid_items))
+
+    return results
+
+
+def process_outbox(limit=None):
+    """
+    Deliver pending registrations, oldest first. Registrations for the same event are delivered in the order they
+    were queued: once one of them is waiting for a retry, or being delivered by another worker, later ones for that
+    event are left for a later run. With WAGTAILZOOM_OUTBOX_COALESCE, registrations queued for the same event are
+    sent to Zoom together in batch registration calls.
+    """
+    if limit is None:
+        limit = get_setting("OUTBOX_BATCH_SIZE")
+
+    release_stale_claims()
+
+    stats = {"delivered": 0, "retrying": 0, "failed": 0}
+    blocked_events = set()
+    items_by_site = {}
+
+    for item in get_pending_items(limit):
+        event_key = (item.event_type, item.event_id)
+
+        if event_key in blocked_events:
+            continue
+
+        # claimed by another worker since the registrations were loaded
+        if not claim(item):
+            blocked_events.add(event_key)
+            continue
+
+        items_by_site.setdefault(item.site_id, []).append(item)
+
+    for items in items_by_site.values():
+        results = deliver_site_items(items[0].site, items)
+
+        for item in items:
+            result = results.get(item.pk)
+
+            if result is None:
+                release(item)
+                continue
+
+            response, error = result
+
+            if error is None:
+                mark_delivered(item, response)
+                stats["delivered"] += 1
+            else:
+                mark_failed(item, error)
+                if item.status == QueuedZoomRegistration.STATUS_FAILED:
+                    stats["failed"] += 1
+                else:
+                    stats["retrying"] += 1
+
+    return stats
@@ -0,0 +1,32 @@
+from wagtail.admin.panels import FieldPanel
+from wagtail.models import Site
+
+
+def get_page_site(page, parent_page=None, request=None):
+    # new pages have no URL path yet, and belong to the site of their parent page
+    site = page.get_site() if page is not None and page.url_path else None
+
+    if site is None and parent_page is not None:
+        site = parent_page.get_site()
+
+    if site is None and request is not None:
+        site = Site.find_for_request(request)
+
+    return site
+
+
+class ZoomEventPanel(FieldPanel):
+    """
+    Panel for the zoom_event field, listing the events of the Zoom account of the site the page belongs to.
+    """
+
+    class BoundPanel(FieldPanel.BoundPanel):
+        def __init__(self, **kwargs):
+            super().__init__(**kwargs)
+
+            site = get_page_site(self.instance, getattr(self.form, "parent_page", None), self.request)
+
+            # the form's fields, and their widgets, are copies owned by this form
+            widget = self.bound_field.field.widget
+            if site is not None and hasattr(widget, "site_id"):
+                widget.site_id = site.pk
@@ -0,0 +1,144 @@
+import logging
+
+from django.core.cache import caches
+from django.core.exceptions import ValidationError
+from django.core.validators import validate_email
+from django.utils.translation import gettext_lazy as _
+
+from .conf import get_setting
+from .errors import ZoomRegistrantValidationError
+from .metrics import get_metrics
+
+logger = logging.getLogger(__name__)
+
+# fields Zoom always requires from registrants
+REQUIRED_REGISTRANT_FIELDS = ("email", "first_name")
+
+# labels of the standard registration questions that can be enabled for an event, by field name
+STANDARD_QUESTIONS = {
+    "last_name": _("Last Name"),
+    "address": _("Address"),
+    "city": _("City"),
+    "country": _("Country"),
+    "zip": _("Zip/Postal Code"),
+    "state": _("State/Province"),
+    "phone": _("Phone"),
+    "industry": _("Industry"),
+    "org": _("Organization"),
+    "job_title": _("Job Title"),
+    "purchasing_time_frame": _("Purchasing Time Frame"),
+    "role_in_purchase_process": _("Role in Purchase Process"),
+    "no_of_employees": _("Number of Employees"),
+    "comments": _("Questions & Comments"),
+}
+
+# custom question types whose answer must be one of the question's answers
+CHOICE_QUESTION_TYPES = ("single_radio", "single_dropdown")
+
+# seconds for which a failure to fetch the questions is remembered, so that every submission does not retry it
+ERROR_CACHE_TTL = 60
+
+
+def get_cache():
+    return caches[get_setting("QUESTIONS_CACHE_ALIAS")]
+
+
+def get_cache_key(site_id, event_type, event_id):
+    return f"wagtailzoom:questions:{site_id}:{event_type}:{event_id}"
+
+
+def get_registration_questions(site, event_type, event_id, fetch=True):
+    """
+    Return the registration questions of an event, as returned by Zoom, fetched once and then cached for
+    WAGTAILZOOM_QUESTIONS_CACHE_TTL seconds. Returns None when they cannot be obtained, or without `fetch`, when
+    they are not cached.
+    """
+    from .clients import get_zoom_client
+
+    metrics = get_metrics()
+    cache_key = get_cache_key(site.pk, event_type, event_id)
+    questions = get_cache().get(cache_key)
+
+    if questions is not None:
+        metrics.increment("wagtailzoom_questions_cache_total", result="hit")
+        # an empty dict records a failure to fetch them
+        return questions or None
+
+    metrics.increment("wagtailzoom_questions_cache_total", result="miss")
+
+    if not fetch:
+        return None
+
+    try:
+        questions = get_zoom_client(site).get_registration_questions(event_type, event_id)
+    except Exception as e:
+        logger.warning("Error obtaining the registration questions of Zoom %s %s: %s", event_type, event_id, e)
+        get_cache().set(cache_key, {}, timeout=ERROR_CACHE_TTL)
+        return None
+
+    get_cache().set(cache_key, questions, timeout=get_setting("QUESTIONS_CACHE_TTL"))
+
+    return questions
+
+
+def invalidate_registration_questions(site_id, event_type, event_id):
+    get_cache().delete(get_cache_key(site_id, event_type, event_id))
+
+
+def get_registrant_errors(payload, questions=None):
+    """
+    Returns the reasons for which Zoom would refuse a registrant payload, according to the event's registration
+    questions.
+    """
+    errors = []
+
+    for field_name in REQUIRED_REGISTRANT_FIELDS:
+        if not payload.get(field_name):
+            errors.append(f"'{field_name}' is required")
+
+    if payload.get("email"):
+        try:
+            # submitted emails are sent as they are, surrounding whitespace is not a reason to refuse them
+            validate_email(payload["email"].strip())
+        except ValidationError:
+            errors.append(f"'{payload['email']}' is not a valid email address")
+
+    if not questions:
+        return errors
+
+    for question in questions.get("questions", []):
+        field_name = question.get("field_name")
+
+        if question.get("required") and field_name not in REQUIRED_REGISTRANT_FIELDS and not payload.get(field_name):
+            errors.append(f"'{field_name}' is required")
+
+    answers = {answer.get("title"): answer.get("value") for answer in payload.get("custom_questions", [])}
+
+    for question in questions.get("custom_questions", []):
+        title = question.get("title")
+        value = answers.get(title)
+
+        if not value:
+            if question.get("required"):
+                errors.append(f"'{title}' is required")
+        elif question.get("type") in CHOICE_QUESTION_TYPES and question.get("answers") \
+                and value not in question["answers"]:
+            errors.append(f"'{value}' is not an answer of '{title}'")
+
+    return errors
+
+
+def validate_registrant(site, event_type, event_id, payload, fetch=True):
+    """
+    Raise ZoomRegistrantValidationError when Zoom would refuse the registrant payload, before sending it.
+    Without `fetch`, the registration questions are only checked when they are cached.
+    """
+    if not get_setting("VALIDATE_REGISTRANTS"):
+        return
+
+    questions = get_registration_questions(site, event_type, event_id, fetch=fetch)
+    errors = get_registrant_errors(payload, questions)
+
+    if errors:
+        raise ZoomRegistrantValidationError(errors)
+
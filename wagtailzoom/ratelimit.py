@@ -0,0 +1,233 @@
+import asyncio
+import email.utils
+import random
+import threading
+import time
+
+import iso8601
+from django.core.cache import caches
+
+from .conf import get_setting
+
+# Zoom rate limit categories of the endpoints used by this package
+LIGHT = "light"
+MEDIUM = "medium"
+HEAVY = "heavy"
+
+
+class TokenBucket:
+    def __init__(self, rate):
+        self.rate = rate
+        self.tokens = rate
+        self.updated_at = time.monotonic()
+        self.paused_until = 0
+        self._lock = threading.Lock()
+
+    def try_acquire(self):
+        # returns 0 when a token was taken, otherwise the number of seconds to wait before trying again
+        with self._lock:
+            now = time.monotonic()
+
+            if now < self.paused_until:
+                return self.paused_until - now
+
+            self.tokens = min(self.rate, self.tokens + (now - self.updated_at) * self.rate)
+            self.updated_at = now
+
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return 0
+
+            return (1 - self.tokens) / self.rate
+
+    async def atry_acquire(self):
+        # kept in process memory, nothing to wait for
+        return self.try_acquire()
+
+    def pause(self, seconds):
+        with self._lock:
+            self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+            self.tokens = 0
+
+    async def apause(self, seconds):
+        self.pause(seconds)
+
+
+class CacheTokenBucket:
+    """
+    Approximate token bucket shared by all processes through the Django cache, counting requests per one second
+    window.
+    """
+
+    def __init__(self, key, rate, alias):
+        self.key = key
+        self.rate = rate
+        self.alias = alias
+
+    @property
+    def cache(self):
+        return caches[self.alias]
+
+    def get_paused_key(self):
+        return f"{self.key}:paused"
+
+    def get_window_key(self, now):
+        return f"{self.key}:{int(now)}"
+
+    def get_wait(self, count, now):
+        if count <= self.rate:
+            return 0
+
+        return 1 - (now % 1)
+
+    def try_acquire(self):
+        now = time.time()
+
+        paused_until = self.cache.get(self.get_paused_key())
+        if paused_until and paused_until > now:
+            return paused_until - now
+
+        window_key = self.get_window_key(now)
+        self.cache.add(window_key, 0, timeout=2)
+
+        try:
+            count = self.cache.incr(window_key)
+        except ValueError:
+            # the window expired in between
+            return 0
+
+        return self.get_wait(count, now)
+
+    async def atry_acquire(self):
+        now = time.time()
+
+        paused_until = await self.cache.aget(self.get_paused_key())
+        if paused_until and paused_until > now:
+            return paused_until - now
+
+        window_key = self.get_window_key(now)
+        await self.cache.aadd(window_key, 0, timeout=2)
+
+        try:
+            count = await self.cache.aincr(window_key)
+        except ValueError:
+            return 0
+
+        return self.get_wait(count, now)
+
+    def pause(self, seconds):
+        self.cache.set(self.get_paused_key(), time.time() + seconds, timeout=int(seconds) + 1)
+
+    async def apause(self, seconds):
+        await self.cache.aset(self.get_paused_key(), time.time() + seconds, timeout=int(seconds) + 1)
+
+
+class RateLimiter:
+    def __init__(self):
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def get_bucket(self, key, category):
+        bucket_key = (key, category)
+        bucket = self._buckets.get(bucket_key)
+
+        if bucket is None:
+            with self._lock:
+                bucket = self._buckets.get(bucket_key)
+                if bucket is None:
+                    rate = get_setting("RATE_LIMITS")[category]
+
+                    if get_setting("RATE_LIMIT_BACKEND") == "django":
+                        bucket = CacheTokenBucket(f"wagtailzoom:ratelimit:{key}:{category}", rate,
+                                                  get_setting("RATE_LIMIT_CACHE_ALIAS"))
+                    else:
+                        bucket = TokenBucket(rate)
+
+                    self._buckets[bucket_key] = bucket
+
+        return bucket
+
+    def acquire(self, key, category, max_wait=None):
+        """
+        Wait until a request of the category can be sent with the credentials key. Returns False if that would take
+        longer than `max_wait` seconds, WAGTAILZOOM_RATE_LIMIT_MAX_WAIT by default.
+        """
+        if not get_setting("RATE_LIMIT_ENABLED"):
+            return True
+
+        if max_wait is None:
+            max_wait = get_setting("RATE_LIMIT_MAX_WAIT")
+
+        bucket = self.get_bucket(key, category)
+        deadline = time.monotonic() + max_wait
+
+        while True:
+            wait = bucket.try_acquire()
+
+            if not wait:
+                return True
+
+            if time.monotonic() + wait > deadline:
+                return False
+
+            time.sleep(wait)
+
+    async def aacquire(self, key, category, max_wait=None):
+        # same as acquire, waiting without blocking the event loop
+        if not get_setting("RATE_LIMIT_ENABLED"):
+            return True
+
+        if max_wait is None:
+            max_wait = get_setting("RATE_LIMIT_MAX_WAIT")
+
+        bucket = self.get_bucket(key, category)
+        deadline = time.monotonic() + max_wait
+
+        while True:
+            wait = await bucket.atry_acquire()
+
+            if not wait:
+                return True
+
+            if time.monotonic() + wait > deadline:
+                return False
+
+            await asyncio.sleep(wait)
+
+    def pause(self, key, category, seconds):
+        if get_setting("RATE_LIMIT_ENABLED"):
+            self.get_bucket(key, category).pause(seconds)
+
+    async def apause(self, key, category, seconds):
+        if get_setting("RATE_LIMIT_ENABLED"):
+            await self.get_bucket(key, category).apause(seconds)
+
+
+rate_limiter = RateLimiter()
+
+
+def get_retry_after(response):
+    # Zoom sends either a number of seconds, or the date at which a daily limit resets
+    retry_after = response.headers.get("Retry-After")
+    if not retry_after:
+        return None
+
+    try:
+        return max(0.0, float(retry_after))
+    except ValueError:
+        pass
+
+    try:
+        retry_at = email.utils.parsedate_to_datetime(retry_after)
+    except (TypeError, ValueError):
+        try:
+            retry_at = iso8601.parse_date(retry_after)
+        except iso8601.ParseError:
+            return None
+
+    return max(0.0, retry_at.timestamp() - time.time())
+
+
+def get_backoff_delay(attempt):
+    # exponential backoff with full jitter
+    return random.uniform(0, get_setting("RETRY_BACKOFF") * (2 ** attempt))
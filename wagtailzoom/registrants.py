@@ -0,0 +1,204 @@
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from .api import normalize_email
+from .conf import get_setting
+from .errors import ZoomCircuitOpenError
+from .metrics import get_metrics
+from .models import ZoomRegistrant
+from .notifications import record_error
+from .questions import validate_registrant
+
+# Zoom registrant statuses sent in registration webhooks
+WEBHOOK_STATUSES = {
+    "approved": ZoomRegistrant.STATUS_APPROVED,
+    "pending": ZoomRegistrant.STATUS_PENDING,
+    "denied": ZoomRegistrant.STATUS_DENIED,
+    "cancelled": ZoomRegistrant.STATUS_CANCELLED,
+}
+
+
+def get_registrant(event_type, event_id, email):
+    return ZoomRegistrant.objects.filter(
+        event_type=event_type, event_id=str(event_id), email=normalize_email(email)
+    ).first()
+
+
+def is_stale_claim(registrant):
+    if registrant.status != ZoomRegistrant.STATUS_REGISTERING:
+        return False
+
+    age = (timezone.now() - registrant.updated_at).total_seconds()
+    return age > get_setting("REGISTRANT_CLAIM_TIMEOUT")
+
+
+def claim_registrant(site, event_type, event_id, email, status=ZoomRegistrant.STATUS_REGISTERING):
+    """
+    Reserve the registration of an email for an event, before it is sent to Zoom.
+    Returns the registrant, and whether it was claimed. A registrant that is not claimed is already registered,
+    or being registered by another request, and should not be sent to Zoom again.
+    """
+    event_id = str(event_id)
+    email = normalize_email(email)
+
+    while True:
+        try:
+            with transaction.atomic():
+                registrant = ZoomRegistrant.objects.create(
+                    site=site, event_type=event_type, event_id=event_id, email=email, status=status
+                )
+            return registrant, True
+        except IntegrityError:
+            pass
+
+        try:
+            registrant = ZoomRegistrant.objects.get(event_type=event_type, event_id=event_id, email=email)
+            break
+        except ZoomRegistrant.DoesNotExist:
+            # released by a failed registration in the meantime
+            continue
+
+    if registrant.status in ZoomRegistrant.ACTIVE_STATUSES and not is_stale_claim(registrant):
+        get_metrics().increment("wagtailzoom_registrant_dedupe_total")
+        return registrant, False
+
+    # e.g. registering again after cancelling. The conditional update lets a single request take it over
+    claimed = ZoomRegistrant.objects.filter(
+        pk=registrant.pk, status=registrant.status, updated_at=registrant.updated_at
+    ).update(status=status, updated_at=timezone.now())
+
+    if claimed:
+        registrant.refresh_from_db()
+
+    return registrant, bool(claimed)
+
+
+def release_registrant(event_type, event_id, email):
+    # the registration failed, so that a later submission is sent to Zoom again
+    ZoomRegistrant.objects.filter(
+        event_type=event_type,
+        event_id=str(event_id),
+        email=normalize_email(email),
+        status__in=[ZoomRegistrant.STATUS_QUEUED, ZoomRegistrant.STATUS_REGISTERING],
+    ).delete()
+
+
+def save_registration_response(site, event_type, event_id, email, response):
+    """
+    Store the registrant added to Zoom, from a single or batch registration response.
+    """
+    response = response or {}
+
+    registrant, _ = ZoomRegistrant.objects.update_or_create(
+        event_type=event_type,
+        event_id=str(event_id),
+        email=normalize_email(email),
+        defaults={
+            "site": site,
+            "registrant_id": str(response.get("registrant_id") or response.get("id") or ""),
+            "join_url": response.get("join_url") or "",
+            "status": ZoomRegistrant.STATUS_REGISTERED,
+            "data": response,
+        },
+    )
+
+    return registrant
+
+
+class ZoomRegistration:
+    """
+    Registration of a form submission to the Zoom event of a page. Holds the steps around sending it to Zoom, shared
+    by the sync and async integration operations of AbstractZoomIntegrationForm.
+    """
+
+    def __init__(self, page, form, request=None):
+        self.page = page
+        self.form = form
+        self.request = request
+        self.event_type = page.zoom_event_type
+        self.event_id = page.zoom_event_id
+        self.site = None
+        self.payload = None
+        self.registrant = None
+        self.claimed = False
+
+    @property
+    def email(self):
+        return self.payload.get("email") if self.payload else None
+
+    def prepare(self, status=ZoomRegistrant.STATUS_REGISTERING):
+        """
+        Build and validate the registrant payload, and claim the registration. Returns False when the submission
+        is already registered, or being registered by a concurrent submission, and should not be sent to Zoom.
+        """
+        self.site = self.page.get_zoom_site(self.request)
+        self.payload = self.page.build_zoom_registrant_data(self.form)
+
+        # payloads Zoom would refuse are not sent. Queued registrations are validated again by the outbox worker, so
+        # that the form request does not wait for Zoom to fetch the registration questions
+        validate_registrant(self.site, self.event_type, self.event_id, self.payload,
+                            fetch=status != ZoomRegistrant.STATUS_QUEUED)
+
+        if not get_setting("REGISTRANT_DEDUPE"):
+            return True
+
+        self.registrant, self.claimed = claim_registrant(self.site, self.event_type, self.event_id, self.email,
+                                                         status=status)
+        self.page.zoom_registrant = self.registrant
+
+        return self.claimed
+
+    def save(self, response):
+        self.page.zoom_registrant = save_registration_response(self.site, self.event_type, self.event_id, self.email,
+                                                               response)
+
+    def fail(self, error):
+        # returns the result of the integration operation after the error
+        if self.claimed:
+            release_registrant(self.event_type, self.event_id, self.email)
+            self.page.zoom_registrant = None
+            self.claimed = False
+
+        # Zoom is known to be unavailable, the circuit opening was reported to the admins
+        if isinstance(error, ZoomCircuitOpenError) and get_setting("CIRCUIT_OPEN_ACTION") == "outbox":
+            return self.page.queue_zoom_registration(self.form, request=self.request)
+
+        # reported to the admins in the next error digest, see the zoom_send_error_digest command
+        record_error(error, page=self.page, site=self.site, event_type=self.event_type, event_id=self.event_id,
+                     payload=self.payload)
+
+        return False, None
+
+
+def apply_registrant_change(site, event_type, action, obj):
+    """
+    Update the stored registrant from a registration webhook, e.g. meeting.registration_approved.
+    """
+    registrant_data = obj.get("registrant", {})
+    event_id = str(obj.get("id", ""))
+    email = normalize_email(registrant_data.get("email"))
+
+    if not event_id or not email:
+        return None
+
+    if action == "created":
+        status = WEBHOOK_STATUSES.get(registrant_data.get("status"), ZoomRegistrant.STATUS_REGISTERED)
+    else:
+        status = WEBHOOK_STATUSES[action]
+
+    defaults = {"status": status}
+
+    if registrant_data.get("id"):
+        defaults["registrant_id"] = str(registrant_data["id"])
+    if registrant_data.get("join_url"):
+        defaults["join_url"] = registrant_data["join_url"]
+
+    registrant, created = ZoomRegistrant.objects.update_or_create(
+        event_type=event_type, event_id=event_id, email=email, defaults=defaults
+    )
+
+    if created and site is not None:
+        registrant.site = site
+        registrant.save(update_fields=["site"])
+
+    return registrant
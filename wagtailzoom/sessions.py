@@ -0,0 +1,50 @@
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from .conf import get_setting
+
+_sessions = {}
+_lock = threading.Lock()
+
+
+def create_session():
+    session = requests.Session()
+
+    adapter = HTTPAdapter(
+        pool_connections=get_setting("HTTP_POOL_CONNECTIONS"),
+        pool_maxsize=get_setting("HTTP_POOL_SIZE"),
+        pool_block=get_setting("HTTP_POOL_BLOCK"),
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+
+    if not get_setting("HTTP_KEEP_ALIVE"):
+        session.headers["Connection"] = "close"
+
+    return session
+
+
+def get_session(key):
+    # one pooled session per credential set, shared by all clients using the same credentials
+    session = _sessions.get(key)
+
+    if session is None:
+        with _lock:
+            session = _sessions.get(key)
+            if session is None:
+                session = _sessions[key] = create_session()
+
+    return session
+
+
+def get_timeout():
+    return get_setting("HTTP_CONNECT_TIMEOUT"), get_setting("HTTP_READ_TIMEOUT")
+
+
+def close_sessions():
+    with _lock:
+        for session in _sessions.values():
+            session.close()
+        _sessions.clear()
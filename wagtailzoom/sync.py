@@ -0,0 +1,132 @@
+import iso8601
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from .clients import get_zoom_client
+from .conf import get_setting
+from .metrics import get_metrics
+from .models import ZoomEvent
+
+
+def get_zoom_api(site):
+    return get_zoom_client(site)
+
+
+def parse_start_time(event):
+    start_time = event.get("start_time")
+    return iso8601.parse_date(start_time) if start_time else None
+
+
+def update_event_fields(zoom_event, event):
+    zoom_event.topic = (event.get("topic") or "")[:300]
+    zoom_event.start_time = parse_start_time(event)
+    zoom_event.data = event
+
+
+def sync_events(site, zoom=None):
+    """
+    Mirror the upcoming meetings and webinars of the site's Zoom account into ZoomEvent rows.
+    Only new and changed events are written, and events that are no longer listed are removed.
+    Returns the sync stats, and the listing errors by event type.
+    """
+    if zoom is None:
+        zoom = get_zoom_api(site)
+
+    listings = {
+        "meeting": zoom.iter_meetings,
+        "webinar": zoom.iter_webinars,
+    }
+    listed = {}
+    errors = {}
+
+    for event_type, iter_events in listings.items():
+        try:
+            listed[event_type] = {str(event["id"]): event for event in iter_events()}
+        except Exception as e:
+            errors[event_type] = e
+
+    if len(errors) == len(listings):
+        raise errors["meeting"]
+
+    existing = {(e.event_type, e.event_id): e for e in ZoomEvent.objects.filter(site=site)}
+    now = timezone.now()
+
+    to_create = []
+    to_update = []
+    to_delete = []
+
+    for event_type, events in listed.items():
+        for event_id, event in events.items():
+            zoom_event = existing.get((event_type, event_id))
+
+            if zoom_event is None:
+                zoom_event = ZoomEvent(site=site, event_type=event_type, event_id=event_id, synced_at=now)
+                update_event_fields(zoom_event, event)
+                to_create.append(zoom_event)
+            elif zoom_event.data != event:
+                update_event_fields(zoom_event, event)
+                zoom_event.synced_at = now
+                to_update.append(zoom_event)
+
+    # events of a listing that failed are kept as they are
+    for (event_type, event_id), zoom_event in existing.items():
+        if event_type in listed and event_id not in listed[event_type]:
+            to_delete.append(zoom_event.pk)
+
+    with transaction.atomic():
+        # a concurrent refresh, e.g. forced from the page editor, may have created some of the events already
+        ZoomEvent.objects.bulk_create(to_create, ignore_conflicts=True)
+        ZoomEvent.objects.bulk_update(to_update, ["topic", "start_time", "data", "synced_at"])
+        ZoomEvent.objects.filter(pk__in=to_delete).delete()
+
+    stats = {"created": len(to_create), "updated": len(to_update), "deleted": len(to_delete)}
+
+    return stats, errors
+
+
+def get_event_detail(site, event_type, event_id, zoom=None):
+    """
+    Return the full details of a meeting or webinar, from the ZoomEvent mirror when they are not older than
+    WAGTAILZOOM_EVENTS_DETAIL_TTL seconds, otherwise from Zoom.
+    """
+    event_id = str(event_id)
+    zoom_event = ZoomEvent.objects.filter(site=site, event_type=event_type, event_id=event_id).first()
+
+    if zoom_event and zoom_event.detail and zoom_event.detail_synced_at:
+        age = (timezone.now() - zoom_event.detail_synced_at).total_seconds()
+        if age < get_setting("EVENTS_DETAIL_TTL"):
+            get_metrics().increment("wagtailzoom_event_detail_cache_total", result="hit")
+            return zoom_event.detail
+
+    get_metrics().increment("wagtailzoom_event_detail_cache_total", result="miss")
+
+    if zoom is None:
+        zoom = get_zoom_api(site)
+
+    if event_type == "meeting":
+        detail = zoom.get_meeting(event_id)
+    else:
+        detail = zoom.get_webinar(event_id)
+
+    now = timezone.now()
+
+    if zoom_event:
+        zoom_event.detail = detail
+        zoom_event.detail_synced_at = now
+        zoom_event.save(update_fields=["detail", "detail_synced_at"])
+        return detail
+
+    # events not mirrored yet are added, until the next sync updates them from the listings
+    zoom_event = ZoomEvent(site=site, event_type=event_type, event_id=event_id, synced_at=now,
+                           detail=detail, detail_synced_at=now)
+    update_event_fields(zoom_event, detail)
+
+    try:
+        with transaction.atomic():
+            zoom_event.save()
+    except IntegrityError:
+        ZoomEvent.objects.filter(site=site, event_type=event_type, event_id=event_id).update(
+            detail=detail, detail_synced_at=now
+        )
+
+    return detail
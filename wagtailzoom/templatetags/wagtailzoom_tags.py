@@ -0,0 +1,33 @@
+from django import template
+
+from wagtailzoom.event_bundles import get_event_bundle
+
+register = template.Library()
+
+# the tags only read the cache. Data missing from the cache is fetched in the background, and renders as empty until
+# it is available
+
+
+@register.simple_tag
+def zoom_event_bundle(event_id):
+    """
+    {% zoom_event_bundle event_id as bundle %} with bundle.sessions, bundle.speakers and bundle.sponsors
+    """
+    if not event_id:
+        return {}
+    return get_event_bundle(event_id, fetch=False) or {}
+
+
+@register.simple_tag
+def zoom_event_sessions(event_id):
+    return zoom_event_bundle(event_id).get("sessions")
+
+
+@register.simple_tag
+def zoom_event_speakers(event_id):
+    return zoom_event_bundle(event_id).get("speakers")
+
+
+@register.simple_tag
+def zoom_event_sponsors(event_id):
+    return zoom_event_bundle(event_id).get("sponsors")
@@ -1,3 +1,648 @@
-from django.test import TestCase
+import hashlib
+import hmac
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from unittest import mock
 
-# Create your tests here.
+from django.core.cache import cache
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.utils import timezone
+from requests import ConnectionError, HTTPError
+from wagtail.models import Site
+
+from .api import ZoomApi, get_retry
+from .circuit import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, call_with_circuit_breaker
+from .credentials import ROUND_ROBIN, ZoomApiPool, get_credential_health
+from .errors import ZoomCircuitOpenError
+from .forms import ZoomIntegrationForm
+from .metrics import PrometheusMetrics
+from .models import (
+    AbstractZoomIntegrationForm,
+    QueuedZoomRegistration,
+    ZoomEvent,
+    ZoomIntegrationError,
+    ZoomRegistrant,
+    ZoomSettings,
+)
+from .outbox import process_outbox
+from .questions import get_cache, get_cache_key, get_registrant_errors
+from .ratelimit import CacheTokenBucket, RateLimiter, TokenBucket, get_retry_after
+from .registrants import ZoomRegistration, claim_registrant
+from .sync import get_event_detail, sync_events
+from .tokens import TokenManager, token_manager
+from .wagtail_hooks import page_listing_buttons, show_zoom_integration_fields_warning
+from .webhooks import handle_webhook_event
+
+
+def deliver_all(site, items):
+    return {item.pk: ({"id": item.pk}, None) for item in items}
+
+
+@mock.patch("wagtailzoom.outbox.deliver_site_items", deliver_all)
+class OutboxTestCase(TestCase):
+    def setUp(self):
+        self.site = Site.objects.get(is_default_site=True)
+
+    def queue(self, event_id, email, **kwargs):
+        return QueuedZoomRegistration.objects.create(
+            site=self.site, event_id=event_id, event_type="meeting", payload={"email": email}, **kwargs
+        )
+
+    def test_event_waiting_for_retry_does_not_block_other_events(self):
+        retrying = self.queue("1", "a1@example.com", attempts=1,
+                              next_attempt_at=timezone.now() + timedelta(hours=1))
+        behind = [self.queue("1", f"a{i}@example.com") for i in range(2, 5)]
+        other = self.queue("2", "b1@example.com")
+
+        stats = process_outbox(limit=4)
+
+        self.assertEqual(stats, {"delivered": 1, "retrying": 0, "failed": 0})
+        other.refresh_from_db()
+        self.assertEqual(other.status, QueuedZoomRegistration.STATUS_DELIVERED)
+
+        # registrations of the first event stay queued, in order, behind the one waiting for a retry
+        for item in [retrying, *behind]:
+            item.refresh_from_db()
+            self.assertEqual(item.status, QueuedZoomRegistration.STATUS_PENDING)
+
+    def test_registrations_of_an_event_being_delivered_are_left_for_later(self):
+        self.queue("1", "a1@example.com", status=QueuedZoomRegistration.STATUS_PROCESSING)
+        pending = self.queue("1", "a2@example.com")
+        other = self.queue("2", "b1@example.com")
+
+        stats = process_outbox(limit=1)
+
+        self.assertEqual(stats["delivered"], 1)
+        pending.refresh_from_db()
+        other.refresh_from_db()
+        self.assertEqual(pending.status, QueuedZoomRegistration.STATUS_PENDING)
+        self.assertEqual(other.status, QueuedZoomRegistration.STATUS_DELIVERED)
+
+
+class FakeZoomApi:
+    def __init__(self, meetings=()):
+        self.meetings = list(meetings)
+        self.requests = 0
+
+    def iter_meetings(self):
+        return iter(self.meetings)
+
+    def iter_webinars(self):
+        return iter([])
+
+    def get_meeting(self, meeting_id):
+        self.requests += 1
+        return {"id": int(meeting_id), "topic": "Meeting", "start_time": "2030-01-01T10:00:00Z", "agenda": ""}
+
+
+class FakeRegistrationApi(ZoomApi):
+    def __init__(self):
+        self.batches = []
+        self.registrants = []
+
+    def add_registrants_batch(self, event_type, event_id, registrants):
+        self.batches.append(registrants)
+        return {"registrants": [{"email": registrant["email"], "registrant_id": "batch"}
+                                for registrant in registrants]}
+
+    def add_registrant(self, event_type, event_id, data):
+        self.registrants.append(data)
+        return {"email": data["email"], "registrant_id": "single"}
+
+
+class RegistrantBatchTestCase(SimpleTestCase):
+    def test_registrants_answering_other_questions_are_added_on_their_own(self):
+        registrants = [
+            {"email": "a@example.com", "first_name": "A", "last_name": "", "city": ""},
+            {"email": "b@example.com", "first_name": "B", "org": "Org"},
+            {"email": "c@example.com", "first_name": "C", "last_name": "C"},
+            {"email": "d@example.com", "first_name": "D", "custom_questions": [{"title": "Role", "value": "Student"}]},
+        ]
+        zoom = FakeRegistrationApi()
+
+        results = zoom.add_registrants("meeting", "1", registrants)
+
+        self.assertEqual(zoom.batches, [[registrants[0], registrants[2]]])
+        self.assertEqual(zoom.registrants, [registrants[1], registrants[3]])
+        self.assertEqual([result.response["registrant_id"] for result in results],
+                         ["batch", "single", "batch", "single"])
+
+
+class EventMirrorTestCase(TestCase):
+    def setUp(self):
+        self.site = Site.objects.get(is_default_site=True)
+
+    def test_concurrent_refresh_does_not_fail_on_existing_events(self):
+        bulk_create = ZoomEvent.objects.bulk_create
+
+        def bulk_create_after_concurrent_refresh(objs, **kwargs):
+            ZoomEvent.objects.create(site=self.site, event_type="meeting", event_id="1", topic="Meeting")
+            return bulk_create(objs, **kwargs)
+
+        zoom = FakeZoomApi(meetings=[{"id": 1, "topic": "Meeting"}])
+
+        with mock.patch.object(ZoomEvent.objects, "bulk_create", bulk_create_after_concurrent_refresh):
+            stats, errors = sync_events(self.site, zoom=zoom)
+
+        self.assertEqual(errors, {})
+        self.assertEqual(ZoomEvent.objects.filter(site=self.site).count(), 1)
+
+    def test_event_detail_is_mirrored(self):
+        zoom = FakeZoomApi()
+
+        detail = get_event_detail(self.site, "meeting", "1", zoom=zoom)
+        self.assertEqual(get_event_detail(self.site, "meeting", "1", zoom=zoom), detail)
+
+        self.assertEqual(zoom.requests, 1)
+        zoom_event = ZoomEvent.objects.get(site=self.site, event_type="meeting", event_id="1")
+        self.assertEqual(zoom_event.topic, "Meeting")
+        self.assertEqual(zoom_event.detail, detail)
+
+
+class RegistrantClaimTestCase(TestCase):
+    def setUp(self):
+        self.site = Site.objects.get(is_default_site=True)
+
+    def test_claim_released_by_a_failed_registration_is_created_again(self):
+        ZoomRegistrant.objects.create(site=self.site, event_type="meeting", event_id="1", email="a@example.com")
+        get = ZoomRegistrant.objects.get
+
+        def get_after_release(**kwargs):
+            # the concurrent registration failed after the create of this one was refused
+            ZoomRegistrant.objects.filter(**kwargs).delete()
+            return get(**kwargs)
+
+        with mock.patch.object(ZoomRegistrant.objects, "get", get_after_release):
+            registrant, claimed = claim_registrant(self.site, "meeting", "1", "a@example.com")
+
+        self.assertTrue(claimed)
+        self.assertEqual(registrant.status, ZoomRegistrant.STATUS_REGISTERING)
+        self.assertEqual(ZoomRegistrant.objects.count(), 1)
+
+    @mock.patch("wagtailzoom.registrants.record_error")
+    def test_queue_error_releases_the_claim(self, record_error):
+        page = mock.Mock(zoom_event_type="meeting", zoom_event_id="1")
+        page.get_zoom_site.return_value = self.site
+        page.build_zoom_registrant_data.return_value = {"email": "a@example.com", "first_name": "A"}
+        error = RuntimeError("database unavailable")
+
+        with mock.patch("wagtailzoom.outbox.enqueue_registration", side_effect=error):
+            result = AbstractZoomIntegrationForm.queue_zoom_registration(page, form=None)
+
+        self.assertEqual(result, (False, None))
+        self.assertFalse(ZoomRegistrant.objects.exists())
+        self.assertIs(record_error.call_args.args[0], error)
+
+
+@override_settings(ROOT_URLCONF="wagtailzoom.urls")
+class WebhookTestCase(TestCase):
+    secret_token = "secret"
+
+    def setUp(self):
+        self.site = Site.objects.get(is_default_site=True)
+        ZoomSettings.objects.create(site=self.site, webhook_secret_token=self.secret_token)
+
+    def get_signature(self, body, timestamp, secret_token=secret_token):
+        # as documented by Zoom: v0=HMAC-SHA256 of "v0:{timestamp}:{body}"
+        message = b"v0:%s:" % str(timestamp).encode() + body
+        return "v0=" + hmac.new(secret_token.encode(), message, hashlib.sha256).hexdigest()
+
+    def post(self, body, timestamp=None, signature=None):
+        timestamp = str(int(time.time()) if timestamp is None else timestamp)
+
+        if signature is None:
+            signature = self.get_signature(body, timestamp)
+
+        return self.client.post("/webhook/", body, content_type="application/json",
+                                headers={"x-zm-request-timestamp": timestamp, "x-zm-signature": signature})
+
+    def test_signed_event_is_applied(self):
+        ZoomEvent.objects.create(site=self.site, event_type="meeting", event_id="1", topic="Meeting")
+        body = json.dumps({"event": "meeting.deleted", "payload": {"object": {"id": 1}}}).encode()
+
+        response = self.post(body)
+
+        self.assertEqual(response.status_code, 204)
+        self.assertFalse(ZoomEvent.objects.exists())
+
+    def test_tampered_requests_are_refused(self):
+        ZoomEvent.objects.create(site=self.site, event_type="meeting", event_id="1", topic="Meeting")
+        body = json.dumps({"event": "meeting.deleted", "payload": {"object": {"id": 1}}}).encode()
+        timestamp = int(time.time())
+        signature = self.get_signature(body, timestamp)
+
+        self.assertEqual(self.post(body.replace(b"1", b"2"), timestamp, signature).status_code, 401)
+        self.assertEqual(self.post(body, timestamp + 1, signature).status_code, 401)
+        self.assertEqual(self.post(body, timestamp, self.get_signature(body, timestamp, "other")).status_code, 401)
+        self.assertEqual(self.post(body, signature="v0=\u00e9").status_code, 401)
+        self.assertEqual(self.post(b"\xff\xfe", timestamp, signature).status_code, 401)
+        self.assertTrue(ZoomEvent.objects.exists())
+
+    def test_old_requests_are_refused(self):
+        body = json.dumps({"event": "meeting.deleted", "payload": {"object": {"id": 1}}}).encode()
+
+        self.assertEqual(self.post(body, timestamp=int(time.time()) - 301).status_code, 401)
+        self.assertEqual(self.post(body, timestamp="soon").status_code, 401)
+
+    def test_url_validation(self):
+        body = json.dumps({"event": "endpoint.url_validation", "payload": {"plainToken": "plain"}}).encode()
+
+        response = self.post(body)
+
+        self.assertEqual(response.status_code, 200)
+        encrypted_token = hmac.new(b"secret", b"plain", hashlib.sha256).hexdigest()
+        self.assertEqual(response.json(), {"plainToken": "plain", "encryptedToken": encrypted_token})
+
+
+class PrometheusMetricsTestCase(SimpleTestCase):
+    def test_render_labels_of_mixed_types(self):
+        metrics = PrometheusMetrics()
+        metrics.increment("wagtailzoom_zoom_requests_total", endpoint="/meetings/{id}", status=200)
+        metrics.increment("wagtailzoom_zoom_requests_total", endpoint="/meetings/{id}", status="error")
+        metrics.increment("wagtailzoom_zoom_requests_total", endpoint="/meetings/{id}", status=200)
+
+        output = metrics.render()
+
+        self.assertIn('wagtailzoom_zoom_requests_total{endpoint="/meetings/{id}",status="200"} 2', output)
+        self.assertIn('wagtailzoom_zoom_requests_total{endpoint="/meetings/{id}",status="error"} 1', output)
+
+
+class RegistrationQuestionsTestCase(TestCase):
+    def setUp(self):
+        self.site = Site.objects.get(is_default_site=True)
+        get_cache().clear()
+
+    def test_event_update_webhook_clears_cached_questions(self):
+        cache_key = get_cache_key(self.site.pk, "meeting", "1")
+        get_cache().set(cache_key, {"questions": [{"field_name": "city", "required": True}]})
+
+        handle_webhook_event(self.site, {"event": "meeting.updated", "payload": {"object": {"id": 1}}})
+
+        self.assertIsNone(get_cache().get(cache_key))
+
+    def test_queued_registration_does_not_fetch_questions(self):
+        page = mock.Mock(zoom_event_type="meeting", zoom_event_id="1")
+        page.get_zoom_site.return_value = self.site
+        page.build_zoom_registrant_data.return_value = {"email": "a@example.com", "first_name": "A"}
+
+        with mock.patch("wagtailzoom.clients.get_zoom_client") as get_zoom_client:
+            claimed = ZoomRegistration(page, form=None).prepare(status=ZoomRegistrant.STATUS_QUEUED)
+
+        self.assertTrue(claimed)
+        get_zoom_client.assert_not_called()
+
+    def test_outbox_validates_queued_registrations(self):
+        get_cache().set(get_cache_key(self.site.pk, "meeting", "1"),
+                        {"questions": [{"field_name": "city", "required": True}]})
+        invalid = QueuedZoomRegistration.objects.create(
+            site=self.site, event_id="1", event_type="meeting", payload={"email": "a@example.com", "first_name": "A"}
+        )
+        QueuedZoomRegistration.objects.create(
+            site=self.site, event_id="1", event_type="meeting",
+            payload={"email": "b@example.com", "first_name": "B", "city": "Nairobi"}
+        )
+        zoom = FakeRegistrationApi()
+
+        with mock.patch("wagtailzoom.outbox.get_zoom_api", return_value=zoom):
+            stats = process_outbox()
+
+        self.assertEqual(stats, {"delivered": 1, "retrying": 0, "failed": 1})
+        self.assertEqual([registrant["email"] for registrant in zoom.registrants], ["b@example.com"])
+        invalid.refresh_from_db()
+        self.assertEqual(invalid.last_error, "'city' is required")
+
+    def test_registrant_errors(self):
+        questions = {
+            "questions": [{"field_name": "city", "required": True}],
+            "custom_questions": [{"title": "Role", "type": "single_radio", "required": False,
+                                  "answers": ["Student", "Teacher"]}],
+        }
+
+        self.assertEqual(get_registrant_errors({"email": " A@example.com ", "first_name": "A", "city": "Nairobi"},
+                                               questions), [])
+        self.assertEqual(
+            get_registrant_errors({"email": "a@example.com", "first_name": "A",
+                                   "custom_questions": [{"title": "Role", "value": "Parent"}]}, questions),
+            ["'city' is required", "'Parent' is not an answer of 'Role'"],
+        )
+
+
+class FakeFormField:
+    def __init__(self, clean_name, field_type="singleline"):
+        self.clean_name = clean_name
+        self.label = clean_name
+        self.field_type = field_type
+
+
+class FakeFormPage:
+    is_zoom_integration = True
+    zoom_event = '{"event_id": "1", "event_type": "meeting"}'
+    zoom_event_id = "1"
+    title = "Registration"
+    pk = 1
+
+    def __init__(self, mapping):
+        self.zoom_reg_fields_mapping = json.dumps(mapping)
+        self.saved = False
+
+    @property
+    def zoom_merge_fields(self):
+        return json.loads(self.zoom_reg_fields_mapping) if self.zoom_reg_fields_mapping else {}
+
+    def save(self):
+        self.saved = True
+
+
+@mock.patch("wagtailzoom.wagtail_hooks.messages")
+class IntegrationFieldsTestCase(SimpleTestCase):
+    form_fields = [FakeFormField("email", "email"), FakeFormField("first"), FakeFormField("last")]
+    questions = {"questions": [{"field_name": "city", "required": False}]}
+
+    def publish(self, page):
+        with mock.patch("wagtailzoom.wagtail_hooks.get_form_fields", return_value=self.form_fields):
+            show_zoom_integration_fields_warning(RequestFactory().get("/"), page)
+
+    def test_unmapped_optional_question_keeps_mapping(self, messages):
+        mapping = {"email": "email", "first_name": "first", "last_name": "last", "city": ""}
+        page = FakeFormPage(mapping)
+
+        self.publish(page)
+
+        self.assertFalse(page.saved)
+        self.assertEqual(page.zoom_merge_fields, mapping)
+        messages.warning.assert_not_called()
+
+    def test_removed_form_field_clears_mapping(self, messages):
+        page = FakeFormPage({"email": "email", "first_name": "first", "last_name": "surname", "city": ""})
+
+        self.publish(page)
+
+        self.assertTrue(page.saved)
+        self.assertEqual(page.zoom_reg_fields_mapping, "")
+        messages.warning.assert_called_once()
+
+    def test_listing_button_of_pages_without_flag(self, messages):
+        for has_zoom_event, buttons in [(True, 1), (None, 1), (False, 0)]:
+            page = FakeFormPage({})
+            page.has_zoom_event = has_zoom_event
+            page.update_has_zoom_event = mock.Mock()
+            page.show_page_listing_zoom_integration_button = mock.Mock(return_value=True)
+
+            self.assertEqual(len(list(page_listing_buttons(page, page_perms=None))), buttons)
+            page.update_has_zoom_event.assert_not_called()
+
+    def test_optional_question_can_be_unmapped(self, messages):
+        form = ZoomIntegrationForm(form_fields=self.form_fields, questions=self.questions)
+
+        self.assertIn('<option value="" selected>', str(form["city"]))
+        self.assertIn('<option value="" selected disabled>', str(form["email"]))
+
+        form = ZoomIntegrationForm(form_fields=self.form_fields, questions=self.questions,
+                                   data={"email": "email", "first_name": "first", "last_name": "last", "city": ""})
+        self.assertTrue(form.is_valid())
+
+
+class FakeResponse:
+    def __init__(self, status_code=200, data=None, headers=None):
+        self.status_code = status_code
+        self.data = data or {}
+        self.headers = headers or {}
+
+    def json(self):
+        return self.data
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise HTTPError(f"{self.status_code} response", response=self)
+
+
+class FakeSession:
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.requests = []
+
+    def request(self, method, url, headers=None, **kwargs):
+        self.requests.append((method, url, headers))
+        return self.responses.pop(0)
+
+
+class TokenCacheTestCase(SimpleTestCase):
+    def setUp(self):
+        token_manager.get_cache().clear()
+
+    def test_single_fetch_for_concurrent_requests(self):
+        manager = TokenManager()
+        fetches = []
+
+        def fetch():
+            fetches.append(1)
+            time.sleep(0.05)
+            return "token", 3600
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            tokens = list(executor.map(lambda i: manager.get_token("key", fetch), range(8)))
+
+        self.assertEqual(tokens, ["token"] * 8)
+        self.assertEqual(len(fetches), 1)
+
+    @mock.patch("wagtailzoom.tokens.time")
+    def test_token_is_refreshed_before_it_expires(self, mock_time):
+        manager = TokenManager()
+        fetch = mock.Mock(side_effect=[("token-1", 3600), ("token-2", 100), ("token-3", 100)])
+
+        mock_time.time.return_value = 1000
+        self.assertEqual(manager.get_token("key", fetch), "token-1")
+
+        # WAGTAILZOOM_TOKEN_REFRESH_MARGIN seconds before expiry
+        mock_time.time.return_value = 4299
+        self.assertEqual(manager.get_token("key", fetch), "token-1")
+        mock_time.time.return_value = 4300
+        self.assertEqual(manager.get_token("key", fetch), "token-2")
+
+        # tokens living less than the margin are refreshed half-way through their lifetime
+        mock_time.time.return_value = 4349
+        self.assertEqual(manager.get_token("key", fetch), "token-2")
+        mock_time.time.return_value = 4350
+        self.assertEqual(manager.get_token("key", fetch), "token-3")
+
+    def test_refused_token_is_replaced(self):
+        zoom = ZoomApi("account", "client", "secret", fetch_token=False)
+        zoom.session = FakeSession(FakeResponse(401), FakeResponse(200, {"id": 1}))
+
+        with mock.patch.object(ZoomApi, "fetch_access_token", side_effect=[("token-1", 3600), ("token-2", 3600)]):
+            self.assertEqual(zoom.get_meeting("1"), {"id": 1})
+
+        self.assertEqual([headers["Authorization"] for method, url, headers in zoom.session.requests],
+                         ["Bearer token-1", "Bearer token-2"])
+        self.assertEqual(token_manager.get_cache().get(zoom.credentials_key), "token-2")
+
+
+class RateLimitTestCase(SimpleTestCase):
+    @mock.patch("wagtailzoom.ratelimit.time")
+    def test_token_bucket(self, mock_time):
+        mock_time.monotonic.return_value = 100
+        bucket = TokenBucket(rate=2)
+
+        self.assertEqual(bucket.try_acquire(), 0)
+        self.assertEqual(bucket.try_acquire(), 0)
+        self.assertEqual(bucket.try_acquire(), 0.5)
+
+        mock_time.monotonic.return_value = 100.5
+        self.assertEqual(bucket.try_acquire(), 0)
+
+        bucket.pause(3)
+        self.assertEqual(bucket.try_acquire(), 3)
+        mock_time.monotonic.return_value = 103.5
+        self.assertEqual(bucket.try_acquire(), 0)
+
+    @mock.patch("wagtailzoom.ratelimit.time")
+    def test_cache_token_bucket(self, mock_time):
+        mock_time.time.return_value = 100.25
+        bucket = CacheTokenBucket("wagtailzoom:tests:ratelimit", rate=2, alias="default")
+        bucket.cache.clear()
+
+        self.assertEqual([bucket.try_acquire() for i in range(3)], [0, 0, 0.75])
+
+        mock_time.time.return_value = 101
+        self.assertEqual(bucket.try_acquire(), 0)
+
+    def test_acquire_gives_up_after_max_wait(self):
+        limiter = RateLimiter()
+
+        with self.settings(WAGTAILZOOM_RATE_LIMITS={"light": 1, "medium": 1, "heavy": 1}):
+            self.assertTrue(limiter.acquire("key", "light", max_wait=0))
+            self.assertFalse(limiter.acquire("key", "light", max_wait=0))
+            self.assertTrue(limiter.acquire("other", "light", max_wait=0))
+
+    def test_retry_after(self):
+        now = time.time()
+
+        self.assertEqual(get_retry_after(FakeResponse(429, headers={"Retry-After": "5"})), 5)
+        self.assertEqual(get_retry_after(FakeResponse(429, headers={"Retry-After": "-5"})), 0)
+        self.assertIsNone(get_retry_after(FakeResponse(429)))
+        self.assertIsNone(get_retry_after(FakeResponse(429, headers={"Retry-After": "soon"})))
+
+        http_date = time.strftime("%a, %d %b %Y %H:%M:%S GMT", time.gmtime(now + 60))
+        self.assertAlmostEqual(get_retry_after(FakeResponse(429, headers={"Retry-After": http_date})), 60, delta=2)
+
+        iso_date = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(now + 3600))
+        self.assertAlmostEqual(get_retry_after(FakeResponse(429, headers={"Retry-After": iso_date})), 3600, delta=2)
+
+    def test_retry(self):
+        self.assertEqual(get_retry("POST", 0, FakeResponse(429, headers={"Retry-After": "2"})), ("rate_limited", 2))
+        # e.g. a daily limit
+        self.assertIsNone(get_retry("POST", 0, FakeResponse(429, headers={"Retry-After": "3600"})))
+        self.assertIsNone(get_retry("GET", 2, FakeResponse(429, headers={"Retry-After": "2"})))
+
+        self.assertEqual(get_retry("GET", 0, FakeResponse(503))[0], "server_error")
+        self.assertEqual(get_retry("GET", 0)[0], "connection")
+        # requests that are not safe to send twice
+        self.assertIsNone(get_retry("POST", 0, FakeResponse(503)))
+        self.assertIsNone(get_retry("POST", 0))
+        self.assertIsNone(get_retry("GET", 0, FakeResponse(404)))
+
+
+@override_settings(WAGTAILZOOM_CIRCUIT_FAILURE_THRESHOLD=2, WAGTAILZOOM_CIRCUIT_RESET_TIMEOUT=30)
+class CircuitBreakerTestCase(TestCase):
+    url = "https://api.zoom.us/v2/meetings/123/registrants"
+
+    def setUp(self):
+        cache.clear()
+        self.circuit_breaker = CircuitBreaker("POST /v2/meetings/{id}/registrants")
+
+    def call(self, error=None):
+        fn = mock.Mock(side_effect=error, return_value="response")
+
+        try:
+            return call_with_circuit_breaker("POST", self.url, fn)
+        finally:
+            self.calls = fn.call_count
+
+    def test_failures_open_the_circuit(self):
+        # Zoom answered, the endpoint is not degraded
+        for i in range(3):
+            with self.assertRaises(HTTPError):
+                self.call(HTTPError(response=FakeResponse(400)))
+        self.assertEqual(self.circuit_breaker.get_state(), CLOSED)
+
+        for i in range(2):
+            with self.assertRaises(ConnectionError):
+                self.call(ConnectionError())
+        self.assertEqual(self.circuit_breaker.get_state(), OPEN)
+
+        with self.assertRaises(ZoomCircuitOpenError):
+            self.call()
+        self.assertEqual(self.calls, 0)
+
+        # the opening is reported once
+        self.assertEqual(ZoomIntegrationError.objects.filter(source=ZoomIntegrationError.SOURCE_CIRCUIT).count(), 1)
+
+    def test_single_trial_call_when_half_open(self):
+        for i in range(2):
+            with self.assertRaises(HTTPError):
+                self.call(HTTPError(response=FakeResponse(503)))
+
+        with mock.patch("wagtailzoom.circuit.time") as mock_time:
+            mock_time.time.return_value = time.time() + 31
+            self.assertEqual(self.circuit_breaker.get_state(), HALF_OPEN)
+
+            # the trial call is in flight, other calls keep failing fast
+            self.assertEqual(self.circuit_breaker.before_call(), HALF_OPEN)
+            with self.assertRaises(ZoomCircuitOpenError):
+                self.circuit_breaker.before_call()
+
+            # the trial call failed, calls are suspended for another reset timeout
+            self.circuit_breaker.record_failure(HALF_OPEN)
+            self.assertEqual(self.circuit_breaker.get_state(), OPEN)
+
+            mock_time.time.return_value += 31
+            self.assertEqual(self.call(), "response")
+
+        self.assertEqual(self.circuit_breaker.get_state(), CLOSED)
+        self.assertEqual(self.call(), "response")
+
+
+@mock.patch.object(ZoomApi, "fetch_access_token", return_value=("token", 3600))
+class CredentialPoolTestCase(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        token_manager.get_cache().clear()
+        # credential health and rate limits are kept per credential set for the whole process
+        self.members = [ZoomApi(f"{self.id()}-{i}", "client", "secret", fetch_token=False) for i in range(2)]
+        self.pool = ZoomApiPool(self.members, strategy=ROUND_ROBIN)
+
+    def test_throttled_credentials_are_skipped(self, fetch_access_token):
+        throttled, other = self.members
+        throttled.session = FakeSession(FakeResponse(429, headers={"Retry-After": "30"}))
+        other.session = FakeSession(FakeResponse(200, {"id": 1}), FakeResponse(200, {"id": 1}))
+
+        self.assertEqual(self.pool.get_meeting("1"), {"id": 1})
+        self.assertEqual(self.pool.get_meeting("1"), {"id": 1})
+
+        self.assertEqual(len(throttled.session.requests), 1)
+        self.assertEqual(len(other.session.requests), 2)
+        self.assertEqual(get_credential_health(throttled.credentials_key).throttled, 1)
+
+    def test_credentials_whose_token_is_refused_are_taken_out_of_rotation(self, fetch_access_token):
+        refused, other = self.members
+        refused.fetch_access_token = mock.Mock(side_effect=HTTPError(response=FakeResponse(400)))
+        refused.session = FakeSession()
+        other.session = FakeSession(FakeResponse(200, {"id": 1}), FakeResponse(200, {"id": 1}))
+
+        self.assertEqual(self.pool.get_meeting("1"), {"id": 1})
+        self.assertEqual(self.pool.get_meeting("1"), {"id": 1})
+
+        self.assertEqual(refused.fetch_access_token.call_count, 1)
+        self.assertEqual(get_credential_health(refused.credentials_key).failures, 1)
+        self.assertEqual(len(other.session.requests), 2)
+
+    def test_requests_take_turns(self, fetch_access_token):
+        for member in self.members:
+            member.session = FakeSession(FakeResponse(200, {"id": 1}), FakeResponse(200, {"id": 1}))
+
+        for i in range(4):
+            self.pool.get_meeting("1")
+
+        self.assertEqual([len(member.session.requests) for member in self.members], [2, 2])
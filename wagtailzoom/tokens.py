@@ -0,0 +1,219 @@
+import asyncio
+import hashlib
+import threading
+import time
+import weakref
+from contextlib import contextmanager
+
+from django.core.cache import caches
+
+from .conf import get_setting
+from .metrics import get_metrics
+
+
+def get_credentials_key(oauth_account_id, oauth_client_id, oauth_client_secret):
+    # the secret is part of the key so that rotating it in Zoom Settings does not reuse stale tokens
+    raw = f"{oauth_account_id}:{oauth_client_id}:{oauth_client_secret}"
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+class LocalTokenCache:
+    def __init__(self):
+        self._tokens = {}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._tokens.get(key)
+
+        if entry and entry[1] > time.time():
+            return entry[0]
+
+        return None
+
+    def set(self, key, access_token, refresh_at):
+        with self._lock:
+            self._tokens[key] = (access_token, refresh_at)
+
+    def delete(self, key):
+        with self._lock:
+            self._tokens.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._tokens.clear()
+
+    # kept in process memory, nothing to wait for
+    async def aget(self, key):
+        return self.get(key)
+
+    async def aset(self, key, access_token, refresh_at):
+        self.set(key, access_token, refresh_at)
+
+    async def adelete(self, key):
+        self.delete(key)
+
+
+class DjangoTokenCache:
+    key_prefix = "wagtailzoom:token"
+
+    def __init__(self, alias="default"):
+        self.alias = alias
+
+    @property
+    def cache(self):
+        return caches[self.alias]
+
+    def make_key(self, key):
+        return f"{self.key_prefix}:{key}"
+
+    def get_access_token(self, entry):
+        if entry and entry[1] > time.time():
+            return entry[0]
+
+        return None
+
+    def get_timeout(self, refresh_at):
+        return max(1, int(refresh_at - time.time()))
+
+    def get(self, key):
+        return self.get_access_token(self.cache.get(self.make_key(key)))
+
+    def set(self, key, access_token, refresh_at):
+        self.cache.set(self.make_key(key), (access_token, refresh_at), timeout=self.get_timeout(refresh_at))
+
+    def delete(self, key):
+        self.cache.delete(self.make_key(key))
+
+    async def aget(self, key):
+        return self.get_access_token(await self.cache.aget(self.make_key(key)))
+
+    async def aset(self, key, access_token, refresh_at):
+        await self.cache.aset(self.make_key(key), (access_token, refresh_at), timeout=self.get_timeout(refresh_at))
+
+    async def adelete(self, key):
+        await self.cache.adelete(self.make_key(key))
+
+
+class TokenManager:
+    def __init__(self):
+        self._caches = {}
+        self._locks = {}
+        self._async_locks = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+
+    def get_cache(self):
+        backend = get_setting("TOKEN_CACHE")
+        alias = get_setting("TOKEN_CACHE_ALIAS")
+
+        cache_key = (backend, alias)
+        token_cache = self._caches.get(cache_key)
+
+        if token_cache is None:
+            if backend == "django":
+                token_cache = DjangoTokenCache(alias)
+            elif backend == "local":
+                token_cache = LocalTokenCache()
+            else:
+                raise ValueError(f"Unknown WAGTAILZOOM_TOKEN_CACHE backend '{backend}'")
+            self._caches[cache_key] = token_cache
+
+        return token_cache
+
+    def get_lock(self, key):
+        with self._lock:
+            lock = self._locks.get(key)
+            if lock is None:
+                lock = self._locks[key] = threading.Lock()
+            return lock
+
+    def get_token(self, key, fetch):
+        """
+        Return a cached access token for the credentials key, calling `fetch` to obtain a new one when missing
+        or about to expire. `fetch` must return a tuple of (access_token, expires_in).
+        """
+        token_cache = self.get_cache()
+
+        access_token = token_cache.get(key)
+        if access_token:
+            return self.record_hit(access_token)
+
+        # only one thread per credential set fetches a new token, the others wait and reuse it
+        with self.get_lock(key):
+            access_token = token_cache.get(key)
+            if access_token:
+                return self.record_hit(access_token)
+
+            with self.record_refresh():
+                access_token, expires_in = fetch()
+
+            token_cache.set(key, access_token, self.get_refresh_at(expires_in))
+
+        return access_token
+
+    def get_async_lock(self, key):
+        # asyncio locks belong to an event loop
+        loop = asyncio.get_running_loop()
+
+        with self._lock:
+            locks = self._async_locks.setdefault(loop, {})
+            lock = locks.get(key)
+            if lock is None:
+                lock = locks[key] = asyncio.Lock()
+            return lock
+
+    async def aget_token(self, key, fetch):
+        """
+        Same as get_token, with `fetch` a coroutine function.
+        """
+        token_cache = self.get_cache()
+
+        access_token = await token_cache.aget(key)
+        if access_token:
+            return self.record_hit(access_token)
+
+        async with self.get_async_lock(key):
+            access_token = await token_cache.aget(key)
+            if access_token:
+                return self.record_hit(access_token)
+
+            with self.record_refresh():
+                access_token, expires_in = await fetch()
+
+            await token_cache.aset(key, access_token, self.get_refresh_at(expires_in))
+
+        return access_token
+
+    def record_hit(self, access_token):
+        get_metrics().increment("wagtailzoom_token_cache_total", result="hit")
+        return access_token
+
+    @contextmanager
+    def record_refresh(self):
+        metrics = get_metrics()
+        metrics.increment("wagtailzoom_token_cache_total", result="miss")
+
+        try:
+            yield
+        except Exception:
+            metrics.increment("wagtailzoom_token_refresh_total", result="error")
+            raise
+
+        metrics.increment("wagtailzoom_token_refresh_total", result="success")
+
+    def get_refresh_at(self, expires_in):
+        margin = get_setting("TOKEN_REFRESH_MARGIN")
+        # short-lived tokens are refreshed half-way through their lifetime
+        if margin >= expires_in:
+            margin = expires_in / 2
+
+        return time.time() + expires_in - margin
+
+    def invalidate(self, key):
+        self.get_cache().delete(key)
+
+    async def ainvalidate(self, key):
+        await self.get_cache().adelete(key)
+
+
+token_manager = TokenManager()
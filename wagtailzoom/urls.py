@@ -0,0 +1,8 @@
+from django.urls import path
+
+from .views import zoom_metrics_view, zoom_webhook_view
+
+urlpatterns = [
+    path('webhook/', zoom_webhook_view, name="zoom_webhook"),
+    path('metrics/', zoom_metrics_view, name="zoom_metrics"),
+]
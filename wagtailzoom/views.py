@@ -1,18 +1,26 @@
+import hmac
 import json
+import time
 
-from django.http import HttpResponseRedirect
+from django.http import Http404, HttpResponse, HttpResponseRedirect, JsonResponse
+from django.shortcuts import get_object_or_404
 from django.shortcuts import render
 from django.urls import reverse
 from django.utils.translation import gettext as _
-from modelcluster.models import get_all_child_relations
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_POST
 from requests import HTTPError
-from wagtail.contrib.forms.models import AbstractFormField
-from wagtail.models import Page
+from wagtail.models import Page, Site
 
-from .api import ZoomApi
 from .errors import ZoomApiCredentialsError
+from .event_cache import get_events, get_events_error_message
+from .form_fields import get_form_fields
 from .forms import ZoomIntegrationForm
-from .models import ZoomSettings
+from .conf import get_setting
+from .metrics import get_metrics
+from .questions import get_registration_questions
+from .sync import get_event_detail
+from .webhooks import get_settings_for_signature, get_url_validation_response, handle_webhook_event
 
 
 def zoom_integration_view(request, page_id):
@@ -26,20 +34,12 @@ def zoom_integration_view(request, page_id):
     explore_url = reverse("wagtailadmin_explore", args=[parent_page.id])
 
     if form_page.zoom_event:
-        zoom_event_db = json.loads(form_page.zoom_event)
-        event_id = zoom_event_db.get("event_id", None)
-        event_type = zoom_event_db.get("event_type", None)
+        event_id = form_page.zoom_event_id
+        event_type = form_page.zoom_event_type
 
         if event_id:
             try:
-                zoom_settings = ZoomSettings.for_request(request)
-                zoom_api = ZoomApi(zoom_settings.oauth_account_id, zoom_settings.oauth_client_id,
-                                   zoom_settings.oauth_client_secret)
-
-                if event_type == "meeting":
-                    zoom_event = zoom_api.get_meeting(event_id)
-                else:
-                    zoom_event = zoom_api.get_webinar(event_id)
+                zoom_event = get_event_detail(form_page.get_site(), event_type, event_id)
 
                 if zoom_event:
 
@@ -73,30 +73,24 @@ def zoom_integration_view(request, page_id):
     if context.get("zoom_error"):
         return render(request, template_name, context=context)
 
-    form_fields_rel_name = None
-    # get form fields relation name
-    relations = get_all_child_relations(form_page)
-    for relation in relations:
-        related_name = relation.related_name
-        rels = getattr(form_page, related_name)
-        # check if is instance of AbstractFormField
-        if isinstance(rels.first(), AbstractFormField):
-            form_fields_rel_name = related_name
-            break
+    questions = None
 
-    form_fields = None
-    has_form_fields = False
+    if form_page.zoom_event and form_page.zoom_event_id:
+        questions = get_registration_questions(form_page.get_site(), form_page.zoom_event_type,
+                                               form_page.zoom_event_id)
 
-    if form_fields_rel_name and hasattr(form_page, form_fields_rel_name):
-        form_fields = getattr(form_page, form_fields_rel_name).all()
+    form_fields = get_form_fields(form_page)
 
+    # evaluated once, the integration form iterates the fields for every Zoom field
     if form_fields is not None:
-        has_form_fields = True
+        form_fields = list(form_fields)
+
+    has_form_fields = bool(form_fields)
 
     context.update({"has_form_fields": has_form_fields})
 
     if request.method == 'POST':
-        form = ZoomIntegrationForm(form_fields=form_fields, data=request.POST)
+        form = ZoomIntegrationForm(form_fields=form_fields, questions=questions, data=request.POST)
 
         if form.is_valid():
             merge_fields_data = json.dumps(form.cleaned_data)
@@ -111,9 +105,73 @@ def zoom_integration_view(request, page_id):
     initial_data = None
 
     if form_page.zoom_reg_fields_mapping:
-        initial_data = json.loads(form_page.zoom_reg_fields_mapping)
+        initial_data = form_page.zoom_merge_fields
 
-    form = ZoomIntegrationForm(form_fields=form_fields, initial=initial_data)
+    form = ZoomIntegrationForm(form_fields=form_fields, questions=questions, initial=initial_data)
     context.update({"form": form})
 
     return render(request, template_name, context=context)
+
+
+def zoom_events_view(request):
+    site_id = request.GET.get("site_id")
+
+    if site_id:
+        site = get_object_or_404(Site, pk=site_id)
+    else:
+        site = Site.objects.get(is_default_site=True)
+
+    try:
+        events = get_events(site, force_refresh=bool(request.GET.get("refresh")))
+    except Exception as e:
+        status = 400 if isinstance(e, ZoomApiCredentialsError) else 502
+        return JsonResponse({"error": get_events_error_message(e)}, status=status)
+
+    return JsonResponse(events)
+
+
+@csrf_exempt
+@require_POST
+def zoom_webhook_view(request):
+    timestamp = request.headers.get("x-zm-request-timestamp", "")
+    signature = request.headers.get("x-zm-signature", "")
+
+    # reject old requests, so that captured requests cannot be replayed
+    try:
+        if abs(time.time() - int(timestamp)) > get_setting("WEBHOOK_TIMESTAMP_TOLERANCE"):
+            return HttpResponse(status=401)
+    except ValueError:
+        return HttpResponse(status=401)
+
+    zoom_settings = get_settings_for_signature(request.body, timestamp, signature)
+    if zoom_settings is None:
+        return HttpResponse(status=401)
+
+    try:
+        data = json.loads(request.body)
+    except ValueError:
+        return HttpResponse(status=400)
+
+    if data.get("event") == "endpoint.url_validation":
+        return JsonResponse(get_url_validation_response(zoom_settings.webhook_secret_token, data.get("payload", {})))
+
+    handle_webhook_event(zoom_settings.site, data)
+
+    return HttpResponse(status=204)
+
+
+def zoom_metrics_view(request):
+    metrics = get_metrics()
+
+    if not hasattr(metrics, "render"):
+        raise Http404
+
+    token = get_setting("METRICS_TOKEN")
+
+    if token:
+        if not hmac.compare_digest(request.headers.get("Authorization", ""), f"Bearer {token}"):
+            return HttpResponse(status=401)
+    elif not (request.user.is_authenticated and request.user.is_staff):
+        return HttpResponse(status=403)
+
+    return HttpResponse(metrics.render(), content_type="text/plain; version=0.0.4; charset=utf-8")
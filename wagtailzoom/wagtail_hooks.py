@@ -1,26 +1,26 @@
 from django.urls import path, reverse
 from django.utils.translation import gettext_lazy as _
-from modelcluster.models import get_all_child_relations
 from wagtail import hooks
 from wagtail.admin import messages
 from wagtail.admin import widgets as wagtail_admin_widgets
-from wagtail.contrib.forms.models import AbstractFormField
 
-from .views import zoom_integration_view
+from .form_fields import get_form_fields
+from .views import zoom_events_view, zoom_integration_view
 
 
 @hooks.register('register_admin_urls')
 def urlconf_wagtail_zoom():
     return [
         path('zoom-integration/<int:page_id>', zoom_integration_view, name="zoom_integration_view"),
+        path('zoom-integration/events/', zoom_events_view, name="zoom_events_list"),
     ]
 
 
 @hooks.register('register_page_listing_buttons')
 def page_listing_buttons(page, page_perms, next_url=None):
     if hasattr(page, "is_zoom_integration") and hasattr(page, "zoom_event"):
-        latest_revision = page.get_latest_revision_as_object()
-        if latest_revision.zoom_event_id and page.show_page_listing_zoom_integration_button():
+        # unknown for pages saved before has_zoom_event was added, until the zoom_update_has_zoom_event command is run
+        if page.has_zoom_event is not False and page.show_page_listing_zoom_integration_button():
             url = reverse("zoom_integration_view", args=[page.pk, ])
             yield wagtail_admin_widgets.PageListingButton(
                 "Zoom Integration",
@@ -36,20 +36,9 @@ def show_zoom_integration_fields_warning(request, page):
 
         if page.zoom_event_id:
             if page.zoom_reg_fields_mapping:
-                form_fields_rel_name = None
-                # get form fields relation name
-                relations = get_all_child_relations(page)
-                for relation in relations:
-                    related_name = relation.related_name
-                    rels = getattr(page, related_name)
-                    # check if is instance of AbstractFormField
-                    if isinstance(rels.first(), AbstractFormField):
-                        form_fields_rel_name = related_name
-                        break
-
-                if form_fields_rel_name and hasattr(page, form_fields_rel_name):
-                    form_fields = getattr(page, form_fields_rel_name).all()
+                form_fields = get_form_fields(page)
 
+                if form_fields is not None:
                     form_fields_names = []
                     merge_field_names = []
 
@@ -57,7 +46,9 @@ def show_zoom_integration_fields_warning(request, page):
                         form_fields_names.append(form_field.clean_name)
 
                     for key, value in page.zoom_merge_fields.items():
-                        merge_field_names.append(value)
+                        # optional registration questions can be left unmapped
+                        if value:
+                            merge_field_names.append(value)
 
                     for merge_field_name in merge_field_names:
                         if merge_field_name not in form_fields_names:
@@ -0,0 +1,105 @@
+import hashlib
+import hmac
+import logging
+
+from django.utils import timezone
+from wagtail import hooks
+
+from .models import ZoomEvent, ZoomSettings
+from .questions import invalidate_registration_questions
+from .registrants import WEBHOOK_STATUSES, apply_registrant_change
+from .sync import update_event_fields
+
+logger = logging.getLogger(__name__)
+
+EVENT_TYPE_LABELS = {
+    "meeting": "Meeting",
+    "webinar": "Webinar",
+}
+
+
+def sign(secret_token, message):
+    if isinstance(message, str):
+        message = message.encode()
+    return hmac.new(secret_token.encode(), message, hashlib.sha256).hexdigest()
+
+
+def verify_signature(secret_token, body, timestamp, signature):
+    # compared as bytes, the body and signature are not trusted to be valid text before they are verified
+    expected = "v0=" + sign(secret_token, b"v0:%s:" % timestamp.encode() + body)
+    return hmac.compare_digest(expected.encode(), signature.encode())
+
+
+def get_settings_for_signature(body, timestamp, signature):
+    # a single webhook endpoint serves all sites, the site is the one whose secret token signed the request
+    zoom_settings_list = ZoomSettings.objects.exclude(webhook_secret_token__isnull=True) \
+        .exclude(webhook_secret_token="").select_related("site")
+
+    for zoom_settings in zoom_settings_list:
+        if verify_signature(zoom_settings.webhook_secret_token, body, timestamp, signature):
+            return zoom_settings
+
+    return None
+
+
+def get_url_validation_response(secret_token, payload):
+    plain_token = payload.get("plainToken", "")
+    return {"plainToken": plain_token, "encryptedToken": sign(secret_token, plain_token)}
+
+
+def apply_event_change(site, event_type, action, obj):
+    event_id = str(obj.get("id", ""))
+    if not event_id:
+        return
+
+    # e.g. a registration question was made optional, submissions must not be validated against the old ones
+    if action in ("updated", "deleted"):
+        invalidate_registration_questions(site.pk, event_type, event_id)
+
+    events = ZoomEvent.objects.filter(site=site, event_type=event_type, event_id=event_id)
+
+    # deleting a single occurrence of a recurring event only changes the event
+    if action == "deleted" and not obj.get("occurrences"):
+        events.delete()
+        return
+
+    if action == "created":
+        event = {**obj, "event_type": event_type, "event_type_label": EVENT_TYPE_LABELS[event_type]}
+        zoom_event = events.first() or ZoomEvent(site=site, event_type=event_type, event_id=event_id)
+        update_event_fields(zoom_event, event)
+        zoom_event.synced_at = timezone.now()
+        zoom_event.save()
+        return
+
+    zoom_event = events.first()
+    if zoom_event is None:
+        return
+
+    # updates only contain the changed fields. The full details are fetched again the next time they are needed
+    if action == "updated":
+        update_event_fields(zoom_event, {**zoom_event.data, **obj})
+        zoom_event.synced_at = timezone.now()
+
+    zoom_event.detail = None
+    zoom_event.detail_synced_at = None
+    zoom_event.save()
+
+
+def handle_webhook_event(site, data):
+    event_name = data.get("event", "")
+    obj = data.get("payload", {}).get("object", {})
+
+    event_type, _, action = event_name.partition(".")
+
+    if event_type in EVENT_TYPE_LABELS and action in ("created", "updated", "deleted"):
+        apply_event_change(site, event_type, action, obj)
+
+    # e.g. meeting.registration_approved
+    registration_action = action.partition("registration_")[2]
+
+    if event_type in EVENT_TYPE_LABELS and (registration_action == "created" or
+                                            registration_action in WEBHOOK_STATUSES):
+        apply_registrant_change(site, event_type, registration_action, obj)
+
+    for fn in hooks.get_hooks("after_zoom_webhook_event"):
+        fn(site, event_name, data.get("payload", {}))
@@ -2,18 +2,18 @@ import json
 
 from django.forms.widgets import Input, Select
 from django.template.loader import render_to_string
+from django.urls import reverse
 from django.utils.translation import gettext as _
-from requests import HTTPError
 from wagtail.models import Site
 
-from .api import ZoomApi
-from .errors import ZoomApiCredentialsError
+from .event_cache import get_events
 
 
 class CustomSelect(Select):
     def create_option(self, *args, **kwargs):
         option = super().create_option(*args, **kwargs)
-        if not option.get('value'):
+        # optional fields can be left unmapped
+        if not option.get('value') and self.is_required:
             option['attrs']['disabled'] = True
 
         return option
@@ -23,45 +23,36 @@ class ZoomEventSelectWidget(Input):
     template_name = "wagtailzoom/widgets/zoom_event_select_widget.html"
     js_template_name = "wagtailzoom/widgets/zoom_event_select_widget_js.html"
 
+    # site whose Zoom account events are listed, set by ZoomEventPanel. Defaults to the default site
+    site_id = None
+
     def get_context(self, name, value, attrs):
         ctx = super(ZoomEventSelectWidget, self).get_context(name, value, attrs)
 
-        zoom_error = None
-
         json_value = self.get_json_value(value)
         event_id = json_value.get("event_id")
-        zoom_events = []
-
-        try:
-            zoom_events = self.get_zoom_events()
-        except ZoomApiCredentialsError as e:
-            zoom_error = e.message
-        except Exception as e:
-            zoom_error = _("Error obtaining Zoom events. "
-                           "Please make sure the Zoom credentials in Zoom Settings are correct, "
-                           "and have required Zoom Account access scope.")
-
-            if isinstance(e, HTTPError):
-                response = e.response.json()
-                if response and response.get("message"):
-                    zoom_error += _("- Specific Error: ") + response.get("message")
+
+        # events are loaded by the browser from the events endpoint, so that the page editor renders immediately
+        events_url = reverse("zoom_events_list")
+        if self.site_id:
+            events_url = f"{events_url}?site_id={self.site_id}"
 
         ctx["widget"]["value"] = json.dumps(json_value)
-        ctx['widget']['extra_js'] = self.render_js(name, event_id, zoom_events)
-        ctx["widget"]["selectable_events"] = zoom_events
+        ctx['widget']['extra_js'] = self.render_js(name, event_id, events_url)
         ctx["widget"]["stored_event_id"] = event_id
-        ctx["widget"]["zoom_error"] = zoom_error
+        ctx["widget"]["stored_event_topic"] = json_value.get("event_topic")
+        ctx["widget"]["stored_event_type"] = json_value.get("event_type")
         ctx["widget"]["no_events_message"] = _("No Upcoming or Ongoing Meetings/Webinars found. "
                                                "Please create one on Zoom and try again.")
 
         return ctx
 
-    def render_js(self, name, event_id, zoom_events):
+    def render_js(self, name, event_id, events_url):
         ctx = {
             "widget_name": name,
             "widget_js_name": name.replace('-', '_'),
             "stored_event_id": event_id,
-            "selectable_events": zoom_events
+            "events_url": events_url,
         }
 
         return render_to_string(self.js_template_name, ctx)
@@ -82,13 +73,9 @@ class ZoomEventSelectWidget(Input):
         return json_value
 
     def get_zoom_events(self):
-        from .models import ZoomSettings
-
-        current_site = Site.objects.get(is_default_site=True)
-
-        zoom_settings = ZoomSettings.for_site(current_site)
-        api = ZoomApi(zoom_settings.oauth_account_id, zoom_settings.oauth_client_id,
-                      zoom_settings.oauth_client_secret)
-        events = api.get_events()
+        if self.site_id:
+            site = Site.objects.get(pk=self.site_id)
+        else:
+            site = Site.objects.get(is_default_site=True)
 
-        return events
+        return get_events(site)["events"]